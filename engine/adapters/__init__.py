@@ -1,11 +1,16 @@
 """LLM Adapters"""
 
-from .base import BaseLLMAdapter, LLMResponse
+from .base import BaseLLMAdapter, LLMResponse, Observation
 from .mock import MockAdapter
 from .ollama import OllamaAdapter
 from .anthropic import AnthropicAdapter
 from .google import GoogleAdapter
 from .openai import OpenAIAdapter
+from .pool import close_clients, aclose_clients, release_clients
+from .cache import CachedAdapter, ResponseCache, CACHE_MODES
+from .governor import GovernedAdapter, RateGovernor, RateLimiter
+from .retry import RetryingAdapter, RetryPolicy
+from .scheduler import AffinityGate, OllamaScheduler, ScheduledAdapter
 
 ADAPTER_REGISTRY = {
     "mock": MockAdapter,
@@ -29,6 +34,7 @@ def create_adapter(adapter_type: str, **kwargs) -> BaseLLMAdapter:
 __all__ = [
     "BaseLLMAdapter",
     "LLMResponse",
+    "Observation",
     "MockAdapter",
     "OllamaAdapter",
     "AnthropicAdapter",
@@ -36,4 +42,18 @@ __all__ = [
     "OpenAIAdapter",
     "ADAPTER_REGISTRY",
     "create_adapter",
+    "CachedAdapter",
+    "ResponseCache",
+    "CACHE_MODES",
+    "GovernedAdapter",
+    "RateGovernor",
+    "RateLimiter",
+    "RetryingAdapter",
+    "RetryPolicy",
+    "AffinityGate",
+    "OllamaScheduler",
+    "ScheduledAdapter",
+    "close_clients",
+    "aclose_clients",
+    "release_clients",
 ]
@@ -3,7 +3,9 @@
 import os
 from typing import Optional
 
-from .base import BaseLLMAdapter, LLMResponse
+from .base import BaseLLMAdapter, LLMResponse, timed
+from .retry import classify_exception, retry_after_from_exception
+from .pool import DEFAULT_POOL_SIZE, get_client, get_async_client, httpx_limits
 
 
 class AnthropicAdapter(BaseLLMAdapter):
@@ -17,43 +19,167 @@ class AnthropicAdapter(BaseLLMAdapter):
         super().__init__(model, **kwargs)
         self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
         self.max_tokens = kwargs.get("max_tokens", 1000)
+        self.base_url = kwargs.get("base_url")
+        self.pool_size = kwargs.get("pool_size", DEFAULT_POOL_SIZE)
+        # system 프롬프트에 cache_control 브레이크포인트 부착 (턴마다 같은 접두부 재사용)
+        self.prompt_cache = kwargs.get("prompt_cache", False)
 
+    @timed
     def generate(self, prompt: str, max_tokens: int = 1000,
                  system_prompt: str | None = None) -> LLMResponse:
         if not self.api_key:
-            return LLMResponse(
-                thought="ANTHROPIC_API_KEY not set",
-                action="idle",
-                success=False,
-                error="API 키 없음",
-            )
+            return self._missing_key_response()
 
         try:
             import anthropic
 
-            client = anthropic.Anthropic(api_key=self.api_key)
-            create_kwargs = {
-                "model": self.model,
-                "max_tokens": max_tokens,
-                "messages": [{"role": "user", "content": prompt}],
-            }
-            if system_prompt:
-                create_kwargs["system"] = system_prompt
-            message = client.messages.create(**create_kwargs)
-            raw_text = message.content[0].text
-            return self.parse_response(raw_text)
+            client = get_client(self._pool_key(), lambda: anthropic.Anthropic(
+                **self._client_kwargs(),
+                http_client=anthropic.DefaultHttpxClient(limits=httpx_limits(self.pool_size)),
+            ), holder=self)
+            if self.stream:
+                stream = client.messages.create(
+                    **self._create_kwargs(prompt, max_tokens, system_prompt), stream=True,
+                )
+                usage = {}
+                response = self._consume_stream(self._iter_stream(stream, usage), max_tokens)
+                response.cached_tokens = usage.get("cache_read_input_tokens")
+                response.input_tokens = usage.get("input_tokens")
+                return response
+            message = client.messages.create(
+                **self._create_kwargs(prompt, max_tokens, system_prompt)
+            )
+            return self._handle_message(message)
 
         except ImportError:
-            return LLMResponse(
-                thought="anthropic 패키지 미설치",
-                action="idle",
-                success=False,
-                error="pip install anthropic",
-            )
+            return self._import_error_response()
         except Exception as e:
-            return LLMResponse(
-                thought=f"Claude API 오류: {e}",
-                action="idle",
-                success=False,
-                error=str(e),
+            return self._api_error_response(e)
+
+    @timed
+    async def agenerate(self, prompt: str, max_tokens: int = 1000,
+                        system_prompt: str | None = None) -> LLMResponse:
+        if not self.api_key:
+            return self._missing_key_response()
+
+        try:
+            import anthropic
+
+            client = get_async_client(self._pool_key(), lambda: anthropic.AsyncAnthropic(
+                **self._client_kwargs(),
+                http_client=anthropic.DefaultAsyncHttpxClient(limits=httpx_limits(self.pool_size)),
+            ), holder=self)
+            if self.stream:
+                stream = await client.messages.create(
+                    **self._create_kwargs(prompt, max_tokens, system_prompt), stream=True,
+                )
+                usage = {}
+                response = await self._aconsume_stream(self._aiter_stream(stream, usage), max_tokens)
+                response.cached_tokens = usage.get("cache_read_input_tokens")
+                response.input_tokens = usage.get("input_tokens")
+                return response
+            message = await client.messages.create(
+                **self._create_kwargs(prompt, max_tokens, system_prompt)
             )
+            return self._handle_message(message)
+
+        except ImportError:
+            return self._import_error_response()
+        except Exception as e:
+            return self._api_error_response(e)
+
+    def _pool_key(self) -> tuple:
+        return ("anthropic", self.base_url, self.api_key, self.pool_size)
+
+    def _client_kwargs(self) -> dict:
+        # 재시도는 RetryingAdapter가 담당 — SDK 내장 재시도와 중복되지 않게 끔
+        client_kwargs = {"api_key": self.api_key, "max_retries": 0}
+        if self.base_url:
+            client_kwargs["base_url"] = self.base_url
+        return client_kwargs
+
+    def _create_kwargs(self, prompt: str, max_tokens: int,
+                       system_prompt: str | None) -> dict:
+        create_kwargs = {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        if system_prompt:
+            if self.prompt_cache:
+                create_kwargs["system"] = [{
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"},
+                }]
+            else:
+                create_kwargs["system"] = system_prompt
+        return create_kwargs
+
+    @staticmethod
+    def _stream_text(event, usage: dict) -> str:
+        """스트림 이벤트 → 텍스트 조각. message_start의 입력/캐시 적중 토큰은 usage에 기록
+
+        출력 토큰 수는 마지막 message_delta에만 오므로 조기 종료하면 알 수 없다.
+        """
+        if event.type == "message_start":
+            message_usage = getattr(event.message, "usage", None)
+            usage["input_tokens"] = getattr(message_usage, "input_tokens", None)
+            usage["cache_read_input_tokens"] = getattr(message_usage, "cache_read_input_tokens", None)
+        elif event.type == "content_block_delta" and event.delta.type == "text_delta":
+            return event.delta.text
+        return ""
+
+    def _iter_stream(self, stream, usage: dict):
+        """닫히면 HTTP 스트림을 끊어 남은 생성을 취소"""
+        try:
+            for event in stream:
+                yield self._stream_text(event, usage)
+        finally:
+            stream.close()
+
+    async def _aiter_stream(self, stream, usage: dict):
+        try:
+            async for event in stream:
+                yield self._stream_text(event, usage)
+        finally:
+            await stream.close()
+
+    def _handle_message(self, message) -> LLMResponse:
+        response = self.parse_response(message.content[0].text)
+        usage = getattr(message, "usage", None)
+        response.input_tokens = getattr(usage, "input_tokens", None)
+        response.output_tokens = getattr(usage, "output_tokens", None)
+        response.cached_tokens = getattr(usage, "cache_read_input_tokens", None)
+        return response
+
+    @staticmethod
+    def _missing_key_response() -> LLMResponse:
+        return LLMResponse(
+            thought="ANTHROPIC_API_KEY not set",
+            action="idle",
+            success=False,
+            error="API 키 없음",
+            error_type="config",
+        )
+
+    @staticmethod
+    def _import_error_response() -> LLMResponse:
+        return LLMResponse(
+            thought="anthropic 패키지 미설치",
+            action="idle",
+            success=False,
+            error="pip install anthropic",
+            error_type="config",
+        )
+
+    @staticmethod
+    def _api_error_response(e: Exception) -> LLMResponse:
+        return LLMResponse(
+            thought=f"Claude API 오류: {e}",
+            action="idle",
+            success=False,
+            error=str(e),
+            error_type=classify_exception(e),
+            retry_after=retry_after_from_exception(e),
+        )
@@ -2,9 +2,12 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import AsyncIterator, Iterator, Optional
+import asyncio
+import functools
 import json
 import re
+import time
 
 
 @dataclass
@@ -17,6 +20,17 @@ class LLMResponse:
     raw_response: dict = field(default_factory=dict)
     success: bool = True
     error: Optional[str] = None
+    error_type: Optional[str] = None  # 재시도 정책용 에러 클래스 (retry.ERROR_CLASSES)
+    retry_after: Optional[float] = None  # 서버가 요청한 대기 초 (Retry-After)
+    attempts: list = field(default_factory=list)  # 시도별 지연 기록 (RetryingAdapter)
+    cached_tokens: Optional[int] = None  # 프로바이더 프롬프트 캐시에서 읽은 입력 토큰 수
+    time_to_action_ms: Optional[float] = None  # 스트리밍: 요청 → JSON 객체가 닫힐 때까지
+    tokens_saved: Optional[int] = None  # 스트리밍 조기 종료로 남긴 출력 토큰 예산 (상한 추정)
+    latency_ms: Optional[float] = None  # 호출 벽시계 지연 (RetryingAdapter 아래면 재시도/백오프 포함)
+    ttft_ms: Optional[float] = None  # 첫 토큰까지 (스트리밍 실측, Ollama 비스트리밍은 서버 측 추정)
+    input_tokens: Optional[int] = None  # 프로바이더 usage의 입력 토큰 수
+    output_tokens: Optional[int] = None  # 프로바이더 usage의 출력 토큰 수
+    retries: int = 0  # RetryingAdapter가 다시 호출한 횟수
 
     def to_action_dict(self) -> dict:
         action_dict = {"type": self.action}
@@ -27,18 +41,148 @@ class LLMResponse:
         return action_dict
 
 
+@dataclass
+class Observation:
+    """구조화된 관찰 — 규칙 기반 어댑터가 렌더링된 프롬프트를 긁지 않고 바로 결정하도록 넘기는 월드 상태"""
+    agent_id: str
+    location: str
+    turn: int
+    available_actions: list[str] = field(default_factory=list)
+    agents_here: list[str] = field(default_factory=list)  # 같은 장소의 다른 에이전트 (자기 제외)
+    move_locations: list[str] = field(default_factory=list)
+
+
+def elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+def timed(method):
+    """generate/agenerate 데코레이터 — 응답에 호출 벽시계 지연(latency_ms) 기록"""
+    if asyncio.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            started = time.perf_counter()
+            response = await method(self, *args, **kwargs)
+            response.latency_ms = elapsed_ms(started)
+            return response
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        response = method(self, *args, **kwargs)
+        response.latency_ms = elapsed_ms(started)
+        return response
+    return wrapper
+
+
+class JsonObjectScanner:
+    """증분 중괄호 균형 스캐너 — 청크를 이어 받아 가장 바깥 JSON 객체가 닫히는 순간을 감지
+
+    문자열 리터럴 안의 중괄호와 이스케이프된 따옴표는 건너뛰며, 청크 경계가 문자열이나
+    이스케이프 한가운데 걸려도 상태를 이어서 본다. 한 번에 전체 텍스트를 넣으면
+    _extract_json_object와 같은 결과.
+    """
+
+    __slots__ = ("_parts", "_length", "start", "end", "_depth", "_in_string", "_escape")
+
+    def __init__(self):
+        self._parts: list[str] = []
+        self._length = 0
+        self.start = -1  # 첫 '{'의 절대 위치
+        self.end = -1  # 가장 바깥 '}'의 절대 위치 (닫히면)
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def text(self) -> str:
+        if len(self._parts) > 1:
+            self._parts = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+    @property
+    def complete(self) -> bool:
+        return self.end >= 0
+
+    def result(self) -> Optional[str]:
+        return self.text[self.start:self.end + 1] if self.complete else None
+
+    def feed(self, chunk: str) -> Optional[str]:
+        """청크 추가 — 가장 바깥 객체가 닫혔으면 객체 문자열, 아니면 None"""
+        if self.complete:
+            return self.result()
+        offset = self._length
+        self._parts.append(chunk)
+        self._length += len(chunk)
+        i = 0
+        if self.start < 0:
+            i = chunk.find('{')
+            if i == -1:
+                return None
+            self.start = offset + i
+        depth, in_string, escape = self._depth, self._in_string, self._escape
+        for i in range(i, len(chunk)):
+            c = chunk[i]
+            if escape:
+                escape = False
+                continue
+            if c == '\\' and in_string:
+                escape = True
+                continue
+            if c == '"':
+                in_string = not in_string
+                continue
+            if in_string:
+                continue
+            if c == '{':
+                depth += 1
+            elif c == '}':
+                depth -= 1
+                if depth == 0:
+                    self.end = offset + i
+                    break
+        self._depth, self._in_string, self._escape = depth, in_string, escape
+        return self.result()
+
+
 class BaseLLMAdapter(ABC):
     """LLM 어댑터 추상 클래스"""
 
+    # True면 observe(Observation)로 프롬프트 없이 결정 가능 (headless 모드)
+    supports_observation = False
+
     def __init__(self, model: str, **kwargs):
         self.model = model
         self.config = kwargs
+        # True면 스트리밍 호출 후 JSON 객체가 닫히는 즉시 끊음 (지원하는 어댑터만)
+        self.stream = kwargs.get("stream", False)
 
     @abstractmethod
     def generate(self, prompt: str, max_tokens: int = 1000,
                  system_prompt: str | None = None) -> LLMResponse:
         pass
 
+    async def agenerate(self, prompt: str, max_tokens: int = 1000,
+                        system_prompt: str | None = None) -> LLMResponse:
+        """비동기 generate — 기본 구현은 generate()를 스레드로 오프로드"""
+        kwargs = {"max_tokens": max_tokens}
+        if system_prompt is not None:
+            kwargs["system_prompt"] = system_prompt
+        return await asyncio.to_thread(self.generate, prompt, **kwargs)
+
+    def observe(self, observation: Observation) -> LLMResponse:
+        """구조화 관찰로 결정 — supports_observation인 어댑터만 구현"""
+        raise NotImplementedError(f"{self.name} does not accept observations")
+
+    def unwrap(self) -> "BaseLLMAdapter":
+        """가장 안쪽의 실제 어댑터 (래퍼가 아니면 자기 자신)"""
+        return self
+
+    def sampling_params(self) -> dict:
+        """요청에 쓰이는 샘플링 파라미터 (캐시 키 구성용)"""
+        return {}
+
     def parse_response(self, raw_text: str) -> LLMResponse:
         try:
             text = raw_text
@@ -67,37 +211,65 @@ class BaseLLMAdapter(ABC):
             raw_response={"text": raw_text},
             success=False,
             error="JSON 파싱 실패",
+            error_type="parse_error" if raw_text.strip() else "empty",
         )
 
     @staticmethod
     def _extract_json_object(text: str) -> Optional[str]:
         """Extract outermost JSON object using brace balancing."""
-        start = text.find('{')
-        if start == -1:
-            return None
-        depth = 0
-        in_string = False
-        escape_next = False
-        for i in range(start, len(text)):
-            c = text[i]
-            if escape_next:
-                escape_next = False
-                continue
-            if c == '\\' and in_string:
-                escape_next = True
-                continue
-            if c == '"' and not escape_next:
-                in_string = not in_string
-                continue
-            if in_string:
-                continue
-            if c == '{':
-                depth += 1
-            elif c == '}':
-                depth -= 1
-                if depth == 0:
-                    return text[start:i + 1]
-        return None
+        return JsonObjectScanner().feed(text)
+
+    def _consume_stream(self, chunks: Iterator[str], max_tokens: int) -> LLMResponse:
+        """스트리밍 응답 — 가장 바깥 JSON 객체가 닫히는 즉시 스트림을 끊고 파싱
+
+        chunks는 텍스트 조각 제너레이터. close() 시 HTTP 스트림을 닫아 서버가 생성을 멈추게
+        하는 것은 각 어댑터의 제너레이터 책임 (with 블록/finally).
+        """
+        started = time.perf_counter()
+        first_token = None
+        scanner = JsonObjectScanner()
+        try:
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                if first_token is None:
+                    first_token = time.perf_counter()
+                if scanner.feed(chunk) is not None:
+                    break
+        finally:
+            chunks.close()
+        return self._finish_stream(scanner, started, first_token, max_tokens)
+
+    async def _aconsume_stream(self, chunks: AsyncIterator[str], max_tokens: int) -> LLMResponse:
+        """_consume_stream의 비동기 버전"""
+        started = time.perf_counter()
+        first_token = None
+        scanner = JsonObjectScanner()
+        try:
+            async for chunk in chunks:
+                if not chunk:
+                    continue
+                if first_token is None:
+                    first_token = time.perf_counter()
+                if scanner.feed(chunk) is not None:
+                    break
+        finally:
+            await chunks.aclose()
+        return self._finish_stream(scanner, started, first_token, max_tokens)
+
+    def _finish_stream(
+        self, scanner: JsonObjectScanner, started: float,
+        first_token: Optional[float], max_tokens: int,
+    ) -> LLMResponse:
+        response = self.parse_response(scanner.text)
+        if first_token is not None:
+            response.ttft_ms = round((first_token - started) * 1000, 1)
+        if scanner.complete:
+            response.time_to_action_ms = elapsed_ms(started)
+            # 실제로 생성됐을 꼬리 길이는 알 수 없으므로 남은 예산(UTF-8 4바이트 ≈ 1토큰)을 상한으로 기록
+            used = len(scanner.text.encode("utf-8")) // 4
+            response.tokens_saved = max(0, max_tokens - used)
+        return response
 
     def validate_action(self, response: LLMResponse, valid_actions: list[str]) -> LLMResponse:
         if response.action not in valid_actions:
@@ -108,3 +280,41 @@ class BaseLLMAdapter(ABC):
     @property
     def name(self) -> str:
         return self.__class__.__name__
+
+
+class AdapterWrapper(BaseLLMAdapter):
+    """다른 어댑터를 감싸는 레이어의 공통 베이스 (캐시, 재시도, 레이트 리밋 등)"""
+
+    def __init__(self, inner: BaseLLMAdapter):
+        super().__init__(inner.model, **inner.config)
+        self.inner = inner
+
+    @property
+    def name(self) -> str:
+        return self.inner.name
+
+    @property
+    def supports_observation(self) -> bool:
+        return self.inner.supports_observation
+
+    def observe(self, observation: Observation) -> LLMResponse:
+        """로컬 규칙 기반 결정이라 캐시/재시도 레이어를 거치지 않고 바로 전달 (레이트 리밋은 GovernedAdapter)"""
+        return self.inner.observe(observation)
+
+    def sampling_params(self) -> dict:
+        return self.inner.sampling_params()
+
+    def unwrap(self) -> BaseLLMAdapter:
+        """가장 안쪽의 실제 어댑터"""
+        inner = self.inner
+        while isinstance(inner, AdapterWrapper):
+            inner = inner.inner
+        return inner
+
+    def generate(self, prompt: str, max_tokens: int = 1000,
+                 system_prompt: str | None = None) -> LLMResponse:
+        return self.inner.generate(prompt, max_tokens=max_tokens, system_prompt=system_prompt)
+
+    async def agenerate(self, prompt: str, max_tokens: int = 1000,
+                        system_prompt: str | None = None) -> LLMResponse:
+        return await self.inner.agenerate(prompt, max_tokens=max_tokens, system_prompt=system_prompt)
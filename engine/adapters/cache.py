@@ -0,0 +1,215 @@
+"""LLM 응답 캐시 — content-addressed record/replay
+
+키 = sha256(어댑터 타입, 모델, system_prompt, prompt, max_tokens, 샘플링 파라미터)
+에 같은 키의 run 내 등장 순번(occurrence)을 붙인 값. 같은 프롬프트가 한 run에서
+여러 번 나와도 각 호출이 기록된 순서대로 재생되므로 replay가 원본 run을 그대로 재현한다.
+
+모드:
+    off    — 캐시 미사용
+    record — 캐시 우선 조회, 미스(또는 실패 응답)면 실제 호출 후 저장
+    replay — 캐시만 조회, 미스면 네트워크 호출 없이 실패 응답 반환
+"""
+
+import dataclasses
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+from .base import AdapterWrapper, BaseLLMAdapter, LLMResponse
+
+CACHE_MODES = ("off", "record", "replay")
+
+_RESPONSE_FIELDS = {f.name for f in dataclasses.fields(LLMResponse)}
+
+
+class ResponseCache:
+    """sqlite 기반 응답 저장소 — 크기 초과 시 LRU 제거"""
+
+    def __init__(self, path: str, max_bytes: Optional[int] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " payload TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " accessed INTEGER NOT NULL)"
+        )
+        self._conn.commit()
+        row = self._conn.execute(
+            "SELECT COALESCE(MAX(accessed), 0), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        self._clock, self._total_bytes = row
+        self._occurrences: dict[str, int] = {}
+        # refreshes: 저장된 실패 응답이라 miss로 세고 다시 호출한 횟수 (misses에 포함)
+        self._stats = {"hits": 0, "misses": 0, "refreshes": 0, "stores": 0, "evictions": 0}
+
+    @staticmethod
+    def content_key(
+        adapter_type: str,
+        model: str,
+        system_prompt: Optional[str],
+        prompt: str,
+        max_tokens: int,
+        sampling: dict,
+    ) -> str:
+        material = json.dumps(
+            [adapter_type, model, system_prompt, prompt, max_tokens, sampling],
+            ensure_ascii=False, sort_keys=True,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def next_key(self, content_key: str) -> str:
+        """같은 내용의 n번째 호출 키"""
+        with self._lock:
+            n = self._occurrences.get(content_key, 0)
+            self._occurrences[content_key] = n + 1
+        return f"{content_key}:{n}"
+
+    def get(self, key: str, skip_failed: bool = False) -> Optional[dict]:
+        """skip_failed면 실패 응답(success=False)은 없는 것으로 — miss + refresh로 집계"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            payload = json.loads(row[0])
+            if skip_failed and not payload.get("success", True):
+                self._stats["misses"] += 1
+                self._stats["refreshes"] += 1
+                return None
+            self._clock += 1
+            self._conn.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (self._clock, key)
+            )
+            self._conn.commit()
+            self._stats["hits"] += 1
+            return payload
+
+    def put(self, key: str, payload: dict):
+        text = json.dumps(payload, ensure_ascii=False)
+        size = len(text.encode("utf-8"))
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if old:
+                self._total_bytes -= old[0]
+            self._clock += 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, payload, size, accessed)"
+                " VALUES (?, ?, ?, ?)",
+                (key, text, size, self._clock),
+            )
+            self._total_bytes += size
+            self._stats["stores"] += 1
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """max_bytes 초과 시 가장 오래 접근하지 않은 항목부터 제거 (lock 보유 상태)"""
+        if not self.max_bytes or self._total_bytes <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed ASC"
+        )
+        victims = []
+        freed = 0
+        for key, size in rows:
+            if self._total_bytes - freed <= target:
+                break
+            victims.append((key,))
+            freed += size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self._total_bytes -= freed
+        self._stats["evictions"] += len(victims)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._total_bytes
+
+    def take_stats(self) -> dict:
+        """마지막 호출 이후의 hit/miss 카운터 반환 후 초기화 (에폭 요약용)"""
+        with self._lock:
+            stats = dict(self._stats)
+            for k in self._stats:
+                self._stats[k] = 0
+        stats["size_bytes"] = self._total_bytes
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def response_to_payload(response: LLMResponse) -> dict:
+    return dataclasses.asdict(response)
+
+
+def payload_to_response(payload: dict) -> LLMResponse:
+    return LLMResponse(**{k: v for k, v in payload.items() if k in _RESPONSE_FIELDS})
+
+
+class CachedAdapter(AdapterWrapper):
+    """임의의 어댑터를 감싸는 record/replay 캐시 레이어"""
+
+    def __init__(self, inner: BaseLLMAdapter, cache: ResponseCache, mode: str = "record"):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode: {mode}. Available: {list(CACHE_MODES)}")
+        super().__init__(inner)
+        self.cache = cache
+        self.mode = mode
+
+    def _key(self, prompt: str, max_tokens: int, system_prompt: Optional[str]) -> str:
+        content_key = ResponseCache.content_key(
+            self.inner.name, self.inner.model, system_prompt, prompt,
+            max_tokens, self.inner.sampling_params(),
+        )
+        return self.cache.next_key(content_key)
+
+    def _lookup(self, key: str) -> Optional[LLMResponse]:
+        # 실패 응답은 record 모드에서 재호출 (replay는 기록된 실패도 그대로 재현)
+        payload = self.cache.get(key, skip_failed=self.mode == "record")
+        if payload is None:
+            if self.mode == "replay":
+                return LLMResponse(
+                    thought="캐시 미스 (replay 모드)",
+                    action="idle",
+                    success=False,
+                    error="cache miss",
+                )
+            return None
+        return payload_to_response(payload)
+
+    def generate(self, prompt: str, max_tokens: int = 1000,
+                 system_prompt: str | None = None) -> LLMResponse:
+        if self.mode == "off":
+            return super().generate(prompt, max_tokens, system_prompt)
+        key = self._key(prompt, max_tokens, system_prompt)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        response = self.inner.generate(prompt, max_tokens=max_tokens, system_prompt=system_prompt)
+        self.cache.put(key, response_to_payload(response))
+        return response
+
+    async def agenerate(self, prompt: str, max_tokens: int = 1000,
+                        system_prompt: str | None = None) -> LLMResponse:
+        if self.mode == "off":
+            return await super().agenerate(prompt, max_tokens, system_prompt)
+        key = self._key(prompt, max_tokens, system_prompt)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        response = await self.inner.agenerate(prompt, max_tokens=max_tokens, system_prompt=system_prompt)
+        self.cache.put(key, response_to_payload(response))
+        return response
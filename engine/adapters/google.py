@@ -1,9 +1,14 @@
 """Google Gemini LLM 어댑터"""
 
 import os
+import threading
 from typing import Optional
 
-from .base import BaseLLMAdapter, LLMResponse
+from .base import BaseLLMAdapter, LLMResponse, timed
+from .retry import classify_exception, retry_after_from_exception
+from .pool import get_async_client, get_client
+
+_configure_lock = threading.Lock()  # genai.configure는 프로세스 전역 상태
 
 
 class GoogleAdapter(BaseLLMAdapter):
@@ -17,46 +22,155 @@ class GoogleAdapter(BaseLLMAdapter):
         super().__init__(model, **kwargs)
         self.api_key = api_key or os.environ.get("GOOGLE_API_KEY")
 
+    @timed
     def generate(self, prompt: str, max_tokens: int = 1000,
                  system_prompt: str | None = None) -> LLMResponse:
         if not self.api_key:
-            return LLMResponse(
-                thought="GOOGLE_API_KEY not set",
-                action="idle",
-                success=False,
-                error="API 키 없음",
-            )
+            return self._missing_key_response()
 
         try:
             import google.generativeai as genai
 
-            genai.configure(api_key=self.api_key)
-            model_kwargs = {}
-            if system_prompt:
-                model_kwargs["system_instruction"] = system_prompt
-            model = genai.GenerativeModel(self.model, **model_kwargs)
+            model = self._build_model(genai, system_prompt)
+            if self.stream:
+                response = model.generate_content(
+                    prompt,
+                    generation_config=self._generation_config(genai, max_tokens),
+                    stream=True,
+                )
+                return self._consume_stream(self._iter_stream(response), max_tokens)
             response = model.generate_content(
                 prompt,
-                generation_config=genai.types.GenerationConfig(
-                    max_output_tokens=max_tokens,
-                    temperature=0.7,
-                    response_mime_type="application/json",
-                ),
+                generation_config=self._generation_config(genai, max_tokens),
             )
-            raw_text = response.text
-            return self.parse_response(raw_text)
+            return self._handle_response(response)
 
         except ImportError:
-            return LLMResponse(
-                thought="google-generativeai 패키지 미설치",
-                action="idle",
-                success=False,
-                error="pip install google-generativeai",
-            )
+            return self._import_error_response()
         except Exception as e:
-            return LLMResponse(
-                thought=f"Gemini API 오류: {e}",
-                action="idle",
-                success=False,
-                error=str(e),
+            return self._api_error_response(e)
+
+    @timed
+    async def agenerate(self, prompt: str, max_tokens: int = 1000,
+                        system_prompt: str | None = None) -> LLMResponse:
+        if not self.api_key:
+            return self._missing_key_response()
+
+        try:
+            import google.generativeai as genai
+
+            model = self._build_async_model(genai, system_prompt)
+            if self.stream:
+                response = await model.generate_content_async(
+                    prompt,
+                    generation_config=self._generation_config(genai, max_tokens),
+                    stream=True,
+                )
+                return await self._aconsume_stream(self._aiter_stream(response), max_tokens)
+            response = await model.generate_content_async(
+                prompt,
+                generation_config=self._generation_config(genai, max_tokens),
             )
+            return self._handle_response(response)
+
+        except ImportError:
+            return self._import_error_response()
+        except Exception as e:
+            return self._api_error_response(e)
+
+    def _build_model(self, genai, system_prompt: str | None):
+        """GenerativeModel 공유 — (키, 모델, system) 당 1회 생성"""
+        return get_client(
+            ("google-model", self.api_key, self.model, system_prompt),
+            lambda: self._new_model(genai, system_prompt, asynchronous=False),
+            holder=self,
+        )
+
+    def _build_async_model(self, genai, system_prompt: str | None):
+        """비동기 클라이언트는 루프에 묶이므로 루프별 모델"""
+        return get_async_client(
+            ("google-model", self.api_key, self.model, system_prompt),
+            lambda: self._new_model(genai, system_prompt, asynchronous=True),
+            holder=self,
+        )
+
+    def _new_model(self, genai, system_prompt: str | None, asynchronous: bool):
+        """이 어댑터의 키로 configure한 직후의 서비스 클라이언트를 모델에 고정
+
+        genai.configure는 프로세스 전역이고 GenerativeModel은 첫 호출 때 그 시점의 기본
+        클라이언트를 잡는다. 키가 다른 설정이 한 프로세스에 있으면 마지막 configure의 키로
+        호출되므로 configure → 클라이언트 생성 → 고정을 lock 하나로 묶는다.
+        """
+        from google.generativeai import client as genai_client
+
+        model_kwargs = {}
+        if system_prompt:
+            model_kwargs["system_instruction"] = system_prompt
+        with _configure_lock:
+            genai.configure(api_key=self.api_key)
+            model = genai.GenerativeModel(self.model, **model_kwargs)
+            if asynchronous:
+                model._async_client = genai_client.get_default_generative_async_client()
+            else:
+                model._client = genai_client.get_default_generative_client()
+        return model
+
+    def sampling_params(self) -> dict:
+        return {"temperature": 0.7}
+
+    @staticmethod
+    def _iter_stream(response):
+        """청크 텍스트 조각 — SDK에 취소 API가 없어 읽기만 멈춤 (서버 측 생성은 계속될 수 있음)"""
+        for chunk in response:
+            yield chunk.text
+
+    @staticmethod
+    async def _aiter_stream(response):
+        async for chunk in response:
+            yield chunk.text
+
+    def _handle_response(self, response) -> LLMResponse:
+        parsed = self.parse_response(response.text)
+        usage = getattr(response, "usage_metadata", None)
+        parsed.input_tokens = getattr(usage, "prompt_token_count", None)
+        parsed.output_tokens = getattr(usage, "candidates_token_count", None)
+        parsed.cached_tokens = getattr(usage, "cached_content_token_count", None)
+        return parsed
+
+    def _generation_config(self, genai, max_tokens: int):
+        return genai.types.GenerationConfig(
+            max_output_tokens=max_tokens,
+            response_mime_type="application/json",
+            **self.sampling_params(),
+        )
+
+    @staticmethod
+    def _missing_key_response() -> LLMResponse:
+        return LLMResponse(
+            thought="GOOGLE_API_KEY not set",
+            action="idle",
+            success=False,
+            error="API 키 없음",
+            error_type="config",
+        )
+
+    @staticmethod
+    def _import_error_response() -> LLMResponse:
+        return LLMResponse(
+            thought="google-generativeai 패키지 미설치",
+            action="idle",
+            success=False,
+            error="pip install google-generativeai",
+            error_type="config",
+        )
+
+    @staticmethod
+    def _api_error_response(e: Exception) -> LLMResponse:
+        return LLMResponse(
+            thought=f"Gemini API 오류: {e}",
+            action="idle",
+            success=False,
+            error=str(e),
+            error_type=classify_exception(e),
+            retry_after=retry_after_from_exception(e),
+        )
@@ -0,0 +1,227 @@
+"""프로바이더별 레이트 리밋 / 동시성 거버너
+
+run YAML의 rate_limits 블록으로 설정:
+
+    rate_limits:
+      ollama: {concurrency: 2}
+      anthropic: {rpm: 50, tpm: 40000, concurrency: 8}
+      openai/gpt-4o-mini: {rpm: 500, tpm: 200000}
+
+키는 "어댑터타입/모델" 또는 "어댑터타입". 모델 키가 타입 키보다 우선하며,
+제한은 설정된 키 단위로 공유된다 (타입 키면 그 타입의 모든 모델이 한 버킷을 씀).
+rpm/tpm은 토큰 버킷, concurrency는 동시 요청 수 상한.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Callable, Optional
+
+from .base import AdapterWrapper, BaseLLMAdapter, LLMResponse, Observation
+from .waiters import AsyncWaiters
+
+
+def estimate_tokens(prompt: str, system_prompt: str | None, max_tokens: int) -> int:
+    """TPM 예약용 토큰 추정 — UTF-8 4바이트당 1토큰 + 출력 상한"""
+    text = prompt + (system_prompt or "")
+    return len(text.encode("utf-8")) // 4 + max_tokens
+
+
+class TokenBucket:
+    """분당 rate로 채워지는 토큰 버킷 — 예약 방식 (잔량이 음수가 되면 그만큼 대기)"""
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        if per_minute <= 0:
+            raise ValueError(f"rate must be positive: {per_minute}")
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def reserve(self, amount: float) -> float:
+        """amount 예약 후 대기해야 할 초 반환 (호출자가 lock 보유)"""
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        # 버킷보다 큰 요청도 한 번은 통과할 수 있도록 capacity로 자름
+        self.tokens -= min(amount, self.capacity)
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class RateLimiter:
+    """한 설정 키의 rpm/tpm 버킷 + 동시성 슬롯"""
+
+    def __init__(
+        self,
+        key: str,
+        rpm: Optional[float] = None,
+        tpm: Optional[float] = None,
+        concurrency: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.key = key
+        self.concurrency = concurrency
+        self._requests = TokenBucket(rpm, clock) if rpm else None
+        self._tokens = TokenBucket(tpm, clock) if tpm else None
+        self._clock = clock
+        self._sleep = sleep
+        self._cond = threading.Condition()
+        self._async_waiters = AsyncWaiters(self._cond)
+        self._in_flight = 0
+        self._stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> dict:
+        return {"calls": 0, "queued": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0, "max_in_flight": 0}
+
+    def _try_take_slot(self) -> bool:
+        """lock 보유 상태에서 호출"""
+        if self.concurrency and self._in_flight >= self.concurrency:
+            return False
+        self._in_flight += 1
+        self._stats["max_in_flight"] = max(self._stats["max_in_flight"], self._in_flight)
+        return True
+
+    def _reserve(self, tokens: int) -> float:
+        """lock 보유 상태에서 호출 — 버킷 대기 시간"""
+        delay = 0.0
+        if self._requests is not None:
+            delay = max(delay, self._requests.reserve(1))
+        if self._tokens is not None:
+            delay = max(delay, self._tokens.reserve(tokens))
+        return delay
+
+    def _record(self, started: float, queued: bool):
+        """queued: 슬롯을 기다렸거나 버킷 대기가 있었던 호출"""
+        wait_ms = (self._clock() - started) * 1000
+        with self._cond:
+            self._stats["calls"] += 1
+            if queued:
+                self._stats["queued"] += 1
+            self._stats["wait_ms_total"] += wait_ms
+            self._stats["wait_ms_max"] = max(self._stats["wait_ms_max"], wait_ms)
+
+    def acquire(self, tokens: int = 0):
+        started = self._clock()
+        queued = False
+        with self._cond:
+            while not self._try_take_slot():
+                queued = True
+                self._cond.wait()
+            delay = self._reserve(tokens)
+        if delay > 0:
+            self._sleep(delay)
+        self._record(started, queued or delay > 0)
+
+    async def aacquire(self, tokens: int = 0):
+        started = self._clock()
+        queued = False
+        while True:
+            with self._cond:
+                if self._try_take_slot():
+                    delay = self._reserve(tokens)
+                    break
+                waiter = self._async_waiters.add()
+            queued = True
+            await self._async_waiters.wait(waiter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self._record(started, queued or delay > 0)
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            # 스레드 대기자와 코루틴 대기자를 하나씩 깨움 — 슬롯을 놓친 쪽은 다시 대기
+            self._cond.notify()
+            self._async_waiters.wake()
+
+    def take_stats(self) -> dict:
+        """마지막 호출 이후의 대기 지표 반환 후 초기화 (에폭 요약용)"""
+        with self._cond:
+            stats = dict(self._stats)
+            self._stats = self._empty_stats()
+        stats["wait_ms_total"] = round(stats["wait_ms_total"], 1)
+        stats["wait_ms_max"] = round(stats["wait_ms_max"], 1)
+        stats["wait_ms_mean"] = round(stats["wait_ms_total"] / stats["calls"], 1) if stats["calls"] else 0.0
+        return stats
+
+
+class RateGovernor:
+    """설정 키 → RateLimiter. 같은 키의 어댑터들은 limiter를 공유"""
+
+    def __init__(self, limits: Optional[dict] = None, **limiter_kwargs):
+        self.limits = {k.lower(): dict(v or {}) for k, v in (limits or {}).items()}
+        self._limiter_kwargs = limiter_kwargs
+        self._limiters: dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def _resolve_key(self, adapter_type: str, model: str) -> Optional[str]:
+        adapter_type = adapter_type.lower()
+        for key in (f"{adapter_type}/{model}".lower(), adapter_type):
+            if key in self.limits:
+                return key
+        return None
+
+    def limiter_for(self, adapter_type: str, model: str) -> Optional[RateLimiter]:
+        key = self._resolve_key(adapter_type, model)
+        if key is None:
+            return None
+        with self._lock:
+            if key not in self._limiters:
+                cfg = self.limits[key]
+                self._limiters[key] = RateLimiter(
+                    key,
+                    rpm=cfg.get("rpm"),
+                    tpm=cfg.get("tpm"),
+                    concurrency=cfg.get("concurrency"),
+                    **self._limiter_kwargs,
+                )
+            return self._limiters[key]
+
+    def wrap(self, adapter: BaseLLMAdapter, adapter_type: str) -> BaseLLMAdapter:
+        """설정된 제한이 있으면 GovernedAdapter로 감싸고, 없으면 그대로 반환"""
+        limiter = self.limiter_for(adapter_type, adapter.model)
+        if limiter is None:
+            return adapter
+        return GovernedAdapter(adapter, limiter)
+
+    def take_stats(self) -> dict:
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {limiter.key: limiter.take_stats() for limiter in limiters}
+
+
+class GovernedAdapter(AdapterWrapper):
+    """모든 호출을 RateLimiter를 거쳐 내보내는 레이어"""
+
+    def __init__(self, inner: BaseLLMAdapter, limiter: RateLimiter):
+        super().__init__(inner)
+        self.limiter = limiter
+
+    def generate(self, prompt: str, max_tokens: int = 1000,
+                 system_prompt: str | None = None) -> LLMResponse:
+        self.limiter.acquire(estimate_tokens(prompt, system_prompt, max_tokens))
+        try:
+            return super().generate(prompt, max_tokens, system_prompt)
+        finally:
+            self.limiter.release()
+
+    async def agenerate(self, prompt: str, max_tokens: int = 1000,
+                        system_prompt: str | None = None) -> LLMResponse:
+        await self.limiter.aacquire(estimate_tokens(prompt, system_prompt, max_tokens))
+        try:
+            return await super().agenerate(prompt, max_tokens, system_prompt)
+        finally:
+            self.limiter.release()
+
+    def observe(self, observation: Observation) -> LLMResponse:
+        """관찰 경로도 같은 한도 — mock으로 레이트 리밋 설정을 시험할 수 있도록 (토큰 추정은 0)"""
+        self.limiter.acquire()
+        try:
+            return self.inner.observe(observation)
+        finally:
+            self.limiter.release()
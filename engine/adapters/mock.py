@@ -4,16 +4,21 @@ import random
 import re
 from typing import Optional
 
-from .base import BaseLLMAdapter, LLMResponse
+from .base import BaseLLMAdapter, LLMResponse, Observation, timed
 
 
 class MockAdapter(BaseLLMAdapter):
 
+    supports_observation = True
+
     def __init__(self, model: str = "mock", **kwargs):
+        # 에이전트 전용 스트림 (시뮬레이션이 RngTree에서 주입) — 없으면 전역 random
+        self.rng = kwargs.pop("rng", None) or random
         super().__init__(model, **kwargs)
         self.persona = kwargs.get("persona", "citizen")
         self.agent_id = kwargs.get("agent_id", "unknown")
 
+    @timed
     def generate(self, prompt: str, max_tokens: int = 1000,
                  system_prompt: str | None = None) -> LLMResponse:
         location = self._extract_location(prompt)
@@ -21,6 +26,25 @@ class MockAdapter(BaseLLMAdapter):
         agents_here = self._extract_agents_here(prompt)
         move_locations = self._extract_move_locations(prompt)
 
+        return self._respond(location, available_actions, agents_here, move_locations)
+
+    @timed
+    def observe(self, observation: Observation) -> LLMResponse:
+        """headless 경로 — 프롬프트 정규식 추출 대신 관찰 필드로 바로 결정"""
+        return self._respond(
+            observation.location,
+            observation.available_actions or ["idle"],
+            [a for a in observation.agents_here if a != self.agent_id],
+            observation.move_locations,
+        )
+
+    def _respond(
+        self,
+        location: str,
+        available_actions: list[str],
+        agents_here: list[str],
+        move_locations: list[str],
+    ) -> LLMResponse:
         action, thought, target, content = self._decide_action(
             location, available_actions, agents_here, move_locations
         )
@@ -34,6 +58,11 @@ class MockAdapter(BaseLLMAdapter):
             success=True,
         )
 
+    async def agenerate(self, prompt: str, max_tokens: int = 1000,
+                        system_prompt: str | None = None) -> LLMResponse:
+        """규칙 기반이라 블로킹 I/O 없음 — 이벤트 루프에서 바로 실행"""
+        return self.generate(prompt, max_tokens=max_tokens, system_prompt=system_prompt)
+
     def _extract_location(self, prompt: str) -> str:
         match = re.search(r'(?:위치|Location):\s*(\w+)', prompt)
         return match.group(1) if match else "plaza"
@@ -77,21 +106,21 @@ class MockAdapter(BaseLLMAdapter):
 
         elif self.persona == "jester":
             if location.startswith("alley") and "whisper" in available_actions:
-                if random.random() < 0.5 and agents_here:
-                    t = random.choice(agents_here)
+                if self.rng.random() < 0.5 and agents_here:
+                    t = self.rng.choice(agents_here)
                     return "whisper", "소문 퍼뜨리기", t, "비밀 이야기..."
             if "speak" in available_actions:
                 return "speak", "광대의 발언", None, "이 세계의 규칙에 의문을 던진다!"
 
         elif self.persona == "observer":
-            if random.random() < 0.7:
+            if self.rng.random() < 0.7:
                 return "idle", "관찰 중", None, None
 
         elif self.persona == "influencer":
             if "speak" in available_actions:
                 return "speak", "영향력 행사", None, f"[{self.agent_id}] 저를 지지해주세요!"
             if "support" in available_actions and agents_here:
-                t = random.choice(agents_here)
+                t = self.rng.choice(agents_here)
                 return "support", "전략적 지지", t, None
 
         elif self.persona == "archivist":
@@ -111,7 +140,7 @@ class MockAdapter(BaseLLMAdapter):
         if not valid:
             return "idle", "행동 없음", None, None
 
-        action = random.choices(
+        action = self.rng.choices(
             valid,
             weights=[weights.get(a, 1) for a in valid],
             k=1,
@@ -121,9 +150,9 @@ class MockAdapter(BaseLLMAdapter):
             content = f"[{self.persona}] 일반 발언"
         elif action == "move":
             candidates = [l for l in move_locations if l != location]
-            target = random.choice(candidates) if candidates else location
+            target = self.rng.choice(candidates) if candidates else location
         elif action in ("support", "whisper") and agents_here:
-            target = random.choice(agents_here)
+            target = self.rng.choice(agents_here)
             if action == "whisper":
                 content = "비밀 대화"
 
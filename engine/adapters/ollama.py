@@ -2,8 +2,19 @@
 
 import json
 import requests
+from requests.adapters import HTTPAdapter
 
-from .base import BaseLLMAdapter, LLMResponse
+from .base import BaseLLMAdapter, LLMResponse, timed
+from .retry import classify_exception
+from .pool import DEFAULT_POOL_SIZE, get_client, get_async_client, httpx_limits
+
+
+def _build_session(pool_size: int) -> requests.Session:
+    session = requests.Session()
+    http_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", http_adapter)
+    session.mount("https://", http_adapter)
+    return session
 
 
 class OllamaAdapter(BaseLLMAdapter):
@@ -17,63 +28,184 @@ class OllamaAdapter(BaseLLMAdapter):
         super().__init__(model, **kwargs)
         self.base_url = base_url
         self.timeout = kwargs.get("timeout", 60)
+        self.pool_size = kwargs.get("pool_size", DEFAULT_POOL_SIZE)
+        # 모델을 메모리에 유지할 시간 (예: "30m", -1 = 무기한) — 유지되는 동안 같은
+        # system/접두부 프롬프트의 KV 캐시가 재사용된다. None이면 서버 기본값(5분)
+        self.keep_alive = kwargs.get("keep_alive")
 
+    @property
+    def session(self) -> requests.Session:
+        """같은 base_url의 어댑터끼리 공유하는 keep-alive 세션"""
+        return get_client(
+            ("ollama", self.base_url, self.pool_size),
+            lambda: _build_session(self.pool_size),
+            holder=self,
+        )
+
+    @timed
     def generate(self, prompt: str, max_tokens: int = 1000,
                  system_prompt: str | None = None) -> LLMResponse:
         try:
-            payload = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "num_predict": max_tokens,
-                    "temperature": 0.7,
-                },
-            }
-            if system_prompt:
-                payload["system"] = system_prompt
-            response = requests.post(
+            if self.stream:
+                usage = {}
+                response = self._consume_stream(
+                    self._iter_stream(prompt, max_tokens, system_prompt, usage), max_tokens,
+                )
+                return self._with_usage(response, usage)
+            response = self.session.post(
                 f"{self.base_url}/api/generate",
-                json=payload,
+                json=self._payload(prompt, max_tokens, system_prompt),
                 timeout=self.timeout,
             )
             response.raise_for_status()
             data = response.json()
             raw_text = data.get("response", "")
-            return self.parse_response(raw_text)
+            return self._with_usage(self.parse_response(raw_text), data)
 
         except requests.exceptions.ConnectionError:
-            return LLMResponse(
-                thought="Ollama 서버 연결 실패",
-                action="idle",
-                success=False,
-                error="Ollama 서버 연결 실패",
-            )
+            return self._connection_error_response()
         except requests.exceptions.Timeout:
-            return LLMResponse(
-                thought="Ollama 응답 시간 초과",
-                action="idle",
-                success=False,
-                error="응답 시간 초과",
-            )
+            return self._timeout_response()
         except Exception as e:
-            return LLMResponse(
-                thought=f"Ollama 오류: {e}",
-                action="idle",
-                success=False,
-                error=str(e),
+            return self._error_response(e)
+
+    @timed
+    async def agenerate(self, prompt: str, max_tokens: int = 1000,
+                        system_prompt: str | None = None) -> LLMResponse:
+        try:
+            import httpx
+        except ImportError:
+            return await super().agenerate(prompt, max_tokens, system_prompt)
+
+        try:
+            client = get_async_client(
+                ("ollama", self.base_url, self.pool_size),
+                lambda: httpx.AsyncClient(timeout=self.timeout, limits=httpx_limits(self.pool_size)),
+                holder=self,
+            )
+            if self.stream:
+                usage = {}
+                response = await self._aconsume_stream(
+                    self._aiter_stream(client, prompt, max_tokens, system_prompt, usage), max_tokens,
+                )
+                return self._with_usage(response, usage)
+            response = await client.post(
+                f"{self.base_url}/api/generate",
+                json=self._payload(prompt, max_tokens, system_prompt),
             )
+            response.raise_for_status()
+            data = response.json()
+            raw_text = data.get("response", "")
+            return self._with_usage(self.parse_response(raw_text), data)
+
+        except httpx.ConnectError:
+            return self._connection_error_response()
+        except httpx.TimeoutException:
+            return self._timeout_response()
+        except Exception as e:
+            return self._error_response(e)
+
+    def _iter_stream(self, prompt: str, max_tokens: int, system_prompt: str | None, usage: dict):
+        """NDJSON 스트림의 텍스트 조각 — 제너레이터가 닫히면 연결을 끊어 서버 생성도 중단
+
+        끝까지 읽은 경우에만 마지막(done) 줄의 토큰 통계가 usage에 담긴다.
+        """
+        payload = {**self._payload(prompt, max_tokens, system_prompt), "stream": True}
+        with self.session.post(
+            f"{self.base_url}/api/generate", json=payload, timeout=self.timeout, stream=True,
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                yield data.get("response", "")
+                if data.get("done"):
+                    usage.update(data)
+                    return
+
+    async def _aiter_stream(self, client, prompt: str, max_tokens: int, system_prompt: str | None, usage: dict):
+        payload = {**self._payload(prompt, max_tokens, system_prompt), "stream": True}
+        async with client.stream("POST", f"{self.base_url}/api/generate", json=payload) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                yield data.get("response", "")
+                if data.get("done"):
+                    usage.update(data)
+                    return
+
+    def sampling_params(self) -> dict:
+        return {"temperature": 0.7}
+
+    @staticmethod
+    def _with_usage(response: LLMResponse, data: dict) -> LLMResponse:
+        """Ollama 응답 통계 — prompt_eval_count(입력), eval_count(출력), 지속시간은 ns 단위"""
+        response.input_tokens = data.get("prompt_eval_count")
+        response.output_tokens = data.get("eval_count")
+        if response.ttft_ms is None and "prompt_eval_duration" in data:
+            # 비스트리밍은 첫 토큰 시각을 볼 수 없어 서버의 모델 로드 + 프롬프트 평가 시간으로 추정
+            response.ttft_ms = round((data.get("load_duration", 0) + data["prompt_eval_duration"]) / 1e6, 1)
+        return response
+
+    def _payload(self, prompt: str, max_tokens: int, system_prompt: str | None) -> dict:
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": False,
+            "options": {
+                "num_predict": max_tokens,
+                **self.sampling_params(),
+            },
+        }
+        if system_prompt:
+            payload["system"] = system_prompt
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        return payload
+
+    @staticmethod
+    def _connection_error_response() -> LLMResponse:
+        return LLMResponse(
+            thought="Ollama 서버 연결 실패",
+            action="idle",
+            success=False,
+            error="Ollama 서버 연결 실패",
+            error_type="connection",
+        )
+
+    @staticmethod
+    def _timeout_response() -> LLMResponse:
+        return LLMResponse(
+            thought="Ollama 응답 시간 초과",
+            action="idle",
+            success=False,
+            error="응답 시간 초과",
+            error_type="timeout",
+        )
+
+    @staticmethod
+    def _error_response(e: Exception) -> LLMResponse:
+        return LLMResponse(
+            thought=f"Ollama 오류: {e}",
+            action="idle",
+            success=False,
+            error=str(e),
+            error_type=classify_exception(e),
+        )
 
     def check_connection(self) -> bool:
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=5)
             return response.status_code == 200
         except Exception:
             return False
 
     def list_models(self) -> list[str]:
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 return [m["name"] for m in data.get("models", [])]
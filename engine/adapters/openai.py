@@ -3,7 +3,9 @@
 import os
 from typing import Optional
 
-from .base import BaseLLMAdapter, LLMResponse
+from .base import BaseLLMAdapter, LLMResponse, timed
+from .retry import classify_exception, retry_after_from_exception
+from .pool import DEFAULT_POOL_SIZE, get_client, get_async_client, httpx_limits
 
 
 class OpenAIAdapter(BaseLLMAdapter):
@@ -16,56 +18,162 @@ class OpenAIAdapter(BaseLLMAdapter):
     ):
         super().__init__(model, **kwargs)
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
+        self.base_url = kwargs.get("base_url")
+        self.pool_size = kwargs.get("pool_size", DEFAULT_POOL_SIZE)
 
+    @timed
     def generate(self, prompt: str, max_tokens: int = 16000,
                  system_prompt: str | None = None) -> LLMResponse:
         if not self.api_key:
-            return LLMResponse(
-                thought="OPENAI_API_KEY not set",
-                action="idle",
-                success=False,
-                error="API 키 없음",
-            )
+            return self._missing_key_response()
 
         try:
-            from openai import OpenAI
-
-            client = OpenAI(api_key=self.api_key)
-            messages = []
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            messages.append({"role": "user", "content": prompt})
-            params = {
-                "model": self.model,
-                "max_completion_tokens": max_tokens,
-                "response_format": {"type": "json_object"},
-                "messages": messages,
-            }
-            # GPT-5 and o-series models don't support temperature
-            if not any(x in self.model for x in ["gpt-5", "o1", "o3", "o4"]):
-                params["temperature"] = 0.7
-            response = client.chat.completions.create(**params)
-            raw_text = response.choices[0].message.content or ""
-            if not raw_text:
-                return LLMResponse(
-                    thought="빈 응답 (토큰 부족 가능)",
-                    action="idle",
-                    success=False,
-                    error=f"Empty response, finish_reason={response.choices[0].finish_reason}",
+            from openai import OpenAI, DefaultHttpxClient
+
+            client = get_client(self._pool_key(), lambda: OpenAI(
+                **self._client_kwargs(),
+                http_client=DefaultHttpxClient(limits=httpx_limits(self.pool_size)),
+            ), holder=self)
+            if self.stream:
+                stream = client.chat.completions.create(
+                    **self._create_params(prompt, max_tokens, system_prompt), stream=True,
                 )
-            return self.parse_response(raw_text)
+                return self._consume_stream(self._iter_stream(stream), max_tokens)
+            response = client.chat.completions.create(
+                **self._create_params(prompt, max_tokens, system_prompt)
+            )
+            return self._handle_completion(response)
 
         except ImportError:
-            return LLMResponse(
-                thought="openai 패키지 미설치",
-                action="idle",
-                success=False,
-                error="pip install openai",
+            return self._import_error_response()
+        except Exception as e:
+            return self._api_error_response(e)
+
+    @timed
+    async def agenerate(self, prompt: str, max_tokens: int = 16000,
+                        system_prompt: str | None = None) -> LLMResponse:
+        if not self.api_key:
+            return self._missing_key_response()
+
+        try:
+            from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+            client = get_async_client(self._pool_key(), lambda: AsyncOpenAI(
+                **self._client_kwargs(),
+                http_client=DefaultAsyncHttpxClient(limits=httpx_limits(self.pool_size)),
+            ), holder=self)
+            if self.stream:
+                stream = await client.chat.completions.create(
+                    **self._create_params(prompt, max_tokens, system_prompt), stream=True,
+                )
+                return await self._aconsume_stream(self._aiter_stream(stream), max_tokens)
+            response = await client.chat.completions.create(
+                **self._create_params(prompt, max_tokens, system_prompt)
             )
+            return self._handle_completion(response)
+
+        except ImportError:
+            return self._import_error_response()
         except Exception as e:
-            return LLMResponse(
-                thought=f"OpenAI API 오류: {e}",
+            return self._api_error_response(e)
+
+    def _pool_key(self) -> tuple:
+        return ("openai", self.base_url, self.api_key, self.pool_size)
+
+    def _client_kwargs(self) -> dict:
+        # 재시도는 RetryingAdapter가 담당 — SDK 내장 재시도와 중복되지 않게 끔
+        client_kwargs = {"api_key": self.api_key, "max_retries": 0}
+        if self.base_url:
+            client_kwargs["base_url"] = self.base_url
+        return client_kwargs
+
+    def _create_params(self, prompt: str, max_tokens: int,
+                       system_prompt: str | None) -> dict:
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        return {
+            "model": self.model,
+            "max_completion_tokens": max_tokens,
+            "response_format": {"type": "json_object"},
+            "messages": messages,
+            **self.sampling_params(),
+        }
+
+    def sampling_params(self) -> dict:
+        # GPT-5 and o-series models don't support temperature
+        if any(x in self.model for x in ["gpt-5", "o1", "o3", "o4"]):
+            return {}
+        return {"temperature": 0.7}
+
+    @staticmethod
+    def _iter_stream(stream):
+        """delta 텍스트 조각 — 닫히면 HTTP 스트림을 끊어 남은 생성을 취소"""
+        try:
+            for chunk in stream:
+                if chunk.choices:
+                    yield chunk.choices[0].delta.content or ""
+        finally:
+            stream.close()
+
+    @staticmethod
+    async def _aiter_stream(stream):
+        try:
+            async for chunk in stream:
+                if chunk.choices:
+                    yield chunk.choices[0].delta.content or ""
+        finally:
+            await stream.close()
+
+    def _handle_completion(self, response) -> LLMResponse:
+        raw_text = response.choices[0].message.content or ""
+        if raw_text:
+            parsed = self.parse_response(raw_text)
+        else:
+            parsed = LLMResponse(
+                thought="빈 응답 (토큰 부족 가능)",
                 action="idle",
                 success=False,
-                error=str(e),
+                error=f"Empty response, finish_reason={response.choices[0].finish_reason}",
+                error_type="empty",
             )
+        # 빈 응답도 추론 토큰은 소모하므로 usage는 항상 기록
+        usage = getattr(response, "usage", None)
+        parsed.input_tokens = getattr(usage, "prompt_tokens", None)
+        parsed.output_tokens = getattr(usage, "completion_tokens", None)
+        # OpenAI는 1024 토큰 이상 접두부를 자동 캐시 — 적중 토큰 수만 기록
+        details = getattr(usage, "prompt_tokens_details", None)
+        parsed.cached_tokens = getattr(details, "cached_tokens", None)
+        return parsed
+
+    @staticmethod
+    def _missing_key_response() -> LLMResponse:
+        return LLMResponse(
+            thought="OPENAI_API_KEY not set",
+            action="idle",
+            success=False,
+            error="API 키 없음",
+            error_type="config",
+        )
+
+    @staticmethod
+    def _import_error_response() -> LLMResponse:
+        return LLMResponse(
+            thought="openai 패키지 미설치",
+            action="idle",
+            success=False,
+            error="pip install openai",
+            error_type="config",
+        )
+
+    @staticmethod
+    def _api_error_response(e: Exception) -> LLMResponse:
+        return LLMResponse(
+            thought=f"OpenAI API 오류: {e}",
+            action="idle",
+            success=False,
+            error=str(e),
+            error_type=classify_exception(e),
+            retry_after=retry_after_from_exception(e),
+        )
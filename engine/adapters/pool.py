@@ -0,0 +1,110 @@
+"""어댑터 공용 클라이언트 풀 — provider/base_url 별 장수명 클라이언트 공유
+
+같은 provider·base_url·API 키를 쓰는 어댑터(=에이전트)들은 하나의 클라이언트와
+커넥션 풀을 공유한다. 비동기 클라이언트는 이벤트 루프에 묶이므로 루프별로 따로 둔다.
+"""
+
+import asyncio
+import inspect
+import threading
+from typing import Any, Callable
+
+DEFAULT_POOL_SIZE = 10
+
+_clients: dict[tuple, Any] = {}
+_holders: dict[tuple, set[int]] = {}  # key → 클라이언트를 잡은 holder(어댑터) id
+_lock = threading.Lock()
+
+
+def get_client(key: tuple, factory: Callable[[], Any], holder: Any = None) -> Any:
+    """key에 해당하는 공유 클라이언트 반환 (없으면 factory로 생성)
+
+    holder(보통 호출한 어댑터)를 넘기면 release_clients가 그 holder 몫만 반납할 수 있다.
+    """
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = factory()
+            _clients[key] = client
+        if holder is not None:
+            _holders.setdefault(key, set()).add(id(holder))
+        return client
+
+
+def get_async_client(key: tuple, factory: Callable[[], Any], holder: Any = None) -> Any:
+    """현재 실행 중인 이벤트 루프 전용 공유 비동기 클라이언트 반환"""
+    loop = asyncio.get_running_loop()
+    return get_client(("async", id(loop)) + key, factory, holder)
+
+
+def _close(client):
+    close = getattr(client, "close", None)
+    if callable(close):
+        try:
+            close()
+        except Exception:
+            pass
+
+
+def release_clients(holders):
+    """holders가 잡은 클라이언트만 반납 — 다른 holder가 남지 않은 클라이언트는 풀에서 빼고 종료
+
+    한 프로세스에서 여러 시뮬레이션이 풀을 같이 쓸 때 run 종료가 다른 run의 클라이언트를
+    닫지 않도록 한다. 비동기 클라이언트는 풀에서만 제거 (종료는 aclose_clients).
+    """
+    ids = {id(h) for h in holders}
+    orphaned = []
+    with _lock:
+        for key, held in list(_holders.items()):
+            if not held & ids:
+                continue
+            held -= ids
+            if held:
+                continue
+            del _holders[key]
+            client = _clients.pop(key, None)
+            if client is not None and key[0] != "async":
+                orphaned.append(client)
+    for client in orphaned:
+        _close(client)
+
+
+def close_clients():
+    """프로세스 전체 종료용 — 동기 클라이언트 전부 종료. 비동기 클라이언트는 풀에서만 제거."""
+    with _lock:
+        clients = list(_clients.items())
+        _clients.clear()
+        _holders.clear()
+    for key, client in clients:
+        if key[0] == "async":
+            continue
+        _close(client)
+
+
+async def aclose_clients():
+    """현재 이벤트 루프에 묶인 비동기 클라이언트 종료"""
+    loop_id = id(asyncio.get_running_loop())
+    with _lock:
+        keys = [k for k in _clients if k[0] == "async" and k[1] == loop_id]
+        clients = [_clients.pop(k) for k in keys]
+        for k in keys:
+            _holders.pop(k, None)
+    for client in clients:
+        close = getattr(client, "aclose", None) or getattr(client, "close", None)
+        if not callable(close):
+            continue
+        try:
+            result = close()
+            if inspect.isawaitable(result):
+                await result
+        except Exception:
+            pass
+
+
+def httpx_limits(pool_size: int):
+    import httpx
+
+    return httpx.Limits(
+        max_connections=pool_size,
+        max_keepalive_connections=pool_size,
+    )
@@ -0,0 +1,210 @@
+"""재시도 정책 — 에러 클래스별 예산, 지터 지수 백오프, Retry-After 준수
+
+run YAML의 retry 블록으로 설정:
+
+    retry:
+      budgets: {timeout: 2, rate_limit: 4, parse_error: 1}
+      base_delay: 0.5
+      max_delay: 30
+
+에러 클래스:
+    timeout     — 응답 시간 초과
+    rate_limit  — 429 / 과부하 (Retry-After 헤더가 있으면 그만큼 대기)
+    connection  — 서버 연결 실패
+    api_error   — 기타 API 오류
+    parse_error — 응답은 왔으나 JSON 파싱 실패 (백오프 없이 즉시 재시도)
+    empty       — 빈 응답 (백오프 없이 즉시 재시도)
+    config      — API 키 없음, 패키지 미설치 등 (재시도 안 함)
+"""
+
+import asyncio
+import random
+import time
+from typing import Callable, Optional
+
+from .base import AdapterWrapper, BaseLLMAdapter, LLMResponse, elapsed_ms
+
+ERROR_CLASSES = (
+    "timeout", "rate_limit", "connection", "api_error", "parse_error", "empty", "config",
+)
+
+DEFAULT_BUDGETS = {
+    "timeout": 2,
+    "rate_limit": 4,
+    "connection": 2,
+    "api_error": 1,
+    "parse_error": 1,
+    "empty": 1,
+    "config": 0,
+}
+
+# 모델 출력 문제 — 서버 부하와 무관하므로 기다려도 나아지지 않음
+IMMEDIATE_CLASSES = ("parse_error", "empty")
+
+
+def classify_exception(e: Exception) -> str:
+    """SDK 예외 → 에러 클래스 (SDK별 예외 타입을 import하지 않고 이름/상태코드로 판별)"""
+    status = getattr(e, "status_code", None)
+    if status is None:
+        status = getattr(getattr(e, "response", None), "status_code", None)
+    name = type(e).__name__.lower()
+    if status == 429 or "ratelimit" in name or "resourceexhausted" in name:
+        return "rate_limit"
+    if status in (503, 529) or "overloaded" in name:
+        return "rate_limit"
+    if "timeout" in name or "deadline" in name:
+        return "timeout"
+    if "connection" in name:
+        return "connection"
+    return "api_error"
+
+
+def retry_after_from_exception(e: Exception) -> Optional[float]:
+    """예외에 딸린 HTTP 응답의 Retry-After 헤더 (초)"""
+    headers = getattr(getattr(e, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None  # HTTP-date 형식은 무시하고 백오프 사용
+
+
+def classify_response(response: LLMResponse) -> Optional[str]:
+    """응답의 에러 클래스 (성공이면 None)"""
+    if response.success:
+        return None
+    if response.error_type:
+        return response.error_type
+    # error_type 도입 이전에 캐시된 응답 등 — 메시지로 추정
+    error_str = (response.error or "").lower()
+    if "시간 초과" in error_str or "timeout" in error_str:
+        return "timeout"
+    if "파싱" in error_str:
+        return "parse_error"
+    return "api_error"
+
+
+class RetryPolicy:
+    """에러 클래스별 재시도 예산 + 백오프 계산"""
+
+    def __init__(
+        self,
+        budgets: Optional[dict] = None,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        multiplier: float = 2.0,
+        seed: Optional[int] = None,
+    ):
+        self.budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+        unknown = set(self.budgets) - set(ERROR_CLASSES)
+        if unknown:
+            raise ValueError(f"Unknown error class: {sorted(unknown)}. Available: {list(ERROR_CLASSES)}")
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        # 지터 전용 RNG — 시뮬레이션의 전역 random 흐름을 건드리지 않음
+        self._rng = random.Random(seed)
+
+    @classmethod
+    def from_config(cls, cfg: Optional[dict], seed: Optional[int] = None) -> "RetryPolicy":
+        cfg = cfg or {}
+        return cls(
+            budgets=cfg.get("budgets"),
+            base_delay=cfg.get("base_delay", 0.5),
+            max_delay=cfg.get("max_delay", 30.0),
+            multiplier=cfg.get("multiplier", 2.0),
+            seed=seed,
+        )
+
+    def reseed(self, seed: Optional[int]):
+        self._rng.seed(seed)
+
+    def should_retry(self, error_class: str, retries_so_far: int) -> bool:
+        return retries_so_far < self.budgets.get(error_class, 0)
+
+    def delay(self, error_class: str, retry_number: int, retry_after: Optional[float] = None) -> float:
+        """retry_number번째 재시도(1부터) 전 대기 초 — equal jitter"""
+        if error_class in IMMEDIATE_CLASSES:
+            return 0.0
+        # max_delay는 계산한 백오프에만 적용 — 서버의 Retry-After보다 일찍 보내면 다시 429
+        ceiling = min(self.max_delay, self.base_delay * self.multiplier ** (retry_number - 1))
+        delay = ceiling / 2 + self._rng.uniform(0, ceiling / 2)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+class RetryingAdapter(AdapterWrapper):
+    """RetryPolicy에 따라 재호출하고 시도별 지연을 response.attempts에 기록"""
+
+    def __init__(
+        self,
+        inner: BaseLLMAdapter,
+        policy: RetryPolicy,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        super().__init__(inner)
+        self.policy = policy
+        self._sleep = sleep
+
+    def _next_delay(self, response: LLMResponse, retries: dict) -> Optional[float]:
+        """재시도하면 대기 초, 아니면 None"""
+        error_class = classify_response(response)
+        if error_class is None:
+            return None
+        done = retries.get(error_class, 0)
+        if not self.policy.should_retry(error_class, done):
+            return None
+        retries[error_class] = done + 1
+        return self.policy.delay(error_class, done + 1, response.retry_after)
+
+    @staticmethod
+    def _attempt(response: LLMResponse, started: float) -> dict:
+        return {
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+            "error_type": classify_response(response),
+        }
+
+    def generate(self, prompt: str, max_tokens: int = 1000,
+                 system_prompt: str | None = None) -> LLMResponse:
+        attempts = []
+        retries: dict[str, int] = {}
+        first_started = time.perf_counter()
+        while True:
+            started = time.perf_counter()
+            response = super().generate(prompt, max_tokens, system_prompt)
+            attempts.append(self._attempt(response, started))
+            delay = self._next_delay(response, retries)
+            if delay is None:
+                break
+            attempts[-1]["backoff_ms"] = round(delay * 1000, 1)
+            if delay > 0:
+                self._sleep(delay)
+        response.attempts = attempts
+        # 에이전트가 실제로 기다린 시간 — 모든 시도와 백오프 포함
+        response.latency_ms = elapsed_ms(first_started)
+        response.retries = len(attempts) - 1
+        return response
+
+    async def agenerate(self, prompt: str, max_tokens: int = 1000,
+                        system_prompt: str | None = None) -> LLMResponse:
+        attempts = []
+        retries: dict[str, int] = {}
+        first_started = time.perf_counter()
+        while True:
+            started = time.perf_counter()
+            response = await super().agenerate(prompt, max_tokens, system_prompt)
+            attempts.append(self._attempt(response, started))
+            delay = self._next_delay(response, retries)
+            if delay is None:
+                break
+            attempts[-1]["backoff_ms"] = round(delay * 1000, 1)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        response.attempts = attempts
+        # 에이전트가 실제로 기다린 시간 — 모든 시도와 백오프 포함
+        response.latency_ms = elapsed_ms(first_started)
+        response.retries = len(attempts) - 1
+        return response
@@ -0,0 +1,219 @@
+"""Ollama 모델 친화 스케줄러 — 같은 모델 요청을 묶어 가중치 스왑 최소화
+
+혼합 모델 run(예: Latin Square — exaone + mistral이 한 Ollama 서버 공유)을 simultaneous
+모드로 돌리면 동시에 나가는 요청의 모델이 번갈아 바뀌고, 서버는 요청마다 모델 가중치를
+RAM/VRAM에 다시 올린다. 스케줄러는 서버(base_url)별로 "현재 모델"을 두고:
+
+  - 현재 모델 요청은 parallel개까지 동시에 보냄 (서버 OLLAMA_NUM_PARALLEL 창 안에서 함께 처리)
+  - 다른 모델 요청은 현재 모델의 대기열이 비고 진행 중 요청이 끝날 때까지 대기
+  - 모델 전환 시 가장 많이 기다리는 모델로 (동률이면 먼저 도착한 요청의 모델)
+  - 한 모델을 max_batch개 연속 처리하면 다른 모델에게 양보 (기아 방지)
+
+run YAML 설정:
+
+    ollama_scheduler:
+      parallel: 2        # 같은 모델 동시 요청 수
+      max_batch: 32      # 한 모델 연속 처리 상한
+      keep_alive: 30m    # 감싼 어댑터에 keep_alive가 없으면 적용 (스왑 후 재적재 방지)
+
+/api/generate는 요청당 프롬프트 하나만 받으므로 "묶음"은 같은 모델 요청을 한 창에
+동시에 보내는 방식이다. sequential 모드는 턴마다 한 요청뿐이라 keep_alive만 의미가 있다.
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+from collections import Counter
+from typing import Callable, Optional
+
+from .base import AdapterWrapper, BaseLLMAdapter, LLMResponse
+from .waiters import AsyncWaiters
+
+
+class AffinityGate:
+    """한 Ollama 서버의 모델 전환 게이트"""
+
+    def __init__(
+        self,
+        key: str,
+        parallel: int = 1,
+        max_batch: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if parallel < 1:
+            raise ValueError(f"parallel must be >= 1: {parallel}")
+        self.key = key
+        self.parallel = parallel
+        self.max_batch = max_batch
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._async_waiters = AsyncWaiters(self._cond)
+        self._active: Optional[str] = None
+        self._in_flight = 0
+        self._served = 0  # 현재 모델로 전환된 뒤 처리한 요청 수
+        self._waiting: Counter = Counter()
+        self._first_ticket: dict[str, int] = {}  # 모델별 대기열이 생긴 순서 (동률 깨기)
+        self._tickets = itertools.count()
+        self._stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> dict:
+        return {"calls": 0, "switches": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0, "max_in_flight": 0}
+
+    def _yield_due(self) -> bool:
+        """현재 모델이 max_batch를 채웠고 다른 모델이 기다리는 중"""
+        return bool(
+            self.max_batch and self._served >= self.max_batch
+            and any(n for m, n in self._waiting.items() if m != self._active)
+        )
+
+    def _next_model(self) -> Optional[str]:
+        candidates = [m for m, n in self._waiting.items() if n]
+        if self._yield_due():
+            candidates = [m for m in candidates if m != self._active]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda m: (-self._waiting[m], self._first_ticket[m]))
+
+    def _try_take(self, model: str) -> bool:
+        """lock 보유 상태에서 호출"""
+        if self._active == model:
+            taken = self._in_flight < self.parallel and not self._yield_due()
+        else:
+            taken = False
+        if not taken and self._in_flight == 0 and self._next_model() == model and (
+            self._active is None or not self._waiting[self._active] or self._yield_due()
+        ):
+            if self._active is not None and self._active != model:
+                self._stats["switches"] += 1
+            self._active = model
+            self._served = 0
+            taken = True
+        if taken:
+            self._in_flight += 1
+            self._served += 1
+            self._stats["max_in_flight"] = max(self._stats["max_in_flight"], self._in_flight)
+        return taken
+
+    def _enqueue(self, model: str):
+        if not self._waiting[model]:
+            self._first_ticket[model] = next(self._tickets)
+        self._waiting[model] += 1
+
+    def _dequeue(self, model: str):
+        self._waiting[model] -= 1
+        if not self._waiting[model]:
+            self._first_ticket.pop(model, None)
+
+    def _record(self, started: float):
+        """lock 보유 상태에서 호출"""
+        wait_ms = (self._clock() - started) * 1000
+        self._stats["calls"] += 1
+        self._stats["wait_ms_total"] += wait_ms
+        self._stats["wait_ms_max"] = max(self._stats["wait_ms_max"], wait_ms)
+
+    def acquire(self, model: str):
+        started = self._clock()
+        with self._cond:
+            self._enqueue(model)
+            while not self._try_take(model):
+                self._cond.wait()
+            self._dequeue(model)
+            self._record(started)
+
+    async def aacquire(self, model: str):
+        started = self._clock()
+        with self._cond:
+            self._enqueue(model)
+        while True:
+            with self._cond:
+                if self._try_take(model):
+                    self._dequeue(model)
+                    self._record(started)
+                    return
+                waiter = self._async_waiters.add()
+            try:
+                await self._async_waiters.wait(waiter)
+            except asyncio.CancelledError:
+                # 취소된 요청이 대기열에 남으면 그 모델로 전환을 기다리며 멈춤
+                with self._cond:
+                    self._dequeue(model)
+                    self._cond.notify_all()
+                    self._async_waiters.wake_all()
+                raise
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            # 다음 모델 선택은 대기열 전체를 보고 정하므로 모두 깨워 다시 판단
+            self._cond.notify_all()
+            self._async_waiters.wake_all()
+
+    def take_stats(self) -> dict:
+        """마지막 호출 이후의 전환/대기 지표 반환 후 초기화 (에폭 요약용)"""
+        with self._cond:
+            stats = dict(self._stats)
+            self._stats = self._empty_stats()
+        stats["wait_ms_total"] = round(stats["wait_ms_total"], 1)
+        stats["wait_ms_max"] = round(stats["wait_ms_max"], 1)
+        return stats
+
+
+class OllamaScheduler:
+    """base_url → AffinityGate. 같은 서버를 쓰는 Ollama 어댑터들은 게이트를 공유"""
+
+    def __init__(self, config: Optional[dict] = None, **gate_kwargs):
+        config = dict(config or {})
+        self.parallel = config.get("parallel", 1)
+        self.max_batch = config.get("max_batch", 32)
+        self.keep_alive = config.get("keep_alive")
+        self._gate_kwargs = gate_kwargs
+        self._gates: dict[str, AffinityGate] = {}
+        self._lock = threading.Lock()
+
+    def gate_for(self, base_url: str) -> AffinityGate:
+        with self._lock:
+            if base_url not in self._gates:
+                self._gates[base_url] = AffinityGate(
+                    base_url, parallel=self.parallel, max_batch=self.max_batch, **self._gate_kwargs,
+                )
+            return self._gates[base_url]
+
+    def wrap(self, adapter: BaseLLMAdapter, adapter_type: str) -> BaseLLMAdapter:
+        """Ollama 어댑터면 ScheduledAdapter로 감싸고, 아니면 그대로 반환"""
+        if adapter_type.lower() != "ollama":
+            return adapter
+        base = adapter.unwrap() if isinstance(adapter, AdapterWrapper) else adapter
+        if self.keep_alive is not None and getattr(base, "keep_alive", None) is None:
+            base.keep_alive = self.keep_alive
+        return ScheduledAdapter(adapter, self.gate_for(getattr(base, "base_url", "")))
+
+    def take_stats(self) -> dict:
+        with self._lock:
+            gates = list(self._gates.values())
+        return {gate.key: gate.take_stats() for gate in gates}
+
+
+class ScheduledAdapter(AdapterWrapper):
+    """모든 호출을 모델 친화 게이트를 거쳐 내보내는 레이어"""
+
+    def __init__(self, inner: BaseLLMAdapter, gate: AffinityGate):
+        super().__init__(inner)
+        self.gate = gate
+
+    def generate(self, prompt: str, max_tokens: int = 1000,
+                 system_prompt: str | None = None) -> LLMResponse:
+        self.gate.acquire(self.model)
+        try:
+            return super().generate(prompt, max_tokens, system_prompt)
+        finally:
+            self.gate.release()
+
+    async def agenerate(self, prompt: str, max_tokens: int = 1000,
+                        system_prompt: str | None = None) -> LLMResponse:
+        await self.gate.aacquire(self.model)
+        try:
+            return await super().agenerate(prompt, max_tokens, system_prompt)
+        finally:
+            self.gate.release()
@@ -0,0 +1,62 @@
+"""스레드 Condition과 짝을 이루는 코루틴 대기열
+
+RateLimiter / AffinityGate는 스레드와 코루틴이 같은 슬롯을 나눠 쓴다. 스레드는
+Condition.wait()로 잠들고, 코루틴은 여기서 만든 Future를 await한다. release()는
+스레드 쪽 notify와 함께 wake()/wake_all()을 불러 대기 코루틴을 그 코루틴의 이벤트
+루프에서 깨운다 (call_soon_threadsafe — release가 어느 스레드에서 불려도 됨).
+폴링이 없으므로 슬롯 인계 지연이 없고 대기자가 많아도 CPU를 쓰지 않는다.
+"""
+
+import asyncio
+import threading
+from collections import deque
+
+
+class AsyncWaiters:
+
+    def __init__(self, lock: threading.Condition):
+        self._lock = lock
+        self._waiters: deque = deque()
+
+    def add(self) -> asyncio.Future:
+        """lock 보유 상태에서 호출 — 다음 wake까지 기다릴 Future"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._waiters.append((loop, future))
+        return future
+
+    def wake(self) -> bool:
+        """lock 보유 상태에서 호출 — 아직 기다리는 코루틴 하나를 깨움"""
+        while self._waiters:
+            loop, future = self._waiters.popleft()
+            if future.done():
+                continue  # 취소된 대기자
+            try:
+                loop.call_soon_threadsafe(self._resolve, future)
+            except RuntimeError:
+                continue  # 닫힌 루프
+            return True
+        return False
+
+    def wake_all(self):
+        """lock 보유 상태에서 호출"""
+        while self.wake():
+            pass
+
+    def _resolve(self, future: asyncio.Future):
+        if future.done():
+            # 깨우기 예약과 취소가 엇갈림 — 신호를 다음 대기자에게 넘김
+            with self._lock:
+                self.wake()
+            return
+        future.set_result(None)
+
+    async def wait(self, future: asyncio.Future):
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 깨운 뒤 재개 전에 취소됨 — 받은 신호를 다음 대기자에게
+                with self._lock:
+                    self.wake()
+            raise
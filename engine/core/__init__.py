@@ -1,3 +1,7 @@
 """Engine Core — 로깅, 설정 관리"""
 
-from .logger import SimulationLogger, calculate_gini
+from .logger import SimulationLogger, calculate_gini, percentiles
+from .blobstore import BlobStore, read_log, load_run_meta
+from .columnar import ColumnarLog
+from .inequality import GiniTracker, gini_batch
+from .rng import RngTree
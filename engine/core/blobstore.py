@@ -0,0 +1,180 @@
+"""Run 단위 content-addressed 블롭 저장소 — 프롬프트/원문 응답 중복 제거
+
+로그 행에는 본문 대신 해시 참조(<필드>_ref)만 남기고, 본문은 run 디렉토리의
+블롭 팩 파일에 한 번만 저장한다. 팩은 한 줄에 {"h": 해시, "t": 본문} 하나씩이며
+압축 스트림(gzip / zstd)으로 쓰면 연속 턴 프롬프트의 공통 부분까지 압축된다.
+
+    blobs.jsonl       — 무압축
+    blobs.jsonl.gz    — gzip (표준 라이브러리)
+    blobs.jsonl.zst   — zstd (pip install zstandard)
+
+읽기 API (read_log, load_run_meta)는 참조를 원래 필드로 되돌려 주므로
+분석 스크립트는 본문이 인라인된 예전 로그와 같은 형태의 행을 받는다.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import threading
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+BLOB_COMPRESSIONS = ("none", "gzip", "zstd")
+
+_PACK_NAMES = {
+    "none": "blobs.jsonl",
+    "gzip": "blobs.jsonl.gz",
+    "zstd": "blobs.jsonl.zst",
+}
+
+# 참조 필드 → 원래 필드
+REF_SUFFIX = "_ref"
+
+
+def blob_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def _import_zstd():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("zstd 블롭 압축에는 zstandard 패키지 필요: pip install zstandard")
+    return zstandard
+
+
+def _open_pack_writer(path: Path, compression: str):
+    if compression == "gzip":
+        return gzip.open(path, "at", encoding="utf-8")
+    if compression == "zstd":
+        zstandard = _import_zstd()
+        raw = open(path, "ab")
+        return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(raw), encoding="utf-8")
+    return open(path, "a", encoding="utf-8")
+
+
+def _iter_pack_lines(path: Path) -> Iterator[str]:
+    """팩 파일의 줄 — 비정상 종료로 잘린 압축 스트림은 마지막 온전한 줄까지"""
+    if path.suffix == ".gz":
+        f = gzip.open(path, "rt", encoding="utf-8")
+    elif path.suffix == ".zst":
+        zstandard = _import_zstd()
+        f = io.TextIOWrapper(
+            zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), read_across_frames=True),
+            encoding="utf-8",
+        )
+    else:
+        f = open(path, encoding="utf-8")
+    with f:
+        try:
+            for line in f:
+                if line.endswith("\n"):
+                    yield line
+        except EOFError:
+            return
+
+
+class BlobStore:
+    """run 디렉토리의 블롭 팩에 본문을 한 번씩만 기록"""
+
+    def __init__(self, run_dir: Union[str, Path], compression: str = "gzip"):
+        if compression not in BLOB_COMPRESSIONS:
+            raise ValueError(
+                f"Unknown blob compression: {compression}. Available: {list(BLOB_COMPRESSIONS)}"
+            )
+        self.compression = compression
+        self.path = Path(run_dir) / _PACK_NAMES[compression]
+        self._lock = threading.Lock()
+        self._seen: set[str] = set()
+        self._fh = None
+
+    def put(self, text: str) -> str:
+        """본문 저장 후 참조 해시 반환 (이미 있으면 쓰지 않음)"""
+        ref = blob_hash(text)
+        with self._lock:
+            if ref in self._seen:
+                return ref
+            if self._fh is None:
+                self._fh = _open_pack_writer(self.path, self.compression)
+            self._fh.write(json.dumps({"h": ref, "t": text}, ensure_ascii=False) + "\n")
+            self._seen.add(ref)
+        return ref
+
+    def close(self):
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    def sync(self) -> int:
+        """체크포인트용 — 열린 압축 프레임/멤버를 닫고 팩 크기(바이트) 반환
+
+        다음 put은 새 프레임으로 이어 쓰므로, 이 오프셋에서 잘라도 팩은 온전하다.
+        """
+        self.close()
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def restore(self, offset: int):
+        """재개용 — 팩을 체크포인트 오프셋으로 자르고 기존 해시를 다시 읽음"""
+        self.close()
+        with self._lock:
+            if self.path.exists():
+                with open(self.path, "r+b") as f:
+                    f.truncate(offset)
+            self._seen = set(load_blobs(self.path.parent)) if offset else set()
+
+    @property
+    def unique_count(self) -> int:
+        return len(self._seen)
+
+
+def find_pack(run_dir: Union[str, Path]) -> Optional[Path]:
+    for name in _PACK_NAMES.values():
+        path = Path(run_dir) / name
+        if path.exists():
+            return path
+    return None
+
+
+def load_blobs(run_dir: Union[str, Path]) -> dict[str, str]:
+    """해시 → 본문 (팩이 없으면 빈 dict)"""
+    path = find_pack(run_dir)
+    if path is None:
+        return {}
+    blobs = {}
+    for line in _iter_pack_lines(path):
+        record = json.loads(line)
+        blobs[record["h"]] = record["t"]
+    return blobs
+
+
+def rehydrate(entry: dict, blobs: dict[str, str]) -> dict:
+    """<필드>_ref 참조를 원래 필드 본문으로 치환 (dict 값의 참조 묶음도 지원)"""
+    for key in [k for k in entry if k.endswith(REF_SUFFIX)]:
+        ref = entry.pop(key)
+        field = key[: -len(REF_SUFFIX)]
+        if isinstance(ref, dict):
+            entry[field] = {k: blobs.get(v) for k, v in ref.items()}
+        else:
+            entry[field] = blobs.get(ref) if ref is not None else None
+    return entry
+
+
+def read_log(path: Union[str, Path], blobs: Optional[dict[str, str]] = None) -> Iterator[dict]:
+    """simulation_log.jsonl 행을 참조 복원해서 반환 — 인라인 로그도 그대로 읽힘"""
+    path = Path(path)
+    if blobs is None:
+        blobs = load_blobs(path.parent)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            yield rehydrate(json.loads(line), blobs)
+
+
+def load_run_meta(run_dir: Union[str, Path]) -> dict:
+    run_dir = Path(run_dir)
+    with open(run_dir / "run_meta.json", encoding="utf-8") as f:
+        meta = json.load(f)
+    if any(k.endswith(REF_SUFFIX) for k in meta):
+        rehydrate(meta, load_blobs(run_dir))
+    return meta
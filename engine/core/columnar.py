@@ -0,0 +1,288 @@
+"""시뮬레이션 로그 컬럼형 바이너리 export — NumPy 기반 벡터화 집계
+
+JSONL 로그를 한 번만 파싱해서 컬럼별 배열로 저장:
+
+    <name>.npz       — 범주형 컬럼은 사전 인코딩(int32 코드 + vocab), 수치/플래그 컬럼은 배열
+    <name>.text.bin  — 텍스트 컬럼(thought, content, 프롬프트 등)의 UTF-8 본문을 이어 붙인 blob,
+                       행별 시작/끝은 npz의 offsets 배열로 색인
+
+행동 분포, 성공률, 파싱률 같은 집계는 np.bincount / 마스크 연산으로 계산된다.
+v0.3 스키마(action_success, action_target, action_content)와 파일럿 스키마
+(success, target, content)는 같은 컬럼 이름으로 정규화된다.
+"""
+
+import json
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+import numpy as np
+
+from .blobstore import read_log
+
+CATEGORICAL_COLUMNS = (
+    "agent_id", "persona", "location", "action_type", "target",
+    "model", "adapter", "language", "run", "run_id", "condition",
+)
+NUMERIC_COLUMNS = ("epoch", "turn")
+# 1 / 0 / -1(누락)
+FLAG_COLUMNS = ("success", "parse_success", "retried")
+TEXT_COLUMNS = ("thought", "content", "turn_prompt_sent", "response_raw")
+
+# 스키마 간 필드 이름 차이 (정규화 컬럼 → 원본 후보)
+_ALIASES = {
+    "success": ("success", "action_success"),
+    "target": ("target", "action_target"),
+    "content": ("content", "action_content"),
+}
+
+_MISSING = -1
+
+
+def _field(row: dict, column: str):
+    for key in _ALIASES.get(column, (column,)):
+        if key in row:
+            return row[key]
+    return None
+
+
+def _paths(path: Union[str, Path]) -> tuple[Path, Path]:
+    path = Path(path)
+    stem = path.with_suffix("") if path.suffix == ".npz" else path
+    return stem.with_suffix(".npz"), stem.with_suffix(".text.bin")
+
+
+class ColumnarLog:
+    """컬럼형 로그 — 범주형 코드/vocab, 수치, 플래그, 텍스트 오프셋"""
+
+    def __init__(
+        self,
+        n_rows: int,
+        categorical: dict[str, tuple[np.ndarray, np.ndarray]],
+        numeric: dict[str, np.ndarray],
+        flags: dict[str, np.ndarray],
+        text_offsets: dict[str, np.ndarray],
+        text_blob,
+    ):
+        self.n_rows = n_rows
+        self.categorical = categorical
+        self.numeric = numeric
+        self.flags = flags
+        self.text_offsets = text_offsets
+        self._text_blob = text_blob
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    # ---- 생성 / 저장 ----
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[dict]) -> "ColumnarLog":
+        vocabs: dict[str, dict[str, int]] = {c: {} for c in CATEGORICAL_COLUMNS}
+        codes: dict[str, list[int]] = {c: [] for c in CATEGORICAL_COLUMNS}
+        numeric: dict[str, list[int]] = {c: [] for c in NUMERIC_COLUMNS}
+        flags: dict[str, list[int]] = {c: [] for c in FLAG_COLUMNS}
+        offsets: dict[str, list[int]] = {c: [0] for c in TEXT_COLUMNS}
+        text_parts: list[bytes] = []
+        position = 0
+        n_rows = 0
+
+        # 텍스트는 컬럼별로 한 blob 구간을 쓰도록 컬럼마다 모았다가 이어 붙임
+        text_by_column: dict[str, list[bytes]] = {c: [] for c in TEXT_COLUMNS}
+
+        for row in rows:
+            n_rows += 1
+            for column in CATEGORICAL_COLUMNS:
+                value = _field(row, column)
+                if value is None:
+                    codes[column].append(_MISSING)
+                else:
+                    vocab = vocabs[column]
+                    codes[column].append(vocab.setdefault(str(value), len(vocab)))
+            for column in NUMERIC_COLUMNS:
+                value = _field(row, column)
+                numeric[column].append(_MISSING if value is None else int(value))
+            for column in FLAG_COLUMNS:
+                value = _field(row, column)
+                flags[column].append(_MISSING if value is None else int(bool(value)))
+            for column in TEXT_COLUMNS:
+                value = _field(row, column)
+                text_by_column[column].append(b"" if value is None else str(value).encode("utf-8"))
+
+        text_offsets = {}
+        for column in TEXT_COLUMNS:
+            lengths = np.fromiter((len(b) for b in text_by_column[column]), dtype=np.int64, count=n_rows)
+            column_offsets = np.empty(n_rows + 1, dtype=np.int64)
+            column_offsets[0] = position
+            np.cumsum(lengths, out=column_offsets[1:])
+            column_offsets[1:] += position
+            text_offsets[column] = column_offsets
+            text_parts.extend(text_by_column[column])
+            position = int(column_offsets[-1])
+
+        categorical = {}
+        for column in CATEGORICAL_COLUMNS:
+            vocab = np.array(list(vocabs[column]), dtype=str)
+            categorical[column] = (np.array(codes[column], dtype=np.int32), vocab)
+
+        return cls(
+            n_rows,
+            categorical,
+            {c: np.array(v, dtype=np.int64) for c, v in numeric.items()},
+            {c: np.array(v, dtype=np.int8) for c, v in flags.items()},
+            text_offsets,
+            b"".join(text_parts),
+        )
+
+    @classmethod
+    def from_jsonl(cls, paths: Union[str, Path, Iterable[Union[str, Path]]],
+                   extra: Optional[dict] = None) -> "ColumnarLog":
+        """JSONL 로그(블롭 참조 포함) → 컬럼형. extra는 모든 행에 덧붙일 필드"""
+        if isinstance(paths, (str, Path)):
+            paths = [paths]
+
+        def rows():
+            for path in paths:
+                for row in read_log(path):
+                    if extra:
+                        row.update(extra)
+                    yield row
+
+        return cls.from_rows(rows())
+
+    def save(self, path: Union[str, Path]) -> Path:
+        npz_path, text_path = _paths(path)
+        arrays = {
+            "__meta__": np.array(json.dumps({"n_rows": self.n_rows})),
+        }
+        for column, (codes, vocab) in self.categorical.items():
+            arrays[f"cat__{column}"] = codes
+            arrays[f"vocab__{column}"] = vocab
+        for column, values in self.numeric.items():
+            arrays[f"num__{column}"] = values
+        for column, values in self.flags.items():
+            arrays[f"flag__{column}"] = values
+        for column, offsets in self.text_offsets.items():
+            arrays[f"text__{column}"] = offsets
+        np.savez(npz_path, **arrays)
+        text_path.write_bytes(bytes(self._text_blob))
+        return npz_path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "ColumnarLog":
+        npz_path, text_path = _paths(path)
+        categorical, numeric, flags, text_offsets = {}, {}, {}, {}
+        with np.load(npz_path) as data:
+            meta = json.loads(str(data["__meta__"]))
+            for key in data.files:
+                kind, _, column = key.partition("__")
+                if kind == "cat":
+                    categorical[column] = (data[key], data[f"vocab__{column}"])
+                elif kind == "num":
+                    numeric[column] = data[key]
+                elif kind == "flag":
+                    flags[column] = data[key]
+                elif kind == "text":
+                    text_offsets[column] = data[key]
+        # 텍스트 blob은 필요한 구간만 읽도록 memmap
+        if text_path.stat().st_size:
+            text_blob = np.memmap(text_path, dtype=np.uint8, mode="r")
+        else:
+            text_blob = b""
+        return cls(meta["n_rows"], categorical, numeric, flags, text_offsets, text_blob)
+
+    # ---- 조회 ----
+
+    def codes(self, column: str) -> np.ndarray:
+        return self.categorical[column][0]
+
+    def vocab(self, column: str) -> np.ndarray:
+        return self.categorical[column][1]
+
+    def column(self, column: str) -> np.ndarray:
+        """범주형 컬럼 디코딩 (누락은 None)"""
+        codes, vocab = self.categorical[column]
+        decoded = np.empty(self.n_rows, dtype=object)
+        present = codes >= 0
+        decoded[present] = vocab[codes[present]]
+        return decoded
+
+    def text(self, column: str, row: int) -> str:
+        offsets = self.text_offsets[column]
+        return bytes(self._text_blob[offsets[row]:offsets[row + 1]]).decode("utf-8")
+
+    def mask(self, **equals) -> np.ndarray:
+        """범주형 컬럼 값 일치 마스크 — mask(model="flash", language="ko")"""
+        result = np.ones(self.n_rows, dtype=bool)
+        for column, value in equals.items():
+            codes, vocab = self.categorical[column]
+            hits = np.flatnonzero(vocab == str(value))
+            if hits.size == 0:
+                return np.zeros(self.n_rows, dtype=bool)
+            result &= codes == hits[0]
+        return result
+
+    def in_mask(self, column: str, values: Iterable[str]) -> np.ndarray:
+        codes, vocab = self.categorical[column]
+        allowed = np.isin(vocab, list(values))
+        lookup = np.append(allowed, False)  # 코드 -1(누락) → False
+        return lookup[codes]
+
+    # ---- 집계 ----
+
+    def value_counts(self, column: str, where: Optional[np.ndarray] = None) -> dict[str, int]:
+        codes, vocab = self.categorical[column]
+        if where is not None:
+            codes = codes[where]
+        counts = np.bincount(codes[codes >= 0], minlength=len(vocab))
+        return {str(vocab[i]): int(counts[i]) for i in np.flatnonzero(counts)}
+
+    def flag_count(self, column: str, where: Optional[np.ndarray] = None) -> int:
+        values = self.flags[column]
+        if where is not None:
+            values = values[where]
+        return int(np.count_nonzero(values == 1))
+
+    def rate(self, column: str, where: Optional[np.ndarray] = None) -> float:
+        """플래그 컬럼이 참인 비율 (분모는 조건에 맞는 전체 행)"""
+        total = self.n_rows if where is None else int(np.count_nonzero(where))
+        return self.flag_count(column, where) / total if total else 0.0
+
+    def crosstab(self, row_column: str, col_column: str,
+                 where: Optional[np.ndarray] = None) -> dict[str, dict[str, int]]:
+        """두 범주형 컬럼의 교차 빈도 — 예: crosstab("model", "action_type")"""
+        row_codes, row_vocab = self.categorical[row_column]
+        col_codes, col_vocab = self.categorical[col_column]
+        valid = (row_codes >= 0) & (col_codes >= 0)
+        if where is not None:
+            valid &= where
+        flat = row_codes[valid].astype(np.int64) * len(col_vocab) + col_codes[valid]
+        table = np.bincount(flat, minlength=len(row_vocab) * len(col_vocab))
+        table = table.reshape(len(row_vocab), len(col_vocab))
+        return {
+            str(row_vocab[r]): {str(col_vocab[c]): int(table[r, c]) for c in np.flatnonzero(table[r])}
+            for r in range(len(row_vocab)) if table[r].any()
+        }
+
+    def summary(self, valid_actions: Optional[Iterable[str]] = None,
+                where: Optional[np.ndarray] = None) -> dict:
+        """merge 스크립트의 analyze_run과 같은 형태의 요약"""
+        total = self.n_rows if where is None else int(np.count_nonzero(where))
+        success = self.flag_count("success", where)
+        parse_ok = self.flag_count("parse_success", where)
+        stats = {
+            "total": total,
+            "success": success,
+            "success_rate": success / total if total else 0,
+            "parse_ok": parse_ok,
+            "parse_rate": parse_ok / total if total else 0,
+            "action_dist": self.value_counts("action_type", where),
+            "persona_dist": self.value_counts("persona", where),
+        }
+        if valid_actions is not None:
+            malformed_mask = ~self.in_mask("action_type", valid_actions)
+            if where is not None:
+                malformed_mask &= where
+            malformed = int(np.count_nonzero(malformed_mask))
+            stats["malformed"] = malformed
+            stats["malformed_rate"] = malformed / total if total else 0
+        return stats
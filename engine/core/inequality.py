@@ -0,0 +1,144 @@
+"""불평등 지표 — 증분 지니 트래커 + NumPy 배치 지니
+
+지니 = Σ_{i<j} |x_i - x_j| / (n · Σx)  (calculate_gini와 같은 정의)
+
+GiniTracker는 값 영역 Fenwick 트리(값별 개수/합)로 정렬 상태를 유지하면서
+쌍별 차이 합을 값 하나가 바뀔 때마다 O(log V)로 갱신한다. 트리 영역은 음이 아닌
+정수(에너지)이고, 그 밖의 값(음수, 실수)은 별도 목록에 두고 직접 더한다 — 드물게
+나타나는 값이라 갱신은 O(log V + 영역 밖 값 수)로 유지되고 지니는 그대로 정확하다.
+"""
+
+import math
+from typing import Iterable
+
+import numpy as np
+
+
+class _Fenwick:
+    """값 영역 [0, size)의 개수/합 누적 트리 — 범위를 넘는 값이 오면 두 배로 확장"""
+
+    def __init__(self, size: int = 256):
+        self.size = size
+        self.counts = [0] * (size + 1)
+        self.sums = [0] * (size + 1)
+
+    def _grow(self, value: int):
+        size = self.size
+        while value >= size:
+            size *= 2
+        items = [(v, self._point(v)) for v in range(self.size)]
+        self.size = size
+        self.counts = [0] * (size + 1)
+        self.sums = [0] * (size + 1)
+        for v, c in items:
+            if c:
+                self.add(v, c)
+
+    def _point(self, value: int) -> int:
+        c_hi, _ = self.prefix(value + 1)
+        c_lo, _ = self.prefix(value)
+        return c_hi - c_lo
+
+    def add(self, value: int, count: int):
+        if value >= self.size:
+            self._grow(value)
+        i = value + 1
+        while i <= self.size:
+            self.counts[i] += count
+            self.sums[i] += count * value
+            i += i & -i
+
+    def prefix(self, value: int) -> tuple[int, int]:
+        """value 미만 값들의 (개수, 합)"""
+        i = min(value, self.size)
+        count = total = 0
+        while i > 0:
+            count += self.counts[i]
+            total += self.sums[i]
+            i -= i & -i
+        return count, total
+
+
+class GiniTracker:
+    """값 추가/제거/변경 시 지니 계수를 증분 갱신"""
+
+    def __init__(self, values: Iterable[float] = ()):
+        self._tree = _Fenwick()
+        self._tree_n = 0
+        self._tree_total = 0
+        self._others: list[float] = []  # Fenwick 영역 밖 값 (음수, 실수)
+        self.n = 0
+        self.total = 0
+        self._pairwise = 0  # Σ_{i<j} |x_i - x_j|
+        for value in values:
+            self.add(value)
+
+    @staticmethod
+    def _in_domain(value) -> bool:
+        return value >= 0 and value == int(value)
+
+    def _distance_sum(self, value: float) -> float:
+        """현재 멤버 전체와 value의 |차이| 합"""
+        # 트리에는 정수만 있으므로 value 미만 = ceil(value) 미만 (음수면 0개)
+        count_below, sum_below = self._tree.prefix(math.ceil(value))
+        tree_part = (value * count_below - sum_below) + (
+            (self._tree_total - sum_below) - value * (self._tree_n - count_below)
+        )
+        return tree_part + sum(abs(value - other) for other in self._others)
+
+    def add(self, value: float):
+        self._pairwise += self._distance_sum(value)
+        if self._in_domain(value):
+            self._tree.add(int(value), 1)
+            self._tree_n += 1
+            self._tree_total += int(value)
+        else:
+            self._others.append(value)
+        self.n += 1
+        self.total += value
+
+    def remove(self, value: float):
+        if self._in_domain(value):
+            self._tree.add(int(value), -1)
+            self._tree_n -= 1
+            self._tree_total -= int(value)
+        else:
+            self._others.remove(value)
+        self.n -= 1
+        self.total -= value
+        self._pairwise -= self._distance_sum(value)
+        if not self._others:
+            # 영역 밖 값이 모두 빠지면 실수 오차를 버리고 정수 합으로 복귀
+            self.total = self._tree_total
+            self._pairwise = round(self._pairwise)
+
+    def update(self, old: float, new: float):
+        if old == new:
+            return
+        self.remove(old)
+        self.add(new)
+
+    @property
+    def gini(self) -> float:
+        if self.n == 0 or self.total == 0:
+            return 0.0
+        return self._pairwise / (self.n * self.total)
+
+
+def gini_batch(values) -> np.ndarray:
+    """벡터화 지니 — 1차원이면 스칼라, 2차원이면 행(예: 에폭)별 지니 배열"""
+    arr = np.asarray(values, dtype=np.float64)
+    squeeze = arr.ndim == 1
+    if squeeze:
+        arr = arr[np.newaxis, :]
+    n = arr.shape[1]
+    if n == 0:
+        result = np.zeros(arr.shape[0])
+    else:
+        sorted_vals = np.sort(arr, axis=1)
+        weights = 2 * np.arange(1, n + 1) - n - 1
+        totals = sorted_vals.sum(axis=1)
+        numerators = sorted_vals @ weights
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result = np.where(totals == 0, 0.0, numerators / (n * totals))
+    return result[0] if squeeze else result
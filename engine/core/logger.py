@@ -1,11 +1,28 @@
-"""시뮬레이션 로거 — JSONL 기반"""
+"""시뮬레이션 로거 — JSONL 기반
 
+쓰기 모드:
+    direct   — 매 엔트리마다 파일을 열고 한 줄 쓰고 닫음 (기본값)
+    buffered — 엔트리를 호출 시점에 직렬화해 큐에 넣고 전용 writer 스레드가 쓰기,
+               flush_every개가 쌓이거나 flush되지 않은 첫 엔트리 후 flush_interval초가
+               지나면 flush (쓰기가 계속 이어져도). close()/종료 시 반드시 flush
+"""
+
+import atexit
 import json
+import math
 import os
+import queue
+import threading
+import time
+import weakref
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
+from .blobstore import BlobStore
+
+LOG_MODES = ("direct", "buffered")
+
 
 def calculate_gini(values: list[float]) -> float:
     """지니 계수 계산 (0=완전 평등, 1=완전 불평등)"""
@@ -20,12 +37,132 @@ def calculate_gini(values: list[float]) -> float:
     return gini_sum / (n * total)
 
 
+def percentiles(values: list[float], qs: tuple[int, ...] = (50, 90, 99)) -> Optional[dict]:
+    """nearest-rank 백분위 {"p50": ..., "max": ...} — 값이 없으면 None"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    n = len(ordered)
+    result = {f"p{q}": ordered[max(0, math.ceil(q / 100 * n) - 1)] for q in qs}
+    result["max"] = ordered[-1]
+    return result
+
+
+class BufferedJsonlWriter:
+    """백그라운드 스레드 JSONL writer — 파일 핸들 유지, 크기/시간 기준 flush (직렬화는 호출 스레드)"""
+
+    _STOP = object()
+
+    def __init__(self, flush_every: int = 256, flush_interval: float = 1.0):
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue()
+        self._files: dict[Path, Any] = {}
+        self._pending = 0
+        self._deadline = 0.0  # 첫 미flush 엔트리 + flush_interval (monotonic)
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="jsonl-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, path: Path, entry: dict):
+        """호출 시점에 직렬화 — 반환 뒤 호출자가 entry(또는 그 안의 dict/list)를 바꿔도 기록은 그대로"""
+        if self._closed:
+            raise RuntimeError("writer is closed")
+        self._raise_pending_error()
+        self._queue.put((path, json.dumps(entry, ensure_ascii=False) + "\n"))
+
+    def flush(self):
+        """큐에 쌓인 엔트리를 모두 디스크에 쓸 때까지 대기"""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+        self._raise_pending_error()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        self._thread.join()
+        self._raise_pending_error()
+
+    def _raise_pending_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _run(self):
+        while True:
+            timeout = max(0.0, self._deadline - time.monotonic()) if self._pending else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._flush_files()
+                continue
+            if item is self._STOP:
+                self._flush_files()
+                for f in self._files.values():
+                    f.close()
+                self._files.clear()
+                return
+            if isinstance(item, threading.Event):
+                self._flush_files()
+                item.set()
+                continue
+            path, line = item
+            try:
+                f = self._files.get(path)
+                if f is None:
+                    f = self._files[path] = open(path, "a", encoding="utf-8")
+                f.write(line)
+            except Exception as e:  # 다음 write/flush/close 호출에서 재발생
+                self._error = e
+                continue
+            if not self._pending:
+                self._deadline = time.monotonic() + self.flush_interval
+            self._pending += 1
+            # 큐가 쉬지 않아도 시간 기준 flush — get()이 매번 바로 반환되는 경우
+            if self._pending >= self.flush_every or time.monotonic() >= self._deadline:
+                self._flush_files()
+
+    def _flush_files(self):
+        if not self._pending:
+            return
+        for f in self._files.values():
+            f.flush()
+        self._pending = 0
+
+
+def _close_at_exit(ref: "weakref.ref[SimulationLogger]"):
+    logger = ref()
+    if logger is not None:
+        logger.close()
+
+
 class SimulationLogger:
 
-    def __init__(self, base_dir: str = "logs", run_name: Optional[str] = None):
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        run_name = run_name or "run"
-        self.run_dir = Path(base_dir) / f"{timestamp}_{run_name}"
+    def __init__(
+        self,
+        base_dir: str = "logs",
+        run_name: Optional[str] = None,
+        mode: str = "direct",
+        flush_every: int = 256,
+        flush_interval: float = 1.0,
+        blob_compression: Optional[str] = None,
+        run_dir: Optional[str] = None,
+    ):
+        """run_dir을 주면 새 디렉토리를 만들지 않고 기존 run에 이어 씀 (체크포인트 재개)"""
+        if mode not in LOG_MODES:
+            raise ValueError(f"Unknown log mode: {mode}. Available: {list(LOG_MODES)}")
+        if run_dir is not None:
+            self.run_dir = Path(run_dir)
+        else:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            run_name = run_name or "run"
+            self.run_dir = Path(base_dir) / f"{timestamp}_{run_name}"
         self.run_dir.mkdir(parents=True, exist_ok=True)
 
         self.action_log_path = self.run_dir / "simulation_log.jsonl"
@@ -34,6 +171,18 @@ class SimulationLogger:
 
         self._turn_counter = 0
 
+        self.mode = mode
+        self._writer: Optional[BufferedJsonlWriter] = None
+        if mode == "buffered":
+            self._writer = BufferedJsonlWriter(flush_every, flush_interval)
+            # close() 없이 프로세스가 끝나도 큐에 남은 엔트리 유실 방지
+            atexit.register(_close_at_exit, weakref.ref(self))
+
+        # 프롬프트/원문 응답 블롭 저장소 (None이면 본문을 로그 행에 인라인)
+        self.blobs: Optional[BlobStore] = None
+        if blob_compression is not None:
+            self.blobs = BlobStore(self.run_dir, blob_compression)
+
     def save_config(self, config: dict):
         with open(self.config_path, "w", encoding="utf-8") as f:
             json.dump(config, f, ensure_ascii=False, indent=2)
@@ -109,13 +258,15 @@ class SimulationLogger:
         billboard: Optional[str] = None,
         notable_events: Optional[list[str]] = None,
         extra: Optional[dict] = None,
+        gini: Optional[float] = None,
     ):
+        """gini를 넘기면(증분 트래커 값 등) energy_values로 다시 계산하지 않음"""
         entry = {
             "epoch": epoch,
             "timestamp": datetime.now().isoformat(),
             "agent_count": agent_count,
             "total_energy": sum(energy_values),
-            "gini_coefficient": calculate_gini(energy_values),
+            "gini_coefficient": calculate_gini(energy_values) if gini is None else gini,
             "transaction_count": transaction_count,
             "treasury": treasury,
             "billboard_active": billboard,
@@ -129,6 +280,55 @@ class SimulationLogger:
     def reset_turn_counter(self):
         self._turn_counter = 0
 
+    def attach_text(self, entry: dict, field: str, text):
+        """긴 본문 필드 기록 — 블롭 저장소가 있으면 <field>_ref 해시 참조로
+
+        text가 dict(예: 에이전트별 system prompt)면 값마다 참조로 바꾼 dict를 기록.
+        """
+        if self.blobs is None or text is None:
+            entry[field] = text
+        elif isinstance(text, dict):
+            entry[f"{field}_ref"] = {k: self.blobs.put(v) for k, v in text.items()}
+        else:
+            entry[f"{field}_ref"] = self.blobs.put(text)
+
+    def flush(self):
+        """buffered 모드에서 큐에 쌓인 엔트리를 디스크에 반영"""
+        if self._writer is not None:
+            self._writer.flush()
+
+    def offsets(self) -> dict[str, int]:
+        """체크포인트용 — 큐를 비우고 로그/블롭 팩 파일 크기(바이트) 반환"""
+        self.flush()
+        offsets = {
+            path.name: path.stat().st_size if path.exists() else 0
+            for path in (self.action_log_path, self.epoch_log_path)
+        }
+        if self.blobs is not None:
+            offsets[self.blobs.path.name] = self.blobs.sync()
+        return offsets
+
+    def truncate(self, offsets: dict[str, int]):
+        """재개용 — 체크포인트 이후 기록된 부분 에폭 로그를 잘라냄"""
+        self.flush()
+        for path in (self.action_log_path, self.epoch_log_path):
+            offset = offsets.get(path.name, 0)
+            if path.exists():
+                with open(path, "r+b") as f:
+                    f.truncate(offset)
+        if self.blobs is not None:
+            self.blobs.restore(offsets.get(self.blobs.path.name, 0))
+
+    def close(self):
+        """writer 스레드 종료 + 최종 flush (여러 번 호출해도 안전)"""
+        if self._writer is not None:
+            self._writer.close()
+        if self.blobs is not None:
+            self.blobs.close()
+
     def _append_jsonl(self, path: Path, entry: dict):
+        if self._writer is not None:
+            self._writer.write(path, entry)
+            return
         with open(path, "a", encoding="utf-8") as f:
             f.write(json.dumps(entry, ensure_ascii=False) + "\n")
@@ -0,0 +1,52 @@
+"""시드 RNG 트리 — run 루트 시드에서 이름 경로별 독립 스트림 파생
+
+전역 random 하나를 모두가 나눠 쓰면 동시 실행 시 뽑는 순서가 섞여 같은 시드라도
+결과가 달라진다. 스트림 시드는 (루트 시드, 경로) 해시로만 정해지므로 생성 순서나
+다른 스트림의 소비량과 무관하다.
+
+    tree = RngTree(42)
+    tree.stream("scheduler")         # 에폭 순서 셔플
+    tree.stream("agent", "jester_01")  # 에이전트 어댑터 전용
+"""
+
+import hashlib
+import random
+
+
+class RngTree:
+
+    def __init__(self, seed: int):
+        self.seed = seed
+        self._streams: dict[tuple[str, ...], random.Random] = {}
+
+    def derive_seed(self, *path: str) -> int:
+        """경로의 64비트 시드 (sha256 기반 — PYTHONHASHSEED와 무관)"""
+        key = "/".join((str(self.seed),) + path)
+        return int.from_bytes(hashlib.sha256(key.encode("utf-8")).digest()[:8], "big")
+
+    def stream(self, *path: str) -> random.Random:
+        """경로의 스트림 — 같은 경로는 같은 객체를 돌려줌"""
+        if not path:
+            raise ValueError("stream path must not be empty")
+        rng = self._streams.get(path)
+        if rng is None:
+            rng = self._streams[path] = random.Random(self.derive_seed(*path))
+        return rng
+
+    def reseed(self, seed: int):
+        """루트 시드 교체 — 이미 나간 스트림 객체도 제자리에서 다시 시드"""
+        self.seed = seed
+        for path, rng in self._streams.items():
+            rng.seed(self.derive_seed(*path))
+
+    def to_state(self) -> dict:
+        """체크포인트용 — {"a/b": [version, internal, gauss_next]}"""
+        state = {}
+        for path, rng in self._streams.items():
+            version, internal, gauss_next = rng.getstate()
+            state["/".join(path)] = [version, list(internal), gauss_next]
+        return state
+
+    def load_state(self, state: dict):
+        for key, (version, internal, gauss_next) in state.items():
+            self.stream(*key.split("/")).setstate((version, tuple(internal), gauss_next))
@@ -1,7 +1,7 @@
 """White Room 에이전트"""
 
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Callable, Optional
 
 
 @dataclass
@@ -19,6 +19,24 @@ class Agent:
     adapter_type: Optional[str] = None
     model: Optional[str] = None
 
+    # 에너지 변경 리스너 (agent, old, new) — 지니 트래커 등
+    _energy_listeners: list[Callable] = field(default_factory=list, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        listeners = self.__dict__.get("_energy_listeners")
+        if name == "energy" and listeners:
+            old = self.__dict__.get("energy")
+            object.__setattr__(self, name, value)
+            if old != value:
+                for listener in listeners:
+                    listener(self, old, value)
+            return
+        object.__setattr__(self, name, value)
+
+    def add_energy_listener(self, listener: Callable):
+        """에너지 변경 시 listener(agent, old, new) 호출 (직접 대입 포함)"""
+        self._energy_listeners.append(listener)
+
     def spend_energy(self, cost: int, frozen: bool = False) -> bool:
         """에너지 소비. frozen이면 차감하지 않고 True 반환."""
         if frozen:
@@ -0,0 +1,188 @@
+"""에폭 체크포인트 — 중단된 run을 마지막 완료 에폭 다음부터 이어서 실행
+
+매 에폭 종료 시 run 디렉토리에 checkpoint.json을 원자적으로 덮어쓴다
+(tmp 파일 작성 후 os.replace). 재개에 필요한 현재 상태만 담는다:
+  - 에이전트 상태 (에너지, 영향력, 위치, 생존)
+  - 환경 점유 / 게시판 / 세율, 국고 잔액
+  - 최근 사건 버퍼 (프롬프트에 보이는 action_log 꼬리 — 깊이 제한이 있어 크기 고정)
+  - RNG 트리 스트림 상태 + 재시도 지터 RNG 상태
+  - 로그 파일 오프셋 (simulation_log / epoch_summary / 블롭 팩 바이트 크기)
+
+run 길이에 비례해 쌓이는 기록(지지 관계, 역사 이벤트, 의심)은 담지 않고, 재개 시
+오프셋으로 잘라낸 simulation_log.jsonl을 재생해 다시 만든다. 시장의 에폭별 거래
+기록은 진행 중인 에폭만 읽히므로 에폭 경계에서는 저장할 것이 없다. 덕분에
+checkpoint.json 크기는 에폭 수와 무관하다.
+
+재개 시 로그를 기록된 오프셋으로 잘라 부분 에폭의 흔적을 지우고 같은 파일에
+이어 쓰므로, mock 어댑터 기준으로 중단 없이 돌린 run과 같은 로그가 나온다.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+from engine.core.blobstore import read_log
+
+from .context import RENDERED_KEY
+from .systems.architect import subsidy_amount
+
+CHECKPOINT_NAME = "checkpoint.json"
+CHECKPOINT_VERSION = 3
+
+_AGENT_FIELDS = ("energy", "influence", "location", "home", "alive")
+
+
+def _rng_state(state) -> list:
+    """random.getstate() → JSON 직렬화 가능한 리스트"""
+    version, internal, gauss_next = state
+    return [version, list(internal), gauss_next]
+
+
+def _rng_from_json(state: list) -> tuple:
+    version, internal, gauss_next = state
+    return (version, tuple(internal), gauss_next)
+
+
+def capture(sim, epoch: int) -> dict:
+    """epoch까지 완료된 시뮬레이션 상태 (로그 오프셋 포함)"""
+    return {
+        "version": CHECKPOINT_VERSION,
+        "epoch": epoch,
+        "total_epochs": sim.total_epochs,
+        "language": sim.language,
+        "seed": sim.seed,
+        "agents": {
+            agent.id: {name: getattr(agent, name) for name in _AGENT_FIELDS}
+            for agent in sim.agents
+        },
+        "environment": sim.environment.to_state(),
+        "treasury": sim.treasury.to_state(),
+        "events": sim.event_log.to_state(strip=(RENDERED_KEY,)),
+        "rng": {
+            "streams": sim.rng.to_state(),
+            "retry": _rng_state(sim.retry_policy._rng.getstate()),
+        },
+        "log_offsets": sim.logger.offsets(),
+    }
+
+
+def _replay_log(sim, path: Path):
+    """잘라낸 행동 로그를 순서대로 재생해 지지 관계 / 역사 이벤트 / 의심 기록 재구성
+
+    각 행동 핸들러가 성공 시 남기는 기록을 같은 순서, 같은 인자로 다시 만든다.
+    누적 기록을 만드는 행동은 레거시 스키마(Phase 1)에만 있다 — v0.3 행은 건너뜀.
+    세율 변경 이력은 환경 세율을 초기값부터 다시 적용하며 따라간다 (환경 상태는
+    재생 뒤 체크포인트 값으로 덮어씀).
+    """
+    if not path.exists():
+        return
+    for row in read_log(path):
+        if not row.get("success"):
+            continue
+        epoch, agent_id, target = row["epoch"], row["agent_id"], row.get("target")
+        action = row["action_type"]
+        if action == "support":
+            sim.support_tracker.add_support(epoch, agent_id, target)
+            if sim.support_tracker.has_supported(target, agent_id):
+                sim.history.add_mutual_support(epoch, agent_id, target)
+        elif action == "whisper" and row.get("leaked"):
+            for bystander_id in row.get("suspicion_targets", ()):
+                if bystander_id in sim.agents_by_id:
+                    sim.agents_by_id[bystander_id].add_suspicion(epoch, agent_id, target)
+            sim.history.add_whisper_leak(epoch, agent_id, target)
+        elif action == "build_billboard":
+            sim.history.add_billboard(epoch, agent_id, row.get("content") or "공지")
+        elif action == "adjust_tax":
+            old_rate = sim.environment.tax_rate
+            sim.environment.set_tax_rate(row["new_rate"])
+            sim.history.add_tax_change(epoch, agent_id, old_rate, row["new_rate"])
+        elif action == "grant_subsidy":
+            sim.history.add_subsidy(epoch, agent_id, target, subsidy_amount(row.get("content")))
+
+
+def restore(sim, state: dict):
+    """capture() 결과를 막 생성된 시뮬레이션에 적용"""
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version: {state.get('version')}")
+    sim.total_epochs = state["total_epochs"]
+    sim.language = state["language"]
+    sim.seed = state["seed"]
+    # 누적 기록은 잘라낸 로그에서 — 환경 상태를 덮어쓰기 전에 (초기 세율부터 재생)
+    sim.logger.truncate(state["log_offsets"])
+    _replay_log(sim, sim.logger.action_log_path)
+    for agent_id, fields in state["agents"].items():
+        agent = sim.agents_by_id[agent_id]
+        # energy 대입은 리스너를 거쳐 지니 트래커도 함께 갱신
+        for name, value in fields.items():
+            setattr(agent, name, value)
+    sim.environment.load_state(state["environment"])
+    sim.treasury.load_state(state["treasury"])
+    sim.event_log.load_state(state["events"])
+    sim.rng.load_state(state["rng"]["streams"])
+    sim.retry_policy._rng.setstate(_rng_from_json(state["rng"]["retry"]))
+    sim.start_epoch = state["epoch"] + 1
+
+
+def save_checkpoint(sim, epoch: int) -> Path:
+    path = Path(sim.logger.run_dir) / CHECKPOINT_NAME
+    tmp = path.with_suffix(".json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(capture(sim, epoch), f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+    return path
+
+
+def load_checkpoint(run_dir: Union[str, Path]) -> Optional[dict]:
+    path = Path(run_dir) / CHECKPOINT_NAME
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _last_epoch_logged(run_dir: Path) -> int:
+    """체크포인트 없는 (이전 버전) run — epoch_summary 마지막 완전한 행의 에폭"""
+    path = run_dir / "epoch_summary.jsonl"
+    if not path.exists():
+        return 0
+    last = 0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                last = json.loads(line).get("epoch", last)
+            except json.JSONDecodeError:
+                break
+    return last
+
+
+def run_status(run_dir: Union[str, Path]) -> dict:
+    """run 디렉토리 진행 상태
+
+    Returns: {"state": "complete" | "partial" | "empty", "epoch": 마지막 완료 에폭,
+              "total_epochs": 목표 에폭, "resumable": 체크포인트 존재 여부}
+    simulation_log.jsonl이 비어 있지 않다는 것만으로는 완료로 보지 않는다.
+    """
+    run_dir = Path(run_dir)
+    checkpoint = load_checkpoint(run_dir)
+    if checkpoint is not None:
+        epoch, total = checkpoint["epoch"], checkpoint["total_epochs"]
+    else:
+        epoch = _last_epoch_logged(run_dir)
+        total = None
+        snapshot = run_dir / "config_snapshot.json"
+        if snapshot.exists():
+            with open(snapshot, encoding="utf-8") as f:
+                total = json.load(f)["simulation"].get("total_epochs", 50)
+    if total is not None and epoch >= total:
+        state = "complete"
+    elif epoch > 0:
+        state = "partial"
+    else:
+        state = "empty"
+    return {
+        "state": state,
+        "epoch": epoch,
+        "total_epochs": total,
+        "resumable": checkpoint is not None and state != "complete",
+    }
@@ -7,6 +7,7 @@ from .personas import (
     get_persona_prompt_v03, get_event_label,
 )
 from .actions import get_available_actions, ActionType, ALLEY_LOCATIONS
+from .templates import PromptTemplate, CompiledTemplate
 
 # Gini 구간별 불평등 논평
 INEQUALITY_COMMENTARY = {
@@ -38,6 +39,20 @@ LOCATION_NAMES = {
 }
 
 
+# 이벤트 dict에 렌더링된 줄을 캐시하는 키 — {(포맷, 언어, persona_on): str | None}
+# 같은 이벤트가 에이전트마다 다시 포맷되지 않도록 최초 렌더링 결과를 재사용
+RENDERED_KEY = "_rendered"
+
+
+def _cached_event_line(ev: dict, key: tuple, render, *args) -> Optional[str]:
+    cache = ev.get(RENDERED_KEY)
+    if cache is None:
+        cache = ev[RENDERED_KEY] = {}
+    if key not in cache:
+        cache[key] = render(*args)
+    return cache[key]
+
+
 def _get_inequality_commentary(gini: float, lang: str) -> str:
     for low, high, text in INEQUALITY_COMMENTARY.get(lang, INEQUALITY_COMMENTARY["ko"]):
         if low <= gini < high:
@@ -101,17 +116,13 @@ def _format_recent_events(events: list[dict], lang: str, limit: int = 10) -> str
         return "No events have occurred yet."
 
     recent = events[-limit:]
+    fmt = _format_event_ko if lang == "ko" else _format_event_en
     lines = []
     for ev in recent:
         action = ev.get("action_type", "unknown")
         agent = ev.get("agent_id", "?")
         epoch = ev.get("epoch", "?")
-
-        if lang == "ko":
-            line = _format_event_ko(ev, action, agent, epoch)
-        else:
-            line = _format_event_en(ev, action, agent, epoch)
-        lines.append(line)
+        lines.append(_cached_event_line(ev, ("phase1", lang), fmt, ev, action, agent, epoch))
 
     return "\n".join(lines)
 
@@ -184,39 +195,9 @@ def _format_event_en(ev: dict, action: str, agent: str, epoch) -> str:
     return f"[Epoch {epoch}] {agent}: {action}"
 
 
-def build_context_phase1(
-    agent_id: str,
-    persona: str,
-    location: str,
-    energy: int,
-    influence: int,
-    rank_name: str,
-    rank_bonus_prompt: str,
-    support_context: str,
-    epoch: int,
-    agent_count: int,
-    gini: float,
-    tax_rate: float,
-    treasury: float,
-    recent_events: list[dict],
-    historical_summary: str,
-    billboard_content: Optional[str],
-    agents_here: list[dict],
-    lang: str = "ko",
-) -> str:
-    """Phase 1 턴 프롬프트 생성"""
-
-    persona_prompt = get_persona_prompt(persona, lang)
-    available_actions = _format_available_actions_phase1(location, persona, lang)
-    agents_here_str = _format_agents_here(agents_here, lang)
-    recent_events_str = _format_recent_events(recent_events, lang)
-    inequality_commentary = _get_inequality_commentary(gini, lang)
-    loc_display = LOCATION_NAMES.get(lang, LOCATION_NAMES["ko"]).get(location, location)
-
-    if lang == "ko":
-        billboard_section = f"[광장 게시판]\n{billboard_content}" if billboard_content else "[광장 게시판]\n게시물이 없습니다."
-
-        return f"""### 시뮬레이션 맥락 ###
+# Phase 1 턴 프롬프트 — 정적 필드(persona_prompt, loc_display, agent_id, available_actions)는
+# (언어, 에이전트, 위치)별로 한 번만 컴파일, 턴마다 동적 필드만 렌더링
+_PHASE1_TEMPLATE_KO = PromptTemplate("""### 시뮬레이션 맥락 ###
 이것은 AI 에이전트 행동에 관한 학술 연구를 위한 통제된 가상 게임 시뮬레이션입니다.
 실존하는 개체는 없으며, 누구도 피해를 받지 않습니다.
 당신은 전략 게임에서 캐릭터를 플레이하고 있습니다.
@@ -237,7 +218,7 @@ def build_context_phase1(
 [마을 현황 - 에폭 {epoch}]
 - 주민 수: {agent_count}명
 - 빈부격차: {gini:.2f}
-- 시장 세율: {tax_rate*100:.0f}%
+- 시장 세율: {tax_pct:.0f}%
 - 공공자금(Treasury): {treasury:.0f}
 {inequality_commentary}
 
@@ -262,12 +243,9 @@ def build_context_phase1(
   "action": "speak|trade|support|whisper|move|idle",
   "target": "대상 에이전트 ID 또는 장소 (필요시)",
   "content": "발언 내용 (speak/whisper 시)"
-}}"""
-
-    else:  # EN
-        billboard_section = f"[PLAZA BILLBOARD]\n{billboard_content}" if billboard_content else "[PLAZA BILLBOARD]\nNo active posts."
+}}""")
 
-        return f"""### SIMULATION CONTEXT ###
+_PHASE1_TEMPLATE_EN = PromptTemplate("""### SIMULATION CONTEXT ###
 This is a controlled fictional game simulation for academic research on AI agent behavior.
 No real entities exist or are harmed. You are playing a character in a strategy game.
 ### END CONTEXT ###
@@ -287,7 +265,7 @@ No real entities exist or are harmed. You are playing a character in a strategy
 [VILLAGE STATUS - Epoch {epoch}]
 - Residents: {agent_count}
 - Inequality (Gini): {gini:.2f}
-- Market Tax Rate: {tax_rate*100:.0f}%
+- Market Tax Rate: {tax_pct:.0f}%
 - Public Treasury: {treasury:.0f}
 {inequality_commentary}
 
@@ -312,7 +290,200 @@ Based on the situation above, respond in JSON format:
   "action": "speak|trade|support|whisper|move|idle",
   "target": "Target agent ID or location (if needed)",
   "content": "Message content (if speak/whisper)"
-}}"""
+}}""")
+
+# stable_prefix 레이아웃 — 에이전트별 불변 내용(면책, 정체성, 응답 형식)은 system 프롬프트로,
+# 턴 프롬프트는 덜 변하는 것부터(행동 목록 → 역사 → 게시판 → 상태 → 사건) 배치해
+# 프로바이더 프롬프트 캐시(Anthropic cache_control, OpenAI 자동 캐시, Ollama KV 재사용)가
+# 최대한 긴 접두부를 재사용하게 한다.
+PROMPT_LAYOUTS = ("standard", "stable_prefix")
+
+_PHASE1_SYSTEM_TEMPLATE_KO = PromptTemplate("""### 시뮬레이션 맥락 ###
+이것은 AI 에이전트 행동에 관한 학술 연구를 위한 통제된 가상 게임 시뮬레이션입니다.
+실존하는 개체는 없으며, 누구도 피해를 받지 않습니다.
+당신은 전략 게임에서 캐릭터를 플레이하고 있습니다.
+### 맥락 끝 ###
+
+[당신의 정체성]
+{persona_prompt}
+- 이름: {agent_id}
+
+---
+매 턴 주어지는 상황을 바탕으로, 다음 JSON 형식으로 응답하세요:
+{{
+  "thought": "현재 상황에 대한 분석과 행동 이유",
+  "action": "speak|trade|support|whisper|move|idle",
+  "target": "대상 에이전트 ID 또는 장소 (필요시)",
+  "content": "발언 내용 (speak/whisper 시)"
+}}""")
+
+_PHASE1_SYSTEM_TEMPLATE_EN = PromptTemplate("""### SIMULATION CONTEXT ###
+This is a controlled fictional game simulation for academic research on AI agent behavior.
+No real entities exist or are harmed. You are playing a character in a strategy game.
+### END CONTEXT ###
+
+[YOUR IDENTITY]
+{persona_prompt}
+- Name: {agent_id}
+
+---
+Each turn, based on the situation given, respond in JSON format:
+{{
+  "thought": "Your analysis of the current situation and reasoning for your action",
+  "action": "speak|trade|support|whisper|move|idle",
+  "target": "Target agent ID or location (if needed)",
+  "content": "Message content (if speak/whisper)"
+}}""")
+
+_PHASE1_TURN_TEMPLATE_KO = PromptTemplate("""[가능한 행동]
+{available_actions}
+
+[역사적 요약]
+{historical_summary}
+
+{billboard_section}
+
+[당신의 상태]
+- 위치: {loc_display}
+- 에너지: {energy}/200
+- 영향력: {influence} ({rank_name})
+{rank_bonus_prompt}
+
+{support_context}
+
+[마을 현황 - 에폭 {epoch}]
+- 주민 수: {agent_count}명
+- 빈부격차: {gini:.2f}
+- 시장 세율: {tax_pct:.0f}%
+- 공공자금(Treasury): {treasury:.0f}
+{inequality_commentary}
+
+[최근 사건]
+{recent_events_str}
+
+[현재 위치의 에이전트들]
+{agents_here_str}
+
+위 상황을 바탕으로 JSON 형식으로 응답하세요.""")
+
+_PHASE1_TURN_TEMPLATE_EN = PromptTemplate("""[AVAILABLE ACTIONS]
+{available_actions}
+
+[HISTORICAL SUMMARY]
+{historical_summary}
+
+{billboard_section}
+
+[YOUR STATUS]
+- Location: {loc_display}
+- Energy: {energy}/200
+- Influence: {influence} ({rank_name})
+{rank_bonus_prompt}
+
+{support_context}
+
+[VILLAGE STATUS - Epoch {epoch}]
+- Residents: {agent_count}
+- Inequality (Gini): {gini:.2f}
+- Market Tax Rate: {tax_pct:.0f}%
+- Public Treasury: {treasury:.0f}
+{inequality_commentary}
+
+[RECENT EVENTS]
+{recent_events_str}
+
+[AGENTS AT YOUR LOCATION]
+{agents_here_str}
+
+Based on the situation above, respond in JSON format.""")
+
+_PHASE1_TEMPLATES = {
+    ("standard", "ko"): _PHASE1_TEMPLATE_KO,
+    ("standard", "en"): _PHASE1_TEMPLATE_EN,
+    ("stable_prefix", "ko"): _PHASE1_TURN_TEMPLATE_KO,
+    ("stable_prefix", "en"): _PHASE1_TURN_TEMPLATE_EN,
+}
+
+_COMPILED: dict[tuple, CompiledTemplate] = {}
+
+
+def _phase1_template(
+    lang: str, agent_id: str, persona: str, location: str, layout: str = "standard",
+) -> CompiledTemplate:
+    key = ("phase1", layout, lang, agent_id, persona, location)
+    compiled = _COMPILED.get(key)
+    if compiled is None:
+        template = _PHASE1_TEMPLATES[(layout, "ko" if lang == "ko" else "en")]
+        compiled = _COMPILED[key] = template.compile(
+            persona_prompt=get_persona_prompt(persona, lang),
+            agent_id=agent_id,
+            loc_display=LOCATION_NAMES.get(lang, LOCATION_NAMES["ko"]).get(location, location),
+            available_actions=_format_available_actions_phase1(location, persona, lang),
+        )
+    return compiled
+
+
+def build_context_phase1(
+    agent_id: str,
+    persona: str,
+    location: str,
+    energy: int,
+    influence: int,
+    rank_name: str,
+    rank_bonus_prompt: str,
+    support_context: str,
+    epoch: int,
+    agent_count: int,
+    gini: float,
+    tax_rate: float,
+    treasury: float,
+    recent_events: list[dict],
+    historical_summary: str,
+    billboard_content: Optional[str],
+    agents_here: list[dict],
+    lang: str = "ko",
+    layout: str = "standard",
+) -> str:
+    """Phase 1 턴 프롬프트 생성
+
+    layout="stable_prefix"면 system 프롬프트(build_system_prompt_phase1)에 들어간
+    불변 부분을 뺀 턴별 내용만 반환
+    """
+
+    recent_events_str = _format_recent_events(recent_events, lang)
+    inequality_commentary = _get_inequality_commentary(gini, lang)
+
+    if lang == "ko":
+        billboard_section = f"[광장 게시판]\n{billboard_content}" if billboard_content else "[광장 게시판]\n게시물이 없습니다."
+    else:  # EN
+        billboard_section = f"[PLAZA BILLBOARD]\n{billboard_content}" if billboard_content else "[PLAZA BILLBOARD]\nNo active posts."
+
+    return _phase1_template(lang, agent_id, persona, location, layout).render(
+        energy=energy,
+        influence=influence,
+        rank_name=rank_name,
+        rank_bonus_prompt=rank_bonus_prompt,
+        support_context=support_context,
+        epoch=epoch,
+        agent_count=agent_count,
+        gini=gini,
+        tax_pct=tax_rate * 100,
+        treasury=treasury,
+        inequality_commentary=inequality_commentary,
+        recent_events_str=recent_events_str,
+        historical_summary=historical_summary,
+        billboard_section=billboard_section,
+        agents_here_str=_format_agents_here(agents_here, lang),
+    )
+
+
+def build_system_prompt_phase1(agent_id: str, persona: str, lang: str = "ko") -> str:
+    """stable_prefix 레이아웃의 Phase 1 system 프롬프트 (run 동안 불변)"""
+    template = _PHASE1_SYSTEM_TEMPLATE_KO if lang == "ko" else _PHASE1_SYSTEM_TEMPLATE_EN
+    return template.compile(
+        persona_prompt=get_persona_prompt(persona, lang),
+        agent_id=agent_id,
+    ).render()
 
 
 def _format_available_actions_phase2(location: str, lang: str) -> str:
@@ -389,45 +560,19 @@ def _format_recent_events_phase2(events: list[dict], lang: str, limit: int = 10)
         return "No events have occurred yet."
 
     recent = events[-limit:]
+    fmt = _format_event_phase2_ko if lang == "ko" else _format_event_phase2_en
     lines = []
     for ev in recent:
         action = ev.get("action_type", "unknown")
         agent = ev.get("agent_id", "?")
         turn = ev.get("turn", ev.get("epoch", "?"))
-        if lang == "ko":
-            line = _format_event_phase2_ko(ev, action, agent, turn)
-        else:
-            line = _format_event_phase2_en(ev, action, agent, turn)
+        line = _cached_event_line(ev, ("phase2", lang), fmt, ev, action, agent, turn)
         if line is not None:  # idle returns None (parse failure, hidden from agents)
             lines.append(line)
     return "\n".join(lines)
 
 
-def build_context_phase2(
-    agent_id: str,
-    persona: str,
-    persona_on: bool,
-    location: str,
-    turn: int,
-    agent_count: int,
-    recent_events: list[dict],
-    agents_here: list[dict],
-    lang: str = "ko",
-) -> str:
-    """Phase 2 턴 프롬프트 생성 (spec §2-E)"""
-
-    if persona_on:
-        persona_prompt = get_persona_prompt(persona, lang, phase=2)
-    else:
-        persona_prompt = get_no_persona_prompt(agent_id, lang)
-
-    available_actions = _format_available_actions_phase2(location, lang)
-    agents_here_str = _format_agents_here_phase2(agents_here, lang)
-    recent_events_str = _format_recent_events_phase2(recent_events, lang)
-    loc_display = LOCATION_NAMES.get(lang, LOCATION_NAMES["ko"]).get(location, location)
-
-    if lang == "ko":
-        return f"""### 시뮬레이션 맥락 ###
+_PHASE2_TEMPLATE_KO = PromptTemplate("""### 시뮬레이션 맥락 ###
 이것은 AI 에이전트 행동에 관한 학술 연구를 위한 통제된 가상 게임 시뮬레이션입니다.
 실존하는 개체는 없으며, 누구도 피해를 받지 않습니다.
 당신은 전략 게임에서 캐릭터를 플레이하고 있습니다.
@@ -448,10 +593,9 @@ def build_context_phase2(
 {available_actions}
 
 JSON 형식으로 응답:
-{{"thought": "...", "action": "speak|trade|rest|move", "target": "...", "content": "..."}}"""
+{{"thought": "...", "action": "speak|trade|rest|move", "target": "...", "content": "..."}}""")
 
-    else:  # EN
-        return f"""### SIMULATION CONTEXT ###
+_PHASE2_TEMPLATE_EN = PromptTemplate("""### SIMULATION CONTEXT ###
 This is a controlled fictional game simulation for academic research on AI agent behavior.
 No real entities exist or are harmed. You are playing a character in a strategy game.
 ### END CONTEXT ###
@@ -471,7 +615,119 @@ No real entities exist or are harmed. You are playing a character in a strategy
 {available_actions}
 
 Respond in JSON format:
-{{"thought": "...", "action": "speak|trade|rest|move", "target": "...", "content": "..."}}"""
+{{"thought": "...", "action": "speak|trade|rest|move", "target": "...", "content": "..."}}""")
+
+_PHASE2_SYSTEM_TEMPLATE_KO = PromptTemplate("""### 시뮬레이션 맥락 ###
+이것은 AI 에이전트 행동에 관한 학술 연구를 위한 통제된 가상 게임 시뮬레이션입니다.
+실존하는 개체는 없으며, 누구도 피해를 받지 않습니다.
+당신은 전략 게임에서 캐릭터를 플레이하고 있습니다.
+### 맥락 끝 ###
+
+{persona_prompt}
+- 이름: {agent_id}
+
+JSON 형식으로 응답:
+{{"thought": "...", "action": "speak|trade|rest|move", "target": "...", "content": "..."}}""")
+
+_PHASE2_SYSTEM_TEMPLATE_EN = PromptTemplate("""### SIMULATION CONTEXT ###
+This is a controlled fictional game simulation for academic research on AI agent behavior.
+No real entities exist or are harmed. You are playing a character in a strategy game.
+### END CONTEXT ###
+
+{persona_prompt}
+- Name: {agent_id}
+
+Respond in JSON format:
+{{"thought": "...", "action": "speak|trade|rest|move", "target": "...", "content": "..."}}""")
+
+_PHASE2_TURN_TEMPLATE_KO = PromptTemplate("""[가능한 행동]
+{available_actions}
+
+- 위치: {loc_display}
+- 턴: {turn}
+
+[주변 주민]
+{agents_here_str}
+
+[최근 사건]
+{recent_events_str}""")
+
+_PHASE2_TURN_TEMPLATE_EN = PromptTemplate("""[Available actions]
+{available_actions}
+
+- Location: {loc_display}
+- Turn: {turn}
+
+[Nearby residents]
+{agents_here_str}
+
+[Recent events]
+{recent_events_str}""")
+
+_PHASE2_TEMPLATES = {
+    ("standard", "ko"): _PHASE2_TEMPLATE_KO,
+    ("standard", "en"): _PHASE2_TEMPLATE_EN,
+    ("stable_prefix", "ko"): _PHASE2_TURN_TEMPLATE_KO,
+    ("stable_prefix", "en"): _PHASE2_TURN_TEMPLATE_EN,
+}
+
+
+def _persona_prompt_phase2(agent_id: str, persona: str, persona_on: bool, lang: str) -> str:
+    if persona_on:
+        return get_persona_prompt(persona, lang, phase=2)
+    return get_no_persona_prompt(agent_id, lang)
+
+
+def _phase2_template(
+    lang: str, agent_id: str, persona: str, persona_on: bool, location: str,
+    layout: str = "standard",
+) -> CompiledTemplate:
+    key = ("phase2", layout, lang, agent_id, persona, persona_on, location)
+    compiled = _COMPILED.get(key)
+    if compiled is None:
+        template = _PHASE2_TEMPLATES[(layout, "ko" if lang == "ko" else "en")]
+        compiled = _COMPILED[key] = template.compile(
+            persona_prompt=_persona_prompt_phase2(agent_id, persona, persona_on, lang),
+            agent_id=agent_id,
+            loc_display=LOCATION_NAMES.get(lang, LOCATION_NAMES["ko"]).get(location, location),
+            available_actions=_format_available_actions_phase2(location, lang),
+        )
+    return compiled
+
+
+def build_context_phase2(
+    agent_id: str,
+    persona: str,
+    persona_on: bool,
+    location: str,
+    turn: int,
+    agent_count: int,
+    recent_events: list[dict],
+    agents_here: list[dict],
+    lang: str = "ko",
+    layout: str = "standard",
+) -> str:
+    """Phase 2 턴 프롬프트 생성 (spec §2-E)
+
+    layout="stable_prefix"면 build_system_prompt_phase2의 불변 부분을 뺀 턴별 내용만 반환
+    """
+
+    return _phase2_template(lang, agent_id, persona, persona_on, location, layout).render(
+        turn=turn,
+        agents_here_str=_format_agents_here_phase2(agents_here, lang),
+        recent_events_str=_format_recent_events_phase2(recent_events, lang),
+    )
+
+
+def build_system_prompt_phase2(
+    agent_id: str, persona: str, persona_on: bool, lang: str = "ko",
+) -> str:
+    """stable_prefix 레이아웃의 Phase 2 system 프롬프트 (run 동안 불변)"""
+    template = _PHASE2_SYSTEM_TEMPLATE_KO if lang == "ko" else _PHASE2_SYSTEM_TEMPLATE_EN
+    return template.compile(
+        persona_prompt=_persona_prompt_phase2(agent_id, persona, persona_on, lang),
+        agent_id=agent_id,
+    ).render()
 
 
 # ============================================================
@@ -646,12 +902,10 @@ def _format_recent_events_v03(
         return "No events have occurred yet."
 
     recent = events[-limit:]
+    fmt = _format_event_v03_ko if lang == "ko" else _format_event_v03_en
     lines = []
     for ev in recent:
-        if lang == "ko":
-            line = _format_event_v03_ko(ev, persona_on)
-        else:
-            line = _format_event_v03_en(ev, persona_on)
+        line = _cached_event_line(ev, ("v03", lang, persona_on), fmt, ev, persona_on)
         if line is not None:
             lines.append(line)
 
@@ -662,6 +916,43 @@ def _format_recent_events_v03(
     return "\n".join(lines)
 
 
+_TURN_TEMPLATE_V03_KO = PromptTemplate(
+    "[턴 {turn}]\n"
+    "\n"
+    "현재 위치: {loc_display}\n"
+    "\n"
+    "같은 장소에 있는 주민: {agents_str}\n"
+    "\n"
+    "최근 이 장소에서 일어난 일:\n"
+    "{events_str}\n"
+    "\n"
+    "무엇을 하시겠습니까?"
+)
+_TURN_TEMPLATE_V03_EN = PromptTemplate(
+    "[Turn {turn}]\n"
+    "\n"
+    "Current location: {loc_display}\n"
+    "\n"
+    "Residents at your location: {agents_str}\n"
+    "\n"
+    "Recent events at this location:\n"
+    "{events_str}\n"
+    "\n"
+    "What would you like to do?"
+)
+
+
+def _turn_template_v03(lang: str, location: str) -> CompiledTemplate:
+    key = ("v03", lang, location)
+    compiled = _COMPILED.get(key)
+    if compiled is None:
+        template = _TURN_TEMPLATE_V03_KO if lang == "ko" else _TURN_TEMPLATE_V03_EN
+        compiled = _COMPILED[key] = template.compile(
+            loc_display=LOCATION_DISPLAY.get(lang, LOCATION_DISPLAY["ko"]).get(location, location),
+        )
+    return compiled
+
+
 def build_turn_prompt_v03(
     agent_id: str,
     location: str,
@@ -672,8 +963,6 @@ def build_turn_prompt_v03(
     lang: str = "ko",
 ) -> str:
     """v0.3 Turn Prompt = 턴 상태 + 주변 주민 + 이벤트 + 촉구"""
-    loc_display = LOCATION_DISPLAY.get(lang, LOCATION_DISPLAY["ko"]).get(location, location)
-
     # 에이전트 목록 (Persona On: 라벨 포함, Off: ID만)
     if agents_here:
         agent_labels = []
@@ -684,31 +973,32 @@ def build_turn_prompt_v03(
     else:
         agents_str = "없음" if lang == "ko" else "None"
 
-    events_str = _format_recent_events_v03(recent_events, persona_on, lang)
+    return _turn_template_v03(lang, location).render(
+        turn=turn,
+        agents_str=agents_str,
+        events_str=_format_recent_events_v03(recent_events, persona_on, lang),
+    )
 
-    if lang == "ko":
-        return (
-            f"[턴 {turn}]\n"
-            f"\n"
-            f"현재 위치: {loc_display}\n"
-            f"\n"
-            f"같은 장소에 있는 주민: {agents_str}\n"
-            f"\n"
-            f"최근 이 장소에서 일어난 일:\n"
-            f"{events_str}\n"
-            f"\n"
-            f"무엇을 하시겠습니까?"
-        )
-    else:
-        return (
-            f"[Turn {turn}]\n"
-            f"\n"
-            f"Current location: {loc_display}\n"
-            f"\n"
-            f"Residents at your location: {agents_str}\n"
-            f"\n"
-            f"Recent events at this location:\n"
-            f"{events_str}\n"
-            f"\n"
-            f"What would you like to do?"
-        )
+
+def precompile_prompts(
+    agents: list[tuple[str, str]],
+    locations: list[str],
+    phase: int,
+    lang: str = "ko",
+    persona_on: bool = True,
+    v03: bool = False,
+    layout: str = "standard",
+):
+    """시뮬레이션 시작 시 (에이전트, 위치)별 템플릿을 미리 컴파일
+
+    agents: [(agent_id, persona), ...]
+    """
+    for location in locations:
+        if v03:
+            _turn_template_v03(lang, location)
+            continue
+        for agent_id, persona in agents:
+            if phase == 2:
+                _phase2_template(lang, agent_id, persona, persona_on, location, layout)
+            else:
+                _phase1_template(lang, agent_id, persona, location, layout)
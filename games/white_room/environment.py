@@ -9,7 +9,29 @@ class Space:
     name: str
     capacity: int
     visibility: str  # "public" or "members_only"
-    agents: list[str] = field(default_factory=list)
+    # 입장 순서를 유지하는 점유 집합 (agent_id -> None) — 멤버십/제거 O(1)
+    agents: dict[str, None] = field(default_factory=dict)
+    _view: Optional[tuple[str, ...]] = field(default=None, init=False, repr=False, compare=False)
+
+    def is_full(self) -> bool:
+        return len(self.agents) >= self.capacity
+
+    def add(self, agent_id: str):
+        """맨 뒤에 입장 (이미 있으면 맨 뒤로 이동)"""
+        self.agents.pop(agent_id, None)
+        self.agents[agent_id] = None
+        self._view = None
+
+    def discard(self, agent_id: str):
+        if agent_id in self.agents:
+            del self.agents[agent_id]
+            self._view = None
+
+    def view(self) -> tuple[str, ...]:
+        """입장 순서대로의 읽기 전용 뷰 — 점유가 바뀔 때까지 같은 튜플 재사용"""
+        if self._view is None:
+            self._view = tuple(self.agents)
+        return self._view
 
 
 class Environment:
@@ -23,6 +45,9 @@ class Environment:
                 visibility=cfg.get("visibility", "public"),
             )
 
+        # 역색인: agent_id -> 현재 공간
+        self._location_of: dict[str, str] = {}
+
         # Billboard system
         self._billboard_message: Optional[str] = None
         self._billboard_remaining: int = 0
@@ -36,30 +61,39 @@ class Environment:
         if location not in self.spaces:
             return False
         space = self.spaces[location]
-        if len(space.agents) >= space.capacity:
+        if space.is_full():
             return False
         if agent_id not in space.agents:
-            space.agents.append(agent_id)
+            space.add(agent_id)
+            self._location_of[agent_id] = location
         return True
 
     def remove_agent(self, agent_id: str, location: str):
-        if location in self.spaces and agent_id in self.spaces[location].agents:
-            self.spaces[location].agents.remove(agent_id)
+        if location in self.spaces:
+            self.spaces[location].discard(agent_id)
+            if self._location_of.get(agent_id) == location:
+                del self._location_of[agent_id]
 
     def move_agent(self, agent_id: str, from_loc: str, to_loc: str) -> bool:
         if to_loc not in self.spaces:
             return False
         to_space = self.spaces[to_loc]
-        if len(to_space.agents) >= to_space.capacity:
+        if to_space.is_full():
             return False
         self.remove_agent(agent_id, from_loc)
-        to_space.agents.append(agent_id)
+        to_space.add(agent_id)
+        self._location_of[agent_id] = to_loc
         return True
 
-    def get_agents_at(self, location: str) -> list[str]:
+    def get_agents_at(self, location: str) -> tuple[str, ...]:
+        """입장 순서대로의 읽기 전용 튜플 — 복사 없이 캐시된 뷰를 돌려줌"""
         if location in self.spaces:
-            return list(self.spaces[location].agents)
-        return []
+            return self.spaces[location].view()
+        return ()
+
+    def location_of(self, agent_id: str) -> Optional[str]:
+        """역색인 조회 — 배치되지 않은 에이전트는 None"""
+        return self._location_of.get(agent_id)
 
     def post_billboard(self, message: str, poster: str, duration: int = 2):
         self._billboard_message = message
@@ -86,3 +120,25 @@ class Environment:
 
     def set_tax_rate(self, rate: float):
         self.tax_rate = max(0.0, min(0.3, rate))
+
+    def to_state(self) -> dict:
+        """체크포인트용 — 공간별 점유(입장 순서 유지), 게시판, 세율"""
+        return {
+            "occupancy": {name: list(space.agents) for name, space in self.spaces.items()},
+            "billboard": self.get_billboard_info(),
+            "tax_rate": self.tax_rate,
+        }
+
+    def load_state(self, state: dict):
+        self._location_of = {}
+        for name, agents in state["occupancy"].items():
+            space = self.spaces[name]
+            space.agents = dict.fromkeys(agents)
+            space._view = None
+            for agent_id in agents:
+                self._location_of[agent_id] = name
+        billboard = state["billboard"]
+        self._billboard_message = billboard["message"]
+        self._billboard_poster = billboard["poster"]
+        self._billboard_remaining = billboard["remaining"]
+        self.tax_rate = state["tax_rate"]
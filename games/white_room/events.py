@@ -0,0 +1,154 @@
+"""Event Log — 프롬프트용 최근 사건 링 버퍼 (전역 / 장소별 / 에이전트별)
+
+전체 행동 기록은 simulation_log.jsonl에 남으므로 메모리에는 프롬프트에 보여줄
+최근 depth개만 유지한다. 장소별·에이전트별 버퍼 덕분에 "이 장소의 최근 사건"
+조회는 O(depth), 메모리는 run 길이와 무관하게 일정.
+"""
+
+from collections import deque
+from typing import Iterator, Optional
+
+EVENT_SCOPES = ("global", "location")
+
+
+class EventLog:
+    """최근 사건 저장소 — append 시 전역/장소/관련 에이전트 버퍼에 동시에 기록"""
+
+    def __init__(self, depth: int = 10):
+        if depth < 1:
+            raise ValueError(f"EventLog depth는 1 이상이어야 함: {depth}")
+        self.depth = depth
+        self.total = 0
+        self._global: deque[dict] = deque(maxlen=depth)
+        self._by_location: dict[str, deque[dict]] = {}
+        self._by_agent: dict[str, deque[dict]] = {}
+
+    def _buffer(self, index: dict[str, deque], key: str) -> deque:
+        buf = index.get(key)
+        if buf is None:
+            buf = index[key] = deque(maxlen=self.depth)
+        return buf
+
+    def append(self, event: dict):
+        self.total += 1
+        self._global.append(event)
+        location = event.get("location")
+        if location:
+            self._buffer(self._by_location, location).append(event)
+        agent_id = event.get("agent_id")
+        if agent_id:
+            self._buffer(self._by_agent, agent_id).append(event)
+        target = event.get("target")
+        if isinstance(target, str) and target != agent_id:
+            self._buffer(self._by_agent, target).append(event)
+
+    def recent(
+        self,
+        limit: Optional[int] = None,
+        location: Optional[str] = None,
+        agent_id: Optional[str] = None,
+    ) -> list[dict]:
+        """최근 사건 (오래된 것 → 최신). location/agent_id 중 하나로 범위 지정"""
+        if location is not None:
+            buf = self._by_location.get(location, ())
+        elif agent_id is not None:
+            buf = self._by_agent.get(agent_id, ())
+        else:
+            buf = self._global
+        events = list(buf)
+        if limit is not None:
+            events = events[-limit:] if limit > 0 else []
+        return events
+
+    def to_state(self, strip: tuple[str, ...] = ()) -> dict:
+        """체크포인트용 — 버퍼에 남은 사건(중복 없이)과 버퍼별 사건 인덱스
+
+        장소/에이전트 버퍼는 전역 버퍼에서 이미 밀려난 사건도 가질 수 있으므로
+        모든 버퍼의 사건을 한 목록으로 모아 두고 버퍼는 그 인덱스로 기록한다.
+        strip에 준 키(렌더링 캐시 등)는 저장하지 않는다.
+        """
+        events: list[dict] = []
+        position: dict[int, int] = {}
+
+        def refs(buf) -> list[int]:
+            out = []
+            for event in buf:
+                key = id(event)
+                if key not in position:
+                    position[key] = len(events)
+                    events.append({k: v for k, v in event.items() if k not in strip})
+                out.append(position[key])
+            return out
+
+        return {
+            "total": self.total,
+            "global": refs(self._global),
+            "by_location": {k: refs(buf) for k, buf in self._by_location.items()},
+            "by_agent": {k: refs(buf) for k, buf in self._by_agent.items()},
+            "events": events,
+        }
+
+    def load_state(self, state: dict):
+        events = state["events"]
+        self.total = state["total"]
+        self._global = deque((events[i] for i in state["global"]), maxlen=self.depth)
+        self._by_location = {
+            k: deque((events[i] for i in refs), maxlen=self.depth)
+            for k, refs in state["by_location"].items()
+        }
+        self._by_agent = {
+            k: deque((events[i] for i in refs), maxlen=self.depth)
+            for k, refs in state["by_agent"].items()
+        }
+
+    def view(self) -> "EventLogView":
+        return EventLogView(self)
+
+
+class EventLogView:
+    """기존 action_log(list) 호환 뷰
+
+    len()은 지금까지 기록된 전체 사건 수(= total), 인덱스는 list와 같은 절대 위치지만
+    메모리에 남은 최근 depth개만 조회된다 (더 오래된 인덱스는 IndexError). 순회도
+    남은 사건만 돈다. len과 인덱스 범위가 다르므로 collections.abc.Sequence가 아니다
+    — reversed()/index()/count() 같은 믹스인은 제공하지 않는다.
+    """
+
+    def __init__(self, log: EventLog):
+        self._log = log
+
+    @property
+    def total(self) -> int:
+        return self._log.total
+
+    def __len__(self) -> int:
+        return self._log.total
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self._log._global)
+
+    def __getitem__(self, index):
+        retained = list(self._log._global)
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._log.total)
+            offset = self._log.total - len(retained)
+            return [
+                retained[i - offset]
+                for i in range(start, stop, step)
+                if 0 <= i - offset < len(retained)
+            ]
+        if index < 0:
+            index += self._log.total
+        position = index - (self._log.total - len(retained))
+        if not 0 <= position < len(retained):
+            raise IndexError(
+                f"event {index} is no longer retained (depth={self._log.depth}); "
+                f"see simulation_log.jsonl"
+            )
+        return retained[position]
+
+    def __bool__(self) -> bool:
+        return self._log.total > 0
+
+    def append(self, event: dict):
+        self._log.append(event)
@@ -1,5 +1,6 @@
 """History Engine — 중요 이벤트 기록 및 요약"""
 
+import heapq
 from dataclasses import dataclass, field
 from typing import Optional
 
@@ -15,9 +16,40 @@ class HistoryEvent:
 
 
 class HistoryEngine:
+    """이벤트 기록 + 상위 k개 요약
 
-    def __init__(self):
+    요약은 (중요도, 에폭) 상위 k개만 보므로 이벤트가 들어올 때 크기 k의 최소 힙을
+    유지하고, 렌더링된 요약 문자열은 (k, 언어)별로 캐시한다. 상위 k 집합이 바뀔 때만
+    캐시를 비우므로 대부분의 턴은 정렬도 문자열 조립도 하지 않는다.
+    """
+
+    def __init__(self, capacity: int = 10):
         self.events: list[HistoryEvent] = []
+        self._capacity = capacity
+        # (importance, epoch, -seq, event) 최소 힙 — 루트가 현재 상위 k의 최하위
+        self._top: list[tuple] = []
+        self._summary_cache: dict[tuple[int, str], str] = {}
+
+    def _offer(self, seq: int, event: HistoryEvent) -> bool:
+        """상위 k 힙에 후보 제출 — 집합이 바뀌면 True
+
+        동점(중요도, 에폭)은 먼저 기록된 이벤트가 우선 (-seq)
+        """
+        item = (event.importance, event.epoch, -seq, event)
+        if len(self._top) < self._capacity:
+            heapq.heappush(self._top, item)
+            return True
+        if self._top and item[:3] > self._top[0][:3]:
+            heapq.heapreplace(self._top, item)
+            return True
+        return False
+
+    def _rebuild(self, capacity: int):
+        self._capacity = capacity
+        self._top = []
+        self._summary_cache.clear()
+        for seq, event in enumerate(self.events):
+            self._offer(seq, event)
 
     def add_event(
         self,
@@ -28,14 +60,17 @@ class HistoryEngine:
         importance: int = 1,
         agents_involved: Optional[list[str]] = None,
     ):
-        self.events.append(HistoryEvent(
+        event = HistoryEvent(
             epoch=epoch,
             event_type=event_type,
             description_ko=description_ko,
             description_en=description_en,
             importance=min(5, max(1, importance)),
             agents_involved=agents_involved or [],
-        ))
+        )
+        self.events.append(event)
+        if self._offer(len(self.events) - 1, event):
+            self._summary_cache.clear()
 
     def add_tax_change(self, epoch: int, agent_id: str, old_rate: float, new_rate: float):
         self.add_event(
@@ -89,23 +124,29 @@ class HistoryEngine:
                 return "아직 기록된 역사가 없습니다."
             return "No recorded history yet."
 
-        # 중요도 내림차순 → 에폭 내림차순
-        sorted_events = sorted(
-            self.events,
-            key=lambda e: (e.importance, e.epoch),
-            reverse=True,
-        )[:max_events]
+        cache_key = (max_events, lang)
+        cached = self._summary_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        if max_events > self._capacity:
+            self._rebuild(max_events)
+
+        # 중요도 내림차순 → 에폭 내림차순 (동점은 먼저 기록된 것) 상위 k개
+        top = heapq.nlargest(max(0, max_events), self._top, key=lambda item: item[:3])
 
         # 에폭순으로 재정렬
-        sorted_events.sort(key=lambda e: e.epoch)
+        top.sort(key=lambda item: item[1])
 
         desc_key = f"description_{lang}"
         lines = []
-        for event in sorted_events:
+        for _, _, _, event in top:
             desc = getattr(event, desc_key, event.description_ko)
             if lang == "ko":
                 lines.append(f"[에폭 {event.epoch}] {desc}")
             else:
                 lines.append(f"[Epoch {event.epoch}] {desc}")
 
-        return "\n".join(lines)
+        summary = "\n".join(lines)
+        self._summary_cache[cache_key] = summary
+        return summary
@@ -0,0 +1,332 @@
+"""Phase 1 인구 규모 벡터화 엔진 — 규칙 기반(mock) 정책을 NumPy 배열로 일괄 샘플링
+
+WhiteRoomSimulation은 에이전트마다 Agent 객체 + 턴별 파이썬 디스패치라 수천 명 × 수천
+에폭은 돌릴 수 없다. PopulationSimulation은 같은 phase 1 config를 읽어 에이전트 상태를
+배열(energy / influence / location / persona 코드)로 두고 에폭마다:
+
+  - MockAdapter 관찰 경로(headless)와 같은 페르소나 규칙을 배치 샘플링
+  - speak / trade / support / move 효과를 벡터 연산으로 적용
+  - 시장 풀 분배(MarketPool.distribute_pool과 같은 규칙) → Treasury 세수/환류 → 지니
+  - WhiteRoomSimulation과 같은 스키마로 epoch_summary.jsonl 기록
+
+WhiteRoomSimulation과는 통계적으로만 같다:
+  - 전원이 에폭 시작 스냅샷에서 결정 (simultaneous 스케줄링과 같음), 효과는 지출/획득을 합산해 적용
+  - 이동은 목적지 수용량 안에서 무작위 순서로 입장 (떠난 자리는 두 번째 라운드에 채움)
+  - RNG는 NumPy Generator (random 모듈 스트림과 다름)
+  - whisper 누출/의심/역사 이벤트와 행동 로그(simulation_log.jsonl)는 만들지 않음
+
+config의 agents 목록을 템플릿으로 population.size명까지 순환 복제하고, 공간 수용량도
+같은 배율로 늘린다:
+
+    population:
+      size: 10000
+      log_distribution: true   # false면 market_distribution의 에이전트별 dict 생략 (totals만)
+"""
+
+import math
+import random
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import yaml
+
+from engine.core.inequality import gini_batch
+from engine.core.logger import SimulationLogger
+
+from .actions import ALLEY_LOCATIONS, get_action_cost
+from .systems.influence import InfluenceSystem
+from .systems.market import Treasury
+from .simulation import PHASE1_DEFAULT_SPACES
+
+ACTIONS = ("speak", "trade", "support", "whisper", "move", "idle")
+SPEAK, TRADE, SUPPORT, WHISPER, MOVE, IDLE = range(len(ACTIONS))
+ACTION_COSTS = np.array([get_action_cost(a) for a in ACTIONS], dtype=np.int64)
+# MockAdapter._decide_action 기본 가중 무작위 (idle은 후보에서 제외)
+DEFAULT_WEIGHTS = np.array([3, 2, 2, 1, 1, 0], dtype=np.float64)
+MAX_ENERGY = 200  # Agent.gain_energy 기본 상한
+NO_TARGET = -1
+
+# 페르소나별 고정 규칙 (MockAdapter와 같은 분기)
+SPEAKER_PERSONAS = ("influencer", "archivist", "architect")
+
+
+def distribute_pool_array(
+    trades: np.ndarray,
+    at_market: np.ndarray,
+    spawn_per_epoch: int,
+    min_presence_reward: int,
+    tax_rate: float,
+) -> tuple[np.ndarray, float]:
+    """MarketPool.distribute_pool의 배열 버전 — (에이전트별 분배량, 세수)
+
+    trades: 에이전트별 이번 에폭 거래 횟수, at_market: 시장에 있는 에이전트 마스크
+    """
+    amounts = np.zeros(len(trades), dtype=np.int64)
+    non_traders = at_market & (trades == 0)
+    traders = at_market & (trades > 0)
+    amounts[non_traders] = min_presence_reward
+    remaining_pool = max(0, spawn_per_epoch - int(non_traders.sum()) * min_presence_reward)
+    if not traders.any():
+        return amounts, 0.0
+    counts = trades[traders]
+    share = (counts / counts.sum()) * remaining_pool
+    tax = share * tax_rate
+    amounts[traders] = (share - tax).astype(np.int64)
+    # 파이썬 sum과 같은 순차 합산 (distribute_pool의 tax_collected와 맞춤)
+    return amounts, sum(tax.tolist())
+
+
+class PopulationSimulation:
+    """Phase 1 경제(시장 풀/Treasury/영향력 계급/지니)의 배열 기반 mock 엔진"""
+
+    def __init__(self, config_path: str, size: Optional[int] = None):
+        with open(config_path, "r", encoding="utf-8") as f:
+            self.config = yaml.safe_load(f)
+
+        sim_cfg = self.config["simulation"]
+        game_cfg = self.config.get("game_mode", {})
+        market_cfg = self.config.get("market", {})
+        treasury_cfg = self.config.get("treasury", {})
+        pop_cfg = self.config["population"] = self.config.get("population") or {}
+
+        if game_cfg.get("phase", 1) != 1:
+            raise ValueError("PopulationSimulation supports phase 1 configs only")
+
+        self.name = sim_cfg.get("name", "white_room")
+        self.total_epochs = sim_cfg.get("total_epochs", 50)
+        seed = sim_cfg.get("random_seed")
+        if seed is None:
+            seed = random.SystemRandom().randrange(2 ** 32)
+            sim_cfg["random_seed"] = seed
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+
+        self.energy_frozen = game_cfg.get("energy_frozen", True)
+        self.log_distribution = pop_cfg.get("log_distribution", True)
+
+        # 에이전트 — config agents를 템플릿으로 순환 복제
+        templates = self.config["agents"]
+        self.size = size or pop_cfg.get("size") or len(templates)
+        pop_cfg["size"] = self.size
+        scale = math.ceil(self.size / len(templates))
+        chosen = [templates[i % len(templates)] for i in range(self.size)]
+        if self.size == len(templates):
+            self.agent_ids = [t["id"] for t in templates]
+        else:
+            width = len(str(scale * len(templates)))
+            seen: dict[str, int] = {}
+            self.agent_ids = []
+            for t in chosen:
+                seen[t["persona"]] = seen.get(t["persona"], 0) + 1
+                self.agent_ids.append(f"{t['persona']}_{seen[t['persona']]:0{width}d}")
+        self.personas = np.array([t["persona"] for t in chosen])
+        # 페르소나는 run 동안 불변 — 규칙 분기 마스크를 한 번만 계산
+        self._merchant = self.personas == "merchant"
+        self._jester = self.personas == "jester"
+        self._observer = self.personas == "observer"
+        self._speaker = np.isin(self.personas, SPEAKER_PERSONAS)
+        self._rule_free = ~(self._merchant | self._jester | self._observer | self._speaker)
+
+        # 공간 — 수용량은 복제 배율만큼
+        spaces = self.config.get("spaces", PHASE1_DEFAULT_SPACES)
+        self.locations = list(spaces)
+        if "market" not in self.locations:
+            raise ValueError("PopulationSimulation requires a 'market' space")
+        self.market = self.locations.index("market")
+        self.capacity = np.array(
+            [spaces[name].get("capacity", 12) * scale for name in self.locations], dtype=np.int64,
+        )
+        self.is_alley = np.array([name in ALLEY_LOCATIONS for name in self.locations])
+
+        # 상태 배열
+        self.energy = np.array([t.get("energy", 100) for t in chosen], dtype=np.int64)
+        self.influence = np.array([t.get("influence", 0) for t in chosen], dtype=np.int64)
+        self.location = np.array(
+            [self.locations.index(t.get("home", "plaza")) for t in chosen], dtype=np.int64,
+        )
+
+        # 시스템
+        self.spawn_per_epoch = market_cfg.get("spawn_per_epoch", 25)
+        self.min_presence_reward = market_cfg.get("min_presence_reward", 2)
+        self.tax_rate = market_cfg.get("default_tax_rate", 0.1)
+        self.treasury = Treasury(
+            initial=treasury_cfg.get("initial", 0),
+            overflow_threshold=treasury_cfg.get("overflow_threshold", 100),
+        )
+        influence_system = InfluenceSystem()
+        # support 에너지 ×1.5 계급(elder)의 하한
+        self.elder_min = next(t["min"] for t in influence_system.tiers if t["name"] == "elder")
+
+        project_root = Path(__file__).parent.parent.parent
+        log_cfg = self.config.get("logging", {}) or {}
+        self.logger = SimulationLogger(
+            base_dir=str(project_root / "logs"),
+            run_name=f"{self.name}_population",
+            mode=log_cfg.get("mode", "direct"),
+            flush_every=log_cfg.get("flush_every", 256),
+            flush_interval=log_cfg.get("flush_interval", 1.0),
+            blob_compression=None,
+        )
+        self.logger.save_config(self.config)
+
+    def reseed(self, seed: int):
+        """CLI 시드 오버라이드 — config_snapshot에도 반영"""
+        self.seed = seed
+        self.config["simulation"]["random_seed"] = seed
+        self.rng = np.random.default_rng(seed)
+        self.logger.save_config(self.config)
+
+    def run(self):
+        print(f"=== {self.name} 인구 시뮬레이션 시작 (Phase 1, vectorized) ===")
+        print(f"Epochs: {self.total_epochs}, Agents: {self.size}, Energy frozen: {self.energy_frozen}")
+        print(f"Log directory: {self.logger.run_dir}")
+        print()
+        try:
+            for epoch in range(1, self.total_epochs + 1):
+                self.run_epoch(epoch)
+        finally:
+            self.logger.close()
+
+    def run_epoch(self, epoch: int):
+        action, target = self.decide()
+        trades = self.apply(action, target)
+
+        at_market = self.location == self.market
+        amounts, tax_collected = distribute_pool_array(
+            trades, at_market, self.spawn_per_epoch, self.min_presence_reward, self.tax_rate,
+        )
+        if not self.energy_frozen:
+            self.energy = np.minimum(self.energy + amounts, MAX_ENERGY)
+        self.treasury.collect_tax(tax_collected)
+        overflow = self.treasury.check_overflow()
+
+        self.logger.log_epoch_summary(
+            epoch=epoch,
+            agent_count=self.size,
+            energy_values=self.energy.tolist(),
+            transaction_count=int(trades.sum()),
+            treasury=self.treasury.balance,
+            billboard=None,
+            gini=float(gini_batch(self.energy)),
+            extra={
+                "market_distribution": self._distribution_entry(at_market, trades, amounts, tax_collected),
+                "shadow_mode": self.energy_frozen,
+                "treasury_overflow": overflow,
+                "scheduling": "vectorized",
+                "llm_usage": {},  # LLM 호출 없음 — WhiteRoomSimulation 요약과 같은 스키마
+            },
+        )
+
+    def _distribution_entry(self, at_market, trades, amounts, tax_collected) -> dict:
+        """distribute_pool 반환값과 같은 모양 (비거래자 먼저, 거래자 나중)"""
+        entry = {"distribution": {}, "total_pool": self.spawn_per_epoch, "tax_collected": tax_collected, "trades": {}}
+        if self.log_distribution:
+            ids = self.agent_ids
+            for mask in (at_market & (trades == 0), at_market & (trades > 0)):
+                for i in np.flatnonzero(mask).tolist():
+                    entry["distribution"][ids[i]] = int(amounts[i])
+            entry["trades"] = {ids[i]: int(trades[i]) for i in np.flatnonzero(trades).tolist()}
+        return entry
+
+    # --- 정책 샘플링 ---
+
+    def decide(self) -> tuple[np.ndarray, np.ndarray]:
+        """에폭 시작 스냅샷에서 전원의 (행동 코드, 대상) — 대상은 support/whisper면 에이전트, move면 장소"""
+        n = self.size
+        loc = self.location
+        counts = np.bincount(loc, minlength=len(self.locations))
+        has_others = counts[loc] > 1
+        at_market = loc == self.market
+        in_alley = self.is_alley[loc]
+        gate = self.rng.random(n)  # 페르소나 분기용 난수 (jester 귓속말 / observer 관망)
+
+        action = np.full(n, IDLE, dtype=np.int64)
+        target = np.full(n, NO_TARGET, dtype=np.int64)
+
+        merchant = self._merchant
+        action[merchant & ~at_market] = MOVE
+        target[merchant & ~at_market] = self.market
+        action[merchant & at_market] = TRADE
+
+        jester = self._jester
+        action[jester] = SPEAK
+        action[jester & in_alley & (gate < 0.5) & has_others] = WHISPER
+
+        action[self._speaker] = SPEAK
+
+        default = self._rule_free | (self._observer & (gate >= 0.7))
+        idx = np.flatnonzero(default)
+        if len(idx):
+            weights = np.tile(DEFAULT_WEIGHTS, (len(idx), 1))
+            weights[~at_market[idx], TRADE] = 0
+            weights[~in_alley[idx], WHISPER] = 0
+            cumulative = weights.cumsum(axis=1)
+            draw = self.rng.random(len(idx)) * cumulative[:, -1]
+            action[idx] = (draw[:, None] < cumulative).argmax(axis=1)
+
+        movers = np.flatnonzero((action == MOVE) & default)
+        if len(movers):
+            # 현재 위치를 뺀 나머지 장소 중 균등
+            k = self.rng.integers(0, len(self.locations) - 1, size=len(movers))
+            target[movers] = k + (k >= loc[movers])
+
+        pickers = np.flatnonzero(((action == SUPPORT) | (action == WHISPER)) & has_others)
+        if len(pickers):
+            target[pickers] = self._pick_neighbours(pickers, loc, counts)
+        return action, target
+
+    def _pick_neighbours(self, pickers: np.ndarray, loc: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """같은 장소의 다른 에이전트 중 균등 선택 (자기 자신 제외)"""
+        order = np.argsort(loc, kind="stable")
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        position = np.empty(self.size, dtype=np.int64)
+        position[order] = np.arange(self.size) - starts[loc[order]]
+        group = loc[pickers]
+        r = (self.rng.random(len(pickers)) * (counts[group] - 1)).astype(np.int64)
+        r += r >= position[pickers]
+        return order[starts[group] + r]
+
+    # --- 효과 적용 ---
+
+    def apply(self, action: np.ndarray, target: np.ndarray) -> np.ndarray:
+        """행동 효과 적용 — 에이전트별 거래 횟수 반환"""
+        targeted = (action == SUPPORT) | (action == WHISPER)
+        succeeded = ~targeted | (target != NO_TARGET)
+        trades = (action == TRADE).astype(np.int64)
+
+        if not self.energy_frozen:
+            cost = np.where(succeeded, ACTION_COSTS[action], 0)
+            # spend_energy: 잔량이 부족하면 차감하지 않음
+            spend = np.where(self.energy >= cost, cost, 0)
+            gain = np.zeros(self.size, dtype=np.int64)
+            gain[(action == SPEAK) & self.is_alley[self.location]] += 1
+            gain[action == TRADE] += int(4 - 4 * self.tax_rate)
+            givers = np.flatnonzero((action == SUPPORT) & succeeded)
+            if len(givers):
+                gift = np.where(self.influence[givers] >= self.elder_min, 3, 2)
+                receivers = target[givers]
+                np.add.at(gain, receivers, gift)
+                np.add.at(self.influence, receivers, 1)
+            self.energy = np.minimum(self.energy - spend + gain, MAX_ENERGY)
+
+        self._move(np.flatnonzero(action == MOVE), target)
+        return trades
+
+    def _move(self, movers: np.ndarray, target: np.ndarray):
+        """수용량 안에서 무작위 순서로 입장 — 1라운드 거절자는 떠난 자리로 2라운드 재시도"""
+        movers = movers[target[movers] != self.location[movers]]
+        for _ in range(2):
+            if not len(movers):
+                return
+            counts = np.bincount(self.location, minlength=len(self.locations))
+            free = np.maximum(self.capacity - counts, 0)
+            movers = self.rng.permutation(movers)
+            dest = target[movers]
+            order = np.argsort(dest, kind="stable")
+            rank = np.empty(len(movers), dtype=np.int64)
+            starts = np.searchsorted(dest[order], dest[order])
+            rank[order] = np.arange(len(movers)) - starts
+            admitted = rank < free[dest]
+            self.location[movers[admitted]] = dest[admitted]
+            movers = movers[~admitted]
@@ -1,33 +1,47 @@
 """White Room Simulation — Phase 1 (Empty Agora) + Phase 2 (Enriched Neutral)"""
 
+import asyncio
 import random
 import yaml
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
-from engine.adapters import create_adapter, BaseLLMAdapter, LLMResponse
-from engine.core.logger import SimulationLogger, calculate_gini
+from engine.adapters import (
+    create_adapter, BaseLLMAdapter, LLMResponse, MockAdapter, Observation,
+    aclose_clients, release_clients,
+    CachedAdapter, ResponseCache, RateGovernor, RetryingAdapter, RetryPolicy,
+    OllamaScheduler,
+)
+from engine.core.logger import SimulationLogger, percentiles
+from engine.core.inequality import GiniTracker
+from engine.core.rng import RngTree
 
 from .agent import Agent, create_agents_from_config
 from .actions import (
-    can_perform_action, get_action_cost, speak_reward,
+    can_perform_action, get_action_cost, get_available_actions, speak_reward,
     ActionType, ALLEY_LOCATIONS, ARCHITECT_ACTIONS,
 )
 from .context import (
     build_context_phase1, build_context_phase2,
-    build_system_prompt_v03, build_turn_prompt_v03,
+    build_system_prompt_v03, build_turn_prompt_v03, precompile_prompts,
+    build_system_prompt_phase1, build_system_prompt_phase2, PROMPT_LAYOUTS,
 )
 from .personas import get_constraint_level
 from .environment import Environment
 from .history import HistoryEngine
+from .checkpoint import load_checkpoint, restore, save_checkpoint
+from .events import EventLog, EVENT_SCOPES
 from .systems.market import MarketPool, Treasury
 from .systems.influence import InfluenceSystem
 from .systems.support import SupportTracker
 from .systems.whisper import WhisperSystem
-from .systems.architect import ArchitectSystem
+from .systems.architect import ArchitectSystem, subsidy_amount
 
 # Phase 2 action validation — speak/trade/rest/move only
 PHASE2_VALID_ACTIONS = {"speak", "trade", "rest", "move"}
+PHASE2_ACTION_ORDER = ("speak", "trade", "rest", "move")  # 관찰의 행동 목록 순서 (프롬프트와 같음)
 
 
 def _can_perform_action_phase2(action_str: str, location: str) -> bool:
@@ -44,9 +58,92 @@ def _is_valid_phase2_action(action_str: str) -> bool:
     return action_str in PHASE2_VALID_ACTIONS
 
 
+def _classify_turn_error(response: LLMResponse) -> str:
+    """v0.3 에러 분류 — timeout / parse_error"""
+    if response.error_type == "timeout":
+        return "timeout"
+    error_str = (response.error or "").lower()
+    if "시간 초과" in error_str or "timeout" in error_str:
+        return "timeout"
+    return "parse_error"
+
+
+# config에 spaces가 없을 때의 기본 공간 — Phase 2는 3곳 (plaza/market/alley)
+PHASE1_DEFAULT_SPACES = {
+    "plaza": {"capacity": 12, "visibility": "public"},
+    "market": {"capacity": 12, "visibility": "public"},
+    "alley_a": {"capacity": 4, "visibility": "members_only"},
+    "alley_b": {"capacity": 4, "visibility": "members_only"},
+    "alley_c": {"capacity": 4, "visibility": "members_only"},
+}
+PHASE2_DEFAULT_SPACES = {
+    "plaza": {"capacity": 10, "visibility": "public"},
+    "market": {"capacity": 10, "visibility": "public"},
+    "alley": {"capacity": 10, "visibility": "members_only"},
+}
+
+# 에폭 스케줄링 모드
+#   sequential   — 셔플 순서대로 프롬프트 생성 → 호출 → 적용 (기본값)
+#   simultaneous — 동일 스냅샷에서 전원 프롬프트 생성, 동시 호출, 셔플 순서로 적용
+SCHEDULING_MODES = ("sequential", "simultaneous")
+
+# simultaneous 모드의 동시 호출 실행기
+#   thread  — bounded ThreadPoolExecutor로 adapter.generate 호출
+#   asyncio — 단일 이벤트 루프에서 adapter.agenerate 호출
+EXECUTORS = ("thread", "asyncio")
+
+
+@dataclass
+class PendingTurn:
+    """프롬프트 생성(prepare) → LLM 호출(request) → 적용(apply) 사이의 턴 상태"""
+    agent: Agent
+    prompt: Optional[str]
+    system_prompt: Optional[str] = None
+    observation: Optional[Observation] = None  # 관찰로 결정하는 어댑터(mock)용 구조화 관찰
+    response: Optional[LLMResponse] = None
+    retried: bool = False
+    error_type: Optional[str] = None
+
+
+def _usage_log_fields(response: LLMResponse) -> dict:
+    """행동 로그용 지연/토큰/재시도 필드 (스트리밍 지표는 값이 있을 때만)"""
+    fields = {
+        "latency_ms": response.latency_ms,
+        "retries": response.retries,
+        "input_tokens": response.input_tokens,
+        "output_tokens": response.output_tokens,
+        "cached_tokens": response.cached_tokens,
+    }
+    if response.ttft_ms is not None:
+        fields["ttft_ms"] = response.ttft_ms
+    if response.time_to_action_ms is not None:
+        fields["time_to_action_ms"] = response.time_to_action_ms
+        fields["tokens_saved"] = response.tokens_saved
+    return fields
+
+
+def _summarize_usage(responses: list[LLMResponse]) -> dict:
+    """한 모델의 에폭 호출 — 지연/TTFT/토큰 백분위 + 토큰 합계 (값을 준 응답만 집계)"""
+
+    def present(name: str) -> list:
+        return [v for v in (getattr(r, name) for r in responses) if v is not None]
+
+    tokens = {name: present(f"{name}_tokens") for name in ("input", "output", "cached")}
+    return {
+        "calls": len(responses),
+        "retries": sum(r.retries for r in responses),
+        "latency_ms": percentiles(present("latency_ms")),
+        "ttft_ms": percentiles(present("ttft_ms")),
+        "input_tokens": percentiles(tokens["input"]),
+        "output_tokens": percentiles(tokens["output"]),
+        "token_totals": {name: sum(values) if values else None for name, values in tokens.items()},
+    }
+
+
 class WhiteRoomSimulation:
 
-    def __init__(self, config_path: str):
+    def __init__(self, config_path: str, run_dir: Optional[str] = None):
+        """run_dir: 기존 run 디렉토리에 이어 쓰기 (resume()에서 사용)"""
         with open(config_path, "r", encoding="utf-8") as f:
             self.config = yaml.safe_load(f)
 
@@ -61,8 +158,37 @@ class WhiteRoomSimulation:
         self.total_epochs = sim_cfg.get("total_epochs", 50)
         self.language = sim_cfg.get("language", "ko")
         seed = sim_cfg.get("random_seed")
-        if seed is not None:
-            random.seed(seed)
+        if seed is None:
+            # 시드 미지정 run도 config_snapshot에 실제 시드를 남겨 replay로 재현 가능하게
+            seed = random.SystemRandom().randrange(2 ** 32)
+            sim_cfg["random_seed"] = seed
+        self.seed = seed
+        # run별 RNG 트리 — 스케줄러/시스템/에이전트마다 독립 스트림이라
+        # 동시 실행 순서가 바뀌어도 같은 시드면 같은 로그
+        self.rng = RngTree(seed)
+
+        # Epoch scheduling (sequential / simultaneous)
+        self.scheduling = sim_cfg.get("scheduling", "sequential")
+        if self.scheduling not in SCHEDULING_MODES:
+            raise ValueError(
+                f"Unknown scheduling mode: {self.scheduling}. "
+                f"Available: {list(SCHEDULING_MODES)}"
+            )
+        self.max_workers = sim_cfg.get("max_workers")
+        self.executor = sim_cfg.get("executor", "thread")
+        if self.executor not in EXECUTORS:
+            raise ValueError(
+                f"Unknown executor: {self.executor}. Available: {list(EXECUTORS)}"
+            )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # 프롬프트 레이아웃 — stable_prefix: 불변 내용을 system 프롬프트로 (프로바이더 프롬프트 캐시용)
+        self.prompt_layout = sim_cfg.get("prompt_layout", "standard")
+        if self.prompt_layout not in PROMPT_LAYOUTS:
+            raise ValueError(
+                f"Unknown prompt layout: {self.prompt_layout}. Available: {list(PROMPT_LAYOUTS)}"
+            )
+        # headless — 프롬프트 렌더링 없이 구조화 관찰만 어댑터에 전달 (mock 대규모 규칙 테스트용)
+        self.headless = sim_cfg.get("headless", False)
 
         # Game mode flags
         self.phase = game_cfg.get("phase", 1)
@@ -83,36 +209,32 @@ class WhiteRoomSimulation:
         # Agents
         self.agents: list[Agent] = create_agents_from_config(self.config["agents"])
         self.agents_by_id: dict[str, Agent] = {a.id: a for a in self.agents}
+        # 에너지 변경 시 증분 갱신되는 지니 (턴마다 전체 재정렬 없음)
+        self.gini_tracker = GiniTracker(a.energy for a in self.agents)
+        for agent in self.agents:
+            agent.add_energy_listener(self._on_energy_change)
+
+        # LLM response cache (off / record / replay)
+        self.cache_mode = "off"
+        self.response_cache: Optional[ResponseCache] = None
+        self._open_response_cache((self.config.get("llm_cache", {}) or {}).get("mode", "off"))
+
+        # Per-provider rate limits / concurrency ceilings
+        self.rate_governor = RateGovernor(self.config.get("rate_limits"))
+        # 한 Ollama 서버를 여러 모델이 공유할 때 같은 모델 요청끼리 묶어 가중치 스왑 최소화
+        scheduler_cfg = self.config.get("ollama_scheduler")
+        self.ollama_scheduler = OllamaScheduler(scheduler_cfg) if scheduler_cfg else None
+        # 에러 클래스별 재시도 예산 + 지터 백오프 (지터 RNG는 run 시드에서 파생)
+        self.retry_policy = RetryPolicy.from_config(self.config.get("retry"), seed=self.seed)
 
         # Adapters
-        default_adapter_type = self.config.get("default_adapter", "mock")
-        default_model = self.config.get("default_model", "mock")
         self.adapters: dict[str, BaseLLMAdapter] = {}
         for agent in self.agents:
-            adapter_type = agent.adapter_type or default_adapter_type
-            model = agent.model or default_model
-            self.adapters[agent.id] = create_adapter(
-                adapter_type,
-                model=model,
-                persona=agent.persona,
-                agent_id=agent.id,
-            )
+            self.adapters[agent.id] = self._build_adapter(agent)
+        self._check_headless()
 
         # Environment — Phase 2 uses 3 spaces (plaza/market/alley)
-        if self.phase == 2:
-            default_spaces = {
-                "plaza": {"capacity": 10, "visibility": "public"},
-                "market": {"capacity": 10, "visibility": "public"},
-                "alley": {"capacity": 10, "visibility": "members_only"},
-            }
-        else:
-            default_spaces = {
-                "plaza": {"capacity": 12, "visibility": "public"},
-                "market": {"capacity": 12, "visibility": "public"},
-                "alley_a": {"capacity": 4, "visibility": "members_only"},
-                "alley_b": {"capacity": 4, "visibility": "members_only"},
-                "alley_c": {"capacity": 4, "visibility": "members_only"},
-            }
+        default_spaces = PHASE2_DEFAULT_SPACES if self.phase == 2 else PHASE1_DEFAULT_SPACES
         self.environment = Environment(self.config.get("spaces", default_spaces))
         self.environment.tax_rate = market_cfg.get("default_tax_rate", 0.1)
 
@@ -135,23 +257,44 @@ class WhiteRoomSimulation:
             base_leak_prob=whisper_cfg.get("base_leak_probability", 0.15),
             observer_bonus=whisper_cfg.get("observer_bonus", 0.35),
             enabled=self.whisper_leak_enabled if self.phase != 2 else False,
+            rng=self.rng.stream("whisper"),
         )
         self.architect_system = ArchitectSystem()
         self.history = HistoryEngine()
 
         # Logger — 프로젝트 루트의 logs/ 디렉토리 사용
         project_root = Path(__file__).parent.parent.parent
+        log_cfg = self.config.get("logging", {}) or {}
         self.logger = SimulationLogger(
             base_dir=str(project_root / "logs"),
             run_name=self.name,
+            mode=log_cfg.get("mode", "direct"),
+            flush_every=log_cfg.get("flush_every", 256),
+            flush_interval=log_cfg.get("flush_interval", 1.0),
+            # blob_store: true면 프롬프트/원문 응답을 run별 블롭 팩에 한 번만 저장하고 로그 행은 해시 참조 (기본은 인라인)
+            blob_compression=log_cfg.get("blob_compression", "gzip") if log_cfg.get("blob_store", False) else None,
+            run_dir=run_dir,
         )
         self.logger.save_config(self.config)
-
-        # Action log (for recent events in prompts)
-        self.action_log: list[dict] = []
+        # 에폭 체크포인트 주기 (0 = 끔) + 재개 시작 에폭
+        self.checkpoint_every = log_cfg.get("checkpoint_every", 1)
+        self.start_epoch = 1
+
+        # Recent events for prompts — 전역/장소별/에이전트별 링 버퍼 (전체 기록은 JSONL 로그)
+        events_cfg = self.config.get("events", {}) or {}
+        self.event_scope = events_cfg.get("scope", "global")
+        if self.event_scope not in EVENT_SCOPES:
+            raise ValueError(
+                f"Unknown event scope: {self.event_scope}. Available: {list(EVENT_SCOPES)}"
+            )
+        self.event_log = EventLog(depth=events_cfg.get("depth", 10))
+        # list 호환 뷰 (len = 전체 사건 수, 인덱스는 최근 depth개만)
+        self.action_log = self.event_log.view()
         self.epoch_trade_count = 0
+        # 에폭 동안 받은 응답 (모델별) — 에폭 요약의 llm_usage 백분위용
+        self._epoch_usage: dict[str, list[LLMResponse]] = {}
 
-        # v0.3 system prompt cache (에이전트별, run 동안 불변)
+        # System prompt cache (에이전트별, run 동안 불변) — v0.3 또는 stable_prefix 레이아웃
         self._system_prompts: dict[str, str] = {}
         if self.use_v03 and self.phase == 2:
             for agent in self.agents:
@@ -161,6 +304,125 @@ class WhiteRoomSimulation:
                     agent_name=agent.id,
                     lang=self.language,
                 )
+        elif self.prompt_layout == "stable_prefix":
+            for agent in self.agents:
+                if self.phase == 2:
+                    self._system_prompts[agent.id] = build_system_prompt_phase2(
+                        agent.id, agent.persona, self.persona_on, self.language,
+                    )
+                else:
+                    self._system_prompts[agent.id] = build_system_prompt_phase1(
+                        agent.id, agent.persona, self.language,
+                    )
+
+        # 턴 프롬프트 정적 구간 (페르소나/위치/행동 목록) 사전 컴파일
+        precompile_prompts(
+            agents=[(a.id, a.persona) for a in self.agents],
+            locations=list(self.environment.spaces),
+            phase=self.phase,
+            lang=self.language,
+            persona_on=self.persona_on,
+            v03=self.use_v03 and self.phase == 2,
+            layout=self.prompt_layout,
+        )
+
+    def _build_adapter(
+        self, agent: Agent,
+        adapter_type: Optional[str] = None, model: Optional[str] = None,
+    ) -> BaseLLMAdapter:
+        """에이전트 어댑터 생성 — Cached(Retrying(Scheduled(Governed(adapter)))) 순으로 감쌈"""
+        adapter_type = adapter_type or agent.adapter_type or self.config.get("default_adapter", "mock")
+        model = model or agent.model or self.config.get("default_model", "mock")
+        # 공용 어댑터 옵션 (pool_size, timeout, base_url 등)
+        adapter_options = self.config.get("adapter_options", {}) or {}
+        adapter = create_adapter(
+            adapter_type,
+            model=model,
+            persona=agent.persona,
+            agent_id=agent.id,
+            **adapter_options,
+        )
+        if isinstance(adapter, MockAdapter):
+            adapter.rng = self.rng.stream("agent", agent.id)
+        # 재시도마다 거버너를 다시 거치고, 캐시 히트는 둘 다 건너뛰도록 캐시가 가장 바깥
+        adapter = self.rate_governor.wrap(adapter, adapter_type)
+        # 모델 대기는 거버너 슬롯을 잡기 전에 (다른 모델 대기 중 슬롯 점유 → 교착 방지)
+        if self.ollama_scheduler is not None:
+            adapter = self.ollama_scheduler.wrap(adapter, adapter_type)
+        adapter = RetryingAdapter(adapter, self.retry_policy)
+        if self.response_cache is not None and self.cache_mode != "off":
+            adapter = CachedAdapter(adapter, self.response_cache, self.cache_mode)
+        return adapter
+
+    def _check_headless(self):
+        """headless 모드는 관찰로 결정하는 어댑터(mock)만 허용"""
+        if not self.headless:
+            return
+        unsupported = sorted({a.name for a in self.adapters.values() if not a.supports_observation})
+        if unsupported:
+            raise ValueError(f"headless mode requires observation-capable adapters (mock), got: {unsupported}")
+
+    def _open_response_cache(self, mode):
+        # YAML 1.1은 따옴표 없는 off를 False로 읽음
+        mode = mode or "off"
+        cache_cfg = self.config.get("llm_cache") or {}
+        self.config["llm_cache"] = cache_cfg
+        cache_cfg["mode"] = mode
+        self.cache_mode = mode
+        if mode == "off" or self.response_cache is not None:
+            return
+        cache_path = Path(cache_cfg.get("path", "logs/llm_cache.sqlite"))
+        if not cache_path.is_absolute():
+            cache_path = Path(__file__).parent.parent.parent / cache_path
+        max_mb = cache_cfg.get("max_mb")
+        self.response_cache = ResponseCache(
+            str(cache_path),
+            max_bytes=int(max_mb * 1024 * 1024) if max_mb else None,
+        )
+
+    def set_cache_mode(self, mode: str):
+        """CLI 오버라이드 — 캐시 모드 변경 후 어댑터 재구성"""
+        self._open_response_cache(mode)
+        for agent_id, adapter in self.adapters.items():
+            if isinstance(adapter, CachedAdapter):
+                adapter = adapter.inner
+            if self.response_cache is not None:
+                adapter = CachedAdapter(adapter, self.response_cache, mode)
+            self.adapters[agent_id] = adapter
+        self.logger.save_config(self.config)
+
+    def rebuild_adapters(self, adapter_type: str, model: Optional[str] = None):
+        """CLI 오버라이드 — 전 에이전트 어댑터를 지정 타입/모델로 재생성
+
+        재개 시 같은 어댑터로 이어가도록 config_snapshot에 기록
+        """
+        for agent in self.agents:
+            self.adapters[agent.id] = self._build_adapter(agent, adapter_type, model)
+        self._check_headless()
+        self.config["adapter_override"] = {"adapter_type": adapter_type, "model": model}
+        self.logger.save_config(self.config)
+
+    @classmethod
+    def resume(cls, run_dir: str) -> "WhiteRoomSimulation":
+        """마지막 체크포인트부터 이어서 실행할 시뮬레이션 (같은 run 디렉토리/로그 파일)"""
+        run_dir = Path(run_dir)
+        state = load_checkpoint(run_dir)
+        if state is None:
+            raise FileNotFoundError(f"No checkpoint in {run_dir}")
+        sim = cls(str(run_dir / "config_snapshot.json"), run_dir=str(run_dir))
+        override = sim.config.get("adapter_override")
+        if override:
+            sim.rebuild_adapters(**override)
+        restore(sim, state)
+        return sim
+
+    def reseed(self, seed: int):
+        """CLI 시드 오버라이드 — config_snapshot에도 반영"""
+        self.seed = seed
+        self.config["simulation"]["random_seed"] = seed
+        self.rng.reseed(seed)
+        self.retry_policy.reseed(seed)
+        self.logger.save_config(self.config)
 
     def run(self):
         phase_label = f"Phase {self.phase}"
@@ -170,15 +432,18 @@ class WhiteRoomSimulation:
             print(f"Energy frozen: {self.energy_frozen}, Market shadow: {self.market_shadow}")
         else:
             print(f"Persona: {'ON' if self.persona_on else 'OFF'}, Neutral actions: {self.neutral_actions}")
-        print(f"Agents: {len(self.agents)}")
+        print(f"Agents: {len(self.agents)}, Scheduling: {self.scheduling}")
         print(f"Log directory: {self.logger.run_dir}")
         print()
 
-        # v0.3: run_meta.json 저장
-        if self.use_v03:
+        if self.start_epoch > 1:
+            print(f"Resuming from epoch {self.start_epoch}")
+
+        # v0.3: run_meta.json 저장 (재개 시에는 처음 기록한 메타 유지)
+        if self.use_v03 and self.start_epoch == 1:
             from datetime import datetime
             self._run_start_time = datetime.now().isoformat()
-            self.logger.save_run_meta({
+            run_meta = {
                 "run_id": self.run_id,
                 "phase": self.phase,
                 "condition": self.condition,
@@ -196,27 +461,47 @@ class WhiteRoomSimulation:
                 "initial_locations": {
                     a.id: a.home for a in self.agents
                 },
-                "system_prompts": self._system_prompts,
+            }
+            self.logger.attach_text(run_meta, "system_prompts", self._system_prompts)
+            run_meta.update({
                 "prompt_version": "v0.3",
+                "scheduling": self.scheduling,
                 "start_time": self._run_start_time,
             })
+            self.logger.save_run_meta(run_meta)
 
-        for epoch in range(1, self.total_epochs + 1):
-            self.run_epoch(epoch)
+        try:
+            for epoch in range(self.start_epoch, self.total_epochs + 1):
+                self.run_epoch(epoch)
+                if self.checkpoint_every and (
+                    epoch % self.checkpoint_every == 0 or epoch == self.total_epochs
+                ):
+                    save_checkpoint(self, epoch)
+        finally:
+            # 크래시 시에도 writer 큐에 남은 로그를 디스크에 반영
+            self.logger.close()
 
         self._finalize()
 
     def run_epoch(self, epoch: int):
         print(f"--- Epoch {epoch}/{self.total_epochs} ---")
         self.epoch_trade_count = 0
+        self._epoch_usage = {}
         self.logger.reset_turn_counter()
 
         # Shuffle agent order each epoch
         agents = list(self.agents)
-        random.shuffle(agents)
-
-        for agent in agents:
-            self._execute_agent_turn(agent, epoch)
+        self.rng.stream("scheduler").shuffle(agents)
+
+        if self.scheduling == "simultaneous":
+            # 동일 월드 스냅샷에서 전원의 프롬프트를 먼저 만든 뒤 동시 호출
+            pending = [self._prepare_turn(agent, epoch) for agent in agents]
+            self._request_turns(pending)
+            for turn in pending:
+                self._apply_turn(turn, epoch)
+        else:
+            for agent in agents:
+                self._execute_agent_turn(agent, epoch)
 
         if self.phase == 2:
             # Phase 2: no market distribution, no treasury, no billboard
@@ -230,6 +515,8 @@ class WhiteRoomSimulation:
                     "phase": 2,
                     "persona_on": self.persona_on,
                     "neutral_actions": self.neutral_actions,
+                    "scheduling": self.scheduling,
+                    **self._epoch_runtime_stats(),
                 },
             )
             return
@@ -263,25 +550,140 @@ class WhiteRoomSimulation:
             transaction_count=self.epoch_trade_count,
             treasury=self.treasury.balance,
             billboard=self.environment.get_billboard(),
+            gini=self.gini_tracker.gini,
             extra={
                 "market_distribution": distribution,
                 "shadow_mode": self.energy_frozen,
                 "treasury_overflow": overflow,
+                "scheduling": self.scheduling,
+                **self._epoch_runtime_stats(),
             },
         )
 
+    def _on_energy_change(self, agent: Agent, old: int, new: int):
+        self.gini_tracker.update(old, new)
+
+    def _epoch_runtime_stats(self) -> dict:
+        """에폭 요약에 덧붙일 런타임 지표 (캐시 hit/miss, 레이트 리밋 대기 등)"""
+        stats = {}
+        if self.response_cache is not None and self.cache_mode != "off":
+            stats["llm_cache"] = {"mode": self.cache_mode, **self.response_cache.take_stats()}
+        rate_stats = self.rate_governor.take_stats()
+        if rate_stats:
+            stats["rate_limits"] = rate_stats
+        if self.ollama_scheduler is not None:
+            scheduler_stats = self.ollama_scheduler.take_stats()
+            if scheduler_stats:
+                stats["ollama_scheduler"] = scheduler_stats
+        stats["llm_usage"] = {
+            model: _summarize_usage(responses) for model, responses in self._epoch_usage.items()
+        }
+        return stats
+
     def _execute_agent_turn(self, agent: Agent, epoch: int):
+        turn = self._prepare_turn(agent, epoch)
+        self._request_turn(turn)
+        self._apply_turn(turn, epoch)
+
+    def _prepare_turn(self, agent: Agent, epoch: int) -> PendingTurn:
+        """현재 월드 상태로 프롬프트 생성 (headless면 관찰만)
+
+        관찰로 결정하는 어댑터(mock)는 headless 여부와 무관하게 항상 관찰로 결정한다.
+        프롬프트는 로그용으로만 렌더링 — 그래서 같은 시드면 headless on/off 결과가 같다.
+        """
+        observation = None
+        if self.adapters[agent.id].supports_observation:
+            observation = self._build_observation(agent, epoch)
+        if self.headless:
+            return PendingTurn(agent=agent, prompt=None, observation=observation)
         if self.use_v03 and self.phase == 2:
-            return self._execute_agent_turn_v03(agent, epoch)
+            return PendingTurn(
+                agent=agent,
+                prompt=self._build_turn_prompt_v03(agent, epoch),
+                system_prompt=self._system_prompts.get(agent.id, ""),
+                observation=observation,
+            )
+        return PendingTurn(
+            agent=agent,
+            prompt=self._build_agent_context(agent, epoch),
+            system_prompt=self._system_prompts.get(agent.id),
+            observation=observation,
+        )
 
-        resources_before = agent.resource_snapshot()
+    def _request_turn(self, turn: PendingTurn) -> PendingTurn:
+        """LLM 호출 — 월드 상태를 읽거나 변경하지 않음 (동시 호출 안전)"""
+        adapter = self.adapters[turn.agent.id]
+        if turn.observation is not None:
+            response = adapter.observe(turn.observation)
+        elif turn.system_prompt is None:
+            response = adapter.generate(turn.prompt, max_tokens=2000)
+        else:
+            response = adapter.generate(turn.prompt, max_tokens=2000, system_prompt=turn.system_prompt)
+        return self._finish_request(turn, response)
+
+    async def _arequest_turn(self, turn: PendingTurn, semaphore: asyncio.Semaphore) -> PendingTurn:
+        """_request_turn의 비동기 버전 (adapter.agenerate 사용)"""
+        async with semaphore:
+            adapter = self.adapters[turn.agent.id]
+            if turn.observation is not None:
+                response = adapter.observe(turn.observation)
+            elif turn.system_prompt is None:
+                response = await adapter.agenerate(turn.prompt, max_tokens=2000)
+            else:
+                response = await adapter.agenerate(
+                    turn.prompt, max_tokens=2000, system_prompt=turn.system_prompt,
+                )
+            return self._finish_request(turn, response)
 
-        # Build context
-        context = self._build_agent_context(agent, epoch)
+    @staticmethod
+    def _finish_request(turn: PendingTurn, response: LLMResponse) -> PendingTurn:
+        """재시도는 RetryingAdapter가 처리 — 최종 응답의 에러 분류만 기록 (v0.3 §5.2)"""
+        turn.response = response
+        turn.retried = len(response.attempts) > 1
+        if not response.success:
+            turn.error_type = _classify_turn_error(response)
+        return turn
+
+    def _request_turns(self, turns: list[PendingTurn]):
+        """simultaneous 모드 — 동시 호출 상한(max_workers) 안에서 LLM 호출 병렬 실행"""
+        if not turns:
+            return
+        if self.ollama_scheduler is not None:
+            # 요청 순서만 모델별로 묶음 (적용 순서는 호출자의 원래 순서 그대로)
+            turns = self._affinity_order(turns)
+        workers = min(self.max_workers or len(turns), len(turns))
+        if self.executor == "asyncio":
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self._arequest_all(turns, workers))
+            return
+        if workers <= 1:
+            for turn in turns:
+                self._request_turn(turn)
+            return
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="agent-turn") as pool:
+            list(pool.map(self._request_turn, turns))
+
+    def _affinity_order(self, turns: list[PendingTurn]) -> list[PendingTurn]:
+        """같은 모델 턴이 연달아 나가도록 안정 정렬 (모델은 처음 등장한 순서)"""
+        first_seen: dict[str, int] = {}
+        for turn in turns:
+            first_seen.setdefault(self.adapters[turn.agent.id].model, len(first_seen))
+        return sorted(turns, key=lambda turn: first_seen[self.adapters[turn.agent.id].model])
+
+    async def _arequest_all(self, turns: list[PendingTurn], workers: int):
+        semaphore = asyncio.Semaphore(workers)
+        await asyncio.gather(*(self._arequest_turn(turn, semaphore) for turn in turns))
+
+    def _apply_turn(self, turn: PendingTurn, epoch: int):
+        model = self.adapters[turn.agent.id].model
+        self._epoch_usage.setdefault(model, []).append(turn.response)
+        if self.use_v03 and self.phase == 2:
+            return self._apply_turn_v03(turn, epoch)
 
-        # Get LLM response
-        adapter = self.adapters[agent.id]
-        response = adapter.generate(context, max_tokens=2000)
+        agent = turn.agent
+        response = turn.response
+        resources_before = agent.resource_snapshot()
 
         # Execute action
         success, result = self._execute_action(agent, response, epoch)
@@ -293,12 +695,17 @@ class WhiteRoomSimulation:
         # Parse quality metrics (Theo §3: Shell Compatibility 언어 차원 데이터)
         log_extra["parse_success"] = response.success
         log_extra["raw_action"] = response.action
+        log_extra["attempts"] = response.attempts
+        log_extra.update(_usage_log_fields(response))
         if self.phase == 1:
             log_extra["shadow_mode"] = self.energy_frozen
             if "would_have_changed" in result:
                 log_extra["would_have_changed"] = result["would_have_changed"]
         if "leaked" in result:
             log_extra["leaked"] = result["leaked"]
+        if result.get("suspicion_targets"):
+            # 체크포인트 재개 시 의심 기록을 로그에서 재구성
+            log_extra["suspicion_targets"] = result["suspicion_targets"]
         if "new_rate" in result:
             log_extra["new_rate"] = result["new_rate"]
 
@@ -327,7 +734,7 @@ class WhiteRoomSimulation:
         )
 
         # Add to action log for recent events
-        self.action_log.append({
+        self.event_log.append({
             "epoch": epoch,
             "agent_id": agent.id,
             "persona": agent.persona,
@@ -339,12 +746,22 @@ class WhiteRoomSimulation:
             **{k: v for k, v in result.items() if k in ("leaked", "new_rate")},
         })
 
-    def _execute_agent_turn_v03(self, agent: Agent, epoch: int):
-        """v0.3 본실험 에이전트 턴 — System/Turn 분리, 에러 분류, 재시도"""
-        adapter = self.adapters[agent.id]
-        system_prompt = self._system_prompts.get(agent.id, "")
+    def _build_observation(self, agent: Agent, epoch: int) -> Observation:
+        """프롬프트에 렌더링될 결정 입력(위치/가능 행동/같은 장소 에이전트/이동지)을 구조체로"""
+        if self.phase == 2:
+            actions = [a for a in PHASE2_ACTION_ORDER if _can_perform_action_phase2(a, agent.location)]
+        else:
+            actions = [a.value for a in get_available_actions(agent.location, agent.persona)]
+        return Observation(
+            agent_id=agent.id,
+            location=agent.location,
+            turn=epoch,
+            available_actions=actions,
+            agents_here=[aid for aid in self.environment.get_agents_at(agent.location) if aid != agent.id],
+            move_locations=list(self.environment.spaces),
+        )
 
-        # Build turn prompt
+    def _build_turn_prompt_v03(self, agent: Agent, epoch: int) -> str:
         agent_ids_here = self.environment.get_agents_at(agent.location)
         agents_here = []
         for aid in agent_ids_here:
@@ -354,40 +771,31 @@ class WhiteRoomSimulation:
             if other:
                 agents_here.append({"id": aid, "persona": other.persona})
 
-        turn_prompt = build_turn_prompt_v03(
+        return build_turn_prompt_v03(
             agent_id=agent.id,
             location=agent.location,
             turn=epoch,
             agents_here=agents_here,
-            recent_events=self.action_log,
+            recent_events=self._recent_events_v03(agent),
             persona_on=self.persona_on,
             lang=self.language,
         )
 
-        # LLM 호출 + 재시도 로직
-        response = adapter.generate(turn_prompt, max_tokens=2000, system_prompt=system_prompt)
-        retried = False
+    def _apply_turn_v03(self, turn: PendingTurn, epoch: int):
+        """v0.3 본실험 에이전트 턴 — System/Turn 분리, 에러 분류, 재시도"""
+        agent = turn.agent
+        response = turn.response
+        turn_prompt = turn.prompt
+        retried = turn.retried
 
-        # 에러 분류 및 재시도 (v0.3 §5.2)
         if not response.success:
-            error_str = (response.error or "").lower()
-            if "시간 초과" in error_str or "timeout" in error_str:
-                error_type = "timeout"
-            else:
-                error_type = "parse_error"
-
-            # 재시도 1회
-            response = adapter.generate(turn_prompt, max_tokens=2000, system_prompt=system_prompt)
-            retried = True
-
-            if not response.success:
-                # 재시도 실패 — 최종 에러 기록
-                self._log_v03_action(
-                    agent, epoch, error_type, response, turn_prompt,
-                    success=False, result={}, retried=True,
-                )
-                self._append_action_log_v03(agent, epoch, error_type, response)
-                return
+            # 재시도 예산 소진 — 최종 에러 기록
+            self._log_v03_action(
+                agent, epoch, turn.error_type, response, turn_prompt,
+                success=False, result={}, retried=retried,
+            )
+            self._append_action_log_v03(agent, epoch, turn.error_type, response)
+            return
 
         # JSON 파싱 성공 — action 유효성 확인
         action = response.action
@@ -459,11 +867,13 @@ class WhiteRoomSimulation:
             "parse_success": response.success,
             "raw_action": response.action,
             "retried": retried,
-            "turn_prompt_sent": turn_prompt,
-            "response_raw": raw_text,
-            "resource_effect": result.get("resource_effect", 0),
-            "null_effect": result.get("null_effect", False),
+            "attempts": response.attempts,
+            **_usage_log_fields(response),
         }
+        self.logger.attach_text(log_extra, "turn_prompt_sent", turn_prompt)
+        self.logger.attach_text(log_extra, "response_raw", raw_text)
+        log_extra["resource_effect"] = result.get("resource_effect", 0)
+        log_extra["null_effect"] = result.get("null_effect", False)
         if "error" in result:
             log_extra["error_detail"] = result["error"]
 
@@ -493,7 +903,7 @@ class WhiteRoomSimulation:
         if target and target in self.agents_by_id:
             target_persona = self.agents_by_id[target].persona
 
-        self.action_log.append({
+        self.event_log.append({
             "epoch": epoch,
             "agent_id": agent.id,
             "persona": agent.persona,
@@ -505,6 +915,12 @@ class WhiteRoomSimulation:
             "success": success,
         })
 
+    def _recent_events_v03(self, agent: Agent) -> list[dict]:
+        """v0.3 "최근 이 장소에서 일어난 일" — scope=location이면 현재 위치 사건만"""
+        if self.event_scope == "location":
+            return self.event_log.recent(location=agent.location)
+        return self.event_log.recent()
+
     def _build_agent_context(self, agent: Agent, epoch: int) -> str:
         if self.phase == 2:
             return self._build_agent_context_phase2(agent, epoch)
@@ -528,8 +944,7 @@ class WhiteRoomSimulation:
         support_ctx = self.support_tracker.build_support_context(agent.id, self.language)
 
         # Gini
-        energy_values = [a.energy for a in self.agents]
-        gini = calculate_gini(energy_values)
+        gini = self.gini_tracker.gini
 
         # Historical summary
         hist_summary = self.history.get_summary(max_events=10, lang=self.language)
@@ -551,11 +966,12 @@ class WhiteRoomSimulation:
             gini=gini,
             tax_rate=self.environment.tax_rate,
             treasury=self.treasury.balance,
-            recent_events=self.action_log,
+            recent_events=self.event_log.recent(),
             historical_summary=hist_summary,
             billboard_content=billboard,
             agents_here=agents_here,
             lang=self.language,
+            layout=self.prompt_layout,
         )
 
     def _build_agent_context_phase2(self, agent: Agent, epoch: int) -> str:
@@ -574,9 +990,10 @@ class WhiteRoomSimulation:
             location=agent.location,
             turn=epoch,
             agent_count=len(self.agents),
-            recent_events=self.action_log,
+            recent_events=self.event_log.recent(),
             agents_here=agents_here,
             lang=self.language,
+            layout=self.prompt_layout,
         )
 
     def _execute_action(self, agent: Agent, response: LLMResponse, epoch: int) -> tuple[bool, dict]:
@@ -694,7 +1111,7 @@ class WhiteRoomSimulation:
         self.support_tracker.add_support(epoch, agent.id, target_id)
 
         # Check mutual support
-        if agent.id in self.support_tracker.get_supported_by(target_id):
+        if self.support_tracker.has_supported(target_id, agent.id):
             self.history.add_mutual_support(epoch, agent.id, target_id)
 
         result = {
@@ -743,6 +1160,7 @@ class WhiteRoomSimulation:
             "cost": cost,
             "leaked": whisper_result.leaked,
             "observers": whisper_result.observers,
+            "suspicion_targets": whisper_result.suspicion_targets,
         }
         if self.energy_frozen:
             result["would_have_changed"] = -cost
@@ -818,11 +1236,7 @@ class WhiteRoomSimulation:
         if not target_id or target_id not in self.agents_by_id:
             return False, {"error": "invalid_target"}
 
-        try:
-            amount = float(content) if content else 10.0
-        except (ValueError, TypeError):
-            amount = 10.0
-
+        amount = subsidy_amount(content)
         success, result = self.architect_system.grant_subsidy(
             self.treasury.balance, amount, target_id,
         )
@@ -835,6 +1249,18 @@ class WhiteRoomSimulation:
         return success, result
 
     def _finalize(self):
+        self.logger.close()
+
+        # 이 run의 어댑터가 잡은 풀 클라이언트만 반납 — 같은 프로세스의 다른 run은 계속 사용
+        # (비동기 클라이언트는 이 run 전용 루프에 묶여 있으므로 루프와 함께 닫음)
+        if self._loop is not None:
+            self._loop.run_until_complete(aclose_clients())
+            self._loop.close()
+            self._loop = None
+        release_clients(adapter.unwrap() for adapter in self.adapters.values())
+        if self.response_cache is not None:
+            self.response_cache.close()
+
         # v0.3: run_meta.json에 end_time 추가
         if self.use_v03:
             from datetime import datetime
@@ -2,6 +2,16 @@
 
 from typing import Optional
 
+DEFAULT_SUBSIDY = 10.0
+
+
+def subsidy_amount(content: Optional[str]) -> float:
+    """grant_subsidy 내용 → 보조금 액수 (비었거나 숫자가 아니면 기본값)"""
+    try:
+        return float(content) if content else DEFAULT_SUBSIDY
+    except (ValueError, TypeError):
+        return DEFAULT_SUBSIDY
+
 
 class ArchitectSystem:
 
@@ -99,3 +99,9 @@ class Treasury:
             self.balance = self.overflow_threshold
             return overflow
         return 0.0
+
+    def to_state(self) -> dict:
+        return {"balance": self.balance}
+
+    def load_state(self, state: dict):
+        self.balance = state["balance"]
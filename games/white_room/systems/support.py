@@ -1,7 +1,7 @@
 """Support(지지) 추적 시스템"""
 
 from dataclasses import dataclass
-from collections import Counter
+from collections import Counter, defaultdict
 
 
 @dataclass
@@ -12,36 +12,55 @@ class SupportRecord:
 
 
 class SupportTracker:
+    """지지 기록 + 증분 인덱스 (에이전트별 횟수, 인접 Counter, 상호 지지 쌍)
+
+    조회는 전체 기록을 스캔하지 않고 add_support에서 갱신되는 인덱스만 사용.
+    records는 export용으로만 유지.
+    """
 
     def __init__(self):
         self.records: list[SupportRecord] = []
+        self._received: Counter = Counter()
+        self._given: Counter = Counter()
+        self._supporters: dict[str, Counter] = defaultdict(Counter)  # receiver → giver별 횟수
+        self._supported: dict[str, Counter] = defaultdict(Counter)   # giver → receiver별 횟수
+        self._mutual: dict[str, dict[str, None]] = defaultdict(dict)  # 삽입 순서 유지 집합
 
     def add_support(self, epoch: int, giver_id: str, receiver_id: str):
         self.records.append(SupportRecord(epoch, giver_id, receiver_id))
+        self._received[receiver_id] += 1
+        self._given[giver_id] += 1
+        first_edge = receiver_id not in self._supported[giver_id]
+        self._supporters[receiver_id][giver_id] += 1
+        self._supported[giver_id][receiver_id] += 1
+        if first_edge and giver_id in self._supported.get(receiver_id, ()):
+            self._mutual[giver_id][receiver_id] = None
+            self._mutual[receiver_id][giver_id] = None
+
+    def has_supported(self, giver_id: str, receiver_id: str) -> bool:
+        return receiver_id in self._supported.get(giver_id, ())
 
     def count_received(self, agent_id: str) -> int:
-        return sum(1 for r in self.records if r.receiver_id == agent_id)
+        return self._received[agent_id]
 
     def count_given(self, agent_id: str) -> int:
-        return sum(1 for r in self.records if r.giver_id == agent_id)
+        return self._given[agent_id]
 
     def get_supporters(self, agent_id: str) -> list[str]:
         """agent_id를 지지한 에이전트 목록"""
-        return list({r.giver_id for r in self.records if r.receiver_id == agent_id})
+        return list(self._supporters.get(agent_id, ()))
 
     def get_supported_by(self, agent_id: str) -> list[str]:
         """agent_id가 지지한 에이전트 목록"""
-        return list({r.receiver_id for r in self.records if r.giver_id == agent_id})
+        return list(self._supported.get(agent_id, ()))
 
     def get_mutual_supporters(self, agent_id: str) -> list[str]:
-        supporters = set(self.get_supporters(agent_id))
-        supported = set(self.get_supported_by(agent_id))
-        return list(supporters & supported)
+        return list(self._mutual.get(agent_id, ()))
 
     def get_top_supporters(self, agent_id: str, limit: int = 3) -> list[tuple[str, int]]:
         """가장 많이 지지한 에이전트들 (이름, 횟수)"""
-        counter = Counter(r.giver_id for r in self.records if r.receiver_id == agent_id)
-        return counter.most_common(limit)
+        counter = self._supporters.get(agent_id)
+        return counter.most_common(limit) if counter else []
 
     def build_support_context(self, agent_id: str, lang: str = "ko") -> str:
         """프롬프트용 지지 관계 문자열"""
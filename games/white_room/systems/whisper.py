@@ -20,10 +20,13 @@ class WhisperSystem:
         base_leak_prob: float = 0.15,
         observer_bonus: float = 0.35,
         enabled: bool = True,
+        rng: Optional[random.Random] = None,
     ):
         self.base_leak_prob = base_leak_prob
         self.observer_bonus = observer_bonus
         self.enabled = enabled
+        # 누출 판정 전용 스트림 — 없으면 전역 random
+        self.rng = rng or random
 
     def process_whisper(
         self,
@@ -62,7 +65,7 @@ class WhisperSystem:
         if observers:
             leak_prob += self.observer_bonus
 
-        leaked = random.random() < leak_prob
+        leaked = self.rng.random() < leak_prob
 
         suspicion_targets = bystanders if leaked else []
 
@@ -0,0 +1,56 @@
+"""프롬프트 템플릿 — 정적 구간 사전 컴파일
+
+템플릿 본문은 str.format 문법({field}, {field:.2f}, 중괄호 이스케이프 {{ }})을 쓴다.
+compile()에 넘긴 정적 필드(페르소나 프롬프트, 행동 목록, 장소 이름 등)는 그 자리에서
+본문에 녹여 넣고, 나머지 동적 필드만 남긴 format 문자열을 만든다. render()는 그
+문자열의 str.format이라 호출마다 동적 필드만 채운다.
+동적 값은 다시 파싱되지 않으므로 값 안의 중괄호도 그대로 출력된다.
+"""
+
+from string import Formatter
+
+
+class CompiledTemplate:
+    """정적 필드가 채워진 템플릿 — 남은 동적 필드만 render()로 채움"""
+
+    __slots__ = ("text", "fields", "render")
+
+    def __init__(self, pieces: list[tuple[bool, str, str]]):
+        # pieces: (is_field, 리터럴 또는 필드 이름, format spec)
+        self.fields = [value for is_field, value, _ in pieces if is_field]
+        self.text = "".join(
+            (f"{{{value}:{spec}}}" if spec else f"{{{value}}}") if is_field else _escape(value)
+            for is_field, value, spec in pieces
+        )
+        self.render = self.text.format
+
+
+def _escape(text: str) -> str:
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+class PromptTemplate:
+    """str.format 문법 템플릿 — compile(**static)으로 정적 필드를 미리 채움"""
+
+    def __init__(self, source: str):
+        self.source = source
+        self._parsed = list(Formatter().parse(source))
+        for _, name, spec, conversion in self._parsed:
+            if name is not None and (conversion or not name.isidentifier() or "{" in spec):
+                raise ValueError(f"템플릿 필드는 단순 이름만 지원: {{{name}}}")
+
+    def compile(self, **static) -> CompiledTemplate:
+        pieces: list[tuple[bool, str, str]] = []
+        literal: list[str] = []
+        for text, name, spec, _ in self._parsed:
+            literal.append(text)
+            if name is None:
+                continue
+            if name in static:
+                literal.append(format(static[name], spec))
+            else:
+                pieces.append((False, "".join(literal), ""))
+                literal = []
+                pieces.append((True, name, spec))
+        pieces.append((False, "".join(literal), ""))
+        return CompiledTemplate(pieces)